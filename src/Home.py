@@ -1,33 +1,35 @@
 import streamlit as st
 import pandas as pd
-from datetime import timedelta
 
 from config import DASHBOARD_READY_CSV
+from utils import dashboard_data, perf_monitor
+from utils.home_summary import build_part_summary
 
 # [파일 정의서]
 # - 파일명: Home.py
 # - 역할: 시각화 (Dashboard Landing)
 # - 대상: 공통
-# - 데이터 소스: data/2_dashboard/dashboard_ready_data.csv
-# - 주요 기능: 시스템 메인 화면, 부위별 시세 변동 요약 테이블 (거시적 뷰)
+# - 데이터 소스: data/2_dashboard/home_part_summary.csv, data/2_dashboard/model_forecasts.csv (utils/dashboard_data.py 공유 캐시)
+# - 주요 기능: 시스템 메인 화면, 부위별 시세 변동 요약 테이블 (거시적 뷰, 전처리 단계의 요약 파일 읽기만 함), 모델 예측 요약 (배치 추론 결과 읽기만 함)
+#              요약 파일이 아직 없으면(파이프라인 실행 전) dashboard_ready_data.csv로 한 번 계산해 표시
+# - 성능 계측: utils/perf_monitor.py (URL에 ?debug=1 → 사이드바 계측 패널)
 
 st.set_page_config(
     page_title="Beef Data Insight Platform",
     page_icon="",
     layout="wide"
 )
+perf_monitor.start_page("Home")
 
-# --------------------------------------------------------------------------------
-# 데이터 로드 함수 (캐싱 적용)
-# --------------------------------------------------------------------------------
-@st.cache_data
-def load_dashboard_data():
-    """정제된 dashboard_ready_data.csv 로드"""
-    if not DASHBOARD_READY_CSV.exists():
+
+@perf_monitor.cached
+def _compute_part_summary(cache_key):
+    """파이프라인 실행 전(home_part_summary.csv 없음)이면 dashboard_ready로 한 번 계산"""
+    df = dashboard_data.load_dashboard_ready(columns=['date', 'part', 'wholesale_price'])
+    if df is None:
         return None
-    df = pd.read_csv(str(DASHBOARD_READY_CSV))
-    df['date'] = pd.to_datetime(df['date'])
-    return df
+    return build_part_summary(df)
+
 
 # --------------------------------------------------------------------------------
 # 메인 UI 구성
@@ -37,69 +39,20 @@ st.divider()
 
 st.subheader("부위별 시세 변동 요약")
 
-df = load_dashboard_data()
-
-if df is not None:
-    # 브랜드 통합 평균 가격: 날짜 × 부위별 groupby
-    df_avg = df.groupby(['date', 'part'])['wholesale_price'].mean().reset_index()
-
-    latest_date = df_avg['date'].max()
-    st.markdown(f"**기준일:** {latest_date.strftime('%Y-%m-%d')} | **기준:** 브랜드 통합 평균가")
-
-    date_3m = latest_date - timedelta(days=90)
-    date_6m = latest_date - timedelta(days=180)
-    date_12m = latest_date - timedelta(days=365)
-
-    part_options = sorted(df_avg['part'].unique())
-    summary_list = []
-
-    for part_name in part_options:
-        part_df = df_avg[df_avg['part'] == part_name].sort_values('date')
-
-        # 현재 가격: latest_date 기준 과거 7일 이내 유효한 최신 가격
-        recent_window = part_df[
-            (part_df['date'] >= latest_date - timedelta(days=7))
-            & (part_df['date'] <= latest_date)
-            & (part_df['wholesale_price'].notna())
-            & (part_df['wholesale_price'] != 0)
-        ].sort_values('date', ascending=False)
-        if recent_window.empty:
-            continue
-        curr_price = recent_window.iloc[0]['wholesale_price']
-
-        def get_price_at_date(target_date):
-            window_start = target_date - timedelta(days=7)
-            window_end = target_date + timedelta(days=7)
-            window_data = part_df[
-                (part_df['date'] >= window_start) & (part_df['date'] <= window_end)
-            ]['wholesale_price'].dropna()
-            if window_data.empty:
-                return None
-            return window_data.mean()
-
-        price_3m = get_price_at_date(date_3m)
-        price_6m = get_price_at_date(date_6m)
-        price_12m = get_price_at_date(date_12m)
-
-        def calc_pct(curr, past):
-            if past is None or past == 0:
-                return None
-            return ((curr - past) / past) * 100
-
-        summary_list.append({
-            "부위": part_name,
-            "현재가": curr_price,
-            "3개월 전 대비": calc_pct(curr_price, price_3m),
-            "6개월 전 대비": calc_pct(curr_price, price_6m),
-            "1년 전 대비": calc_pct(curr_price, price_12m),
-            "_sort_key": calc_pct(curr_price, price_6m) if price_6m else 0
-        })
-
-    df_summary = pd.DataFrame(summary_list)
+with perf_monitor.timed("부위별 요약 로드", "load"):
+    df_summary = dashboard_data.load_home_summary()
+    if df_summary is None:
+        df_summary = _compute_part_summary(dashboard_data.file_key(DASHBOARD_READY_CSV))
 
+if df_summary is not None:
     if not df_summary.empty:
-        df_summary = df_summary.sort_values(by="_sort_key", ascending=True)
-        df_display = df_summary.drop(columns=["_sort_key"])
+        st.markdown(f"**기준일:** {df_summary['base_date'].iloc[0]} | **기준:** 브랜드 통합 평균가")
+
+        # 파일은 6개월 전 대비 하락폭 순으로 정렬되어 있음
+        df_display = df_summary[['part', 'current_price', 'pct_3m', 'pct_6m', 'pct_12m']].rename(columns={
+            'part': '부위', 'current_price': '현재가',
+            'pct_3m': '3개월 전 대비', 'pct_6m': '6개월 전 대비', 'pct_12m': '1년 전 대비',
+        })
 
         def style_variance(val):
             if pd.isna(val):
@@ -115,21 +68,51 @@ if df is not None:
                 return "-"
             return f"{val:+.1f}%"
 
-        st.dataframe(
-            df_display.style
-            .format({"현재가": "{:,.0f}원"})
-            .format(format_pct, subset=["3개월 전 대비", "6개월 전 대비", "1년 전 대비"])
-            .map(style_variance, subset=["3개월 전 대비", "6개월 전 대비", "1년 전 대비"]),
-            use_container_width=True,
-            height=(len(df_display) + 1) * 35 + 3,
-            hide_index=True
-        )
+        with perf_monitor.timed("부위별 요약 표", "render"):
+            st.dataframe(
+                df_display.style
+                .format({"현재가": "{:,.0f}원"})
+                .format(format_pct, subset=["3개월 전 대비", "6개월 전 대비", "1년 전 대비"])
+                .map(style_variance, subset=["3개월 전 대비", "6개월 전 대비", "1년 전 대비"]),
+                use_container_width=True,
+                height=(len(df_display) + 1) * 35 + 3,
+                hide_index=True
+            )
 
         st.info("**Tip:** '6개월 전 대비' 하락폭이 큰 순서대로 정렬되어 있습니다. 브랜드별 상세 분석은 Price Dashboard에서 확인하세요.")
     else:
         st.warning("분석할 데이터가 충분하지 않습니다.")
 else:
-    st.warning("데이터 파일(dashboard_ready_data.csv)을 찾을 수 없습니다.")
+    st.warning("요약 파일(home_part_summary.csv)과 dashboard_ready_data.csv를 찾을 수 없습니다. `python src/utils/preprocess_meat_data.py` 실행 후 표시됩니다.")
+
+st.divider()
+st.subheader("모델 예측 (갈비, 미국산 냉동)")
+
+with perf_monitor.timed("모델 예측 로드", "load"):
+    df_fc = dashboard_data.load_model_forecasts()
+
+if df_fc is not None and not df_fc.empty:
+    # 모델별 가장 최근 기준월의 예측
+    df_latest = df_fc.sort_values('base_month').groupby('model', sort=False).tail(1)
+    cols = st.columns(len(df_latest))
+    for col, row in zip(cols, df_latest.itertuples()):
+        value = f"{row.prediction:+.1f}%" if row.unit == '%' else f"{row.prediction:+,.0f}원"
+        col.metric(row.description, value, help=f"기준월 {row.base_month:%Y-%m} | 모델 버전 {row.model_version}")
+    st.caption(f"예측 생성: {df_fc['generated_at'].max()} | 데이터 갱신 시 파이프라인에서 일괄 계산됩니다.")
+
+    with st.expander("기준월별 예측 전체 보기"):
+        st.dataframe(
+            df_fc.assign(base_month=df_fc['base_month'].dt.strftime('%Y-%m'))[
+                ['description', 'base_month', 'prediction', 'unit', 'model_version', 'trained_at']
+            ].rename(columns={
+                'description': '모델', 'base_month': '기준월', 'prediction': '예측값',
+                'unit': '단위', 'model_version': '모델 버전', 'trained_at': '학습 일시',
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+else:
+    st.info("모델 예측 파일(model_forecasts.csv)이 아직 없습니다. `python src/Models/batch_forecast.py` 실행 후 표시됩니다.")
 
 st.markdown("---")
 
@@ -138,3 +121,5 @@ c1, c2, c3 = st.columns(3)
 c1.metric("Price Analysis", "Active", "Update 09:00")
 c2.metric("Import Volume", "Coming Soon", delta_color="off")
 c3.metric("Inventory", "Coming Soon", delta_color="off")
+
+perf_monitor.finish_page()
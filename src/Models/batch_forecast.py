@@ -0,0 +1,243 @@
+# [파일 정의서]
+# - 파일명: batch_forecast.py
+# - 역할: 분석 (배치 추론)
+# - 대상: 수입육 (model_specs.py에 정의된 모델)
+# - 데이터 소스: 피처 저장소 (utils/feature_store.py), 모델 저장소 (model_registry.py)
+# - 주요 기능: 데이터 갱신 후 파이프라인에서 실행되어, 모델별 최신 예측을 data/2_dashboard/model_forecasts.csv 로 저장
+#   1. 학습 데이터 해시·설정이 저장소의 최신 버전과 같으면 저장된 부스터를 그대로 사용
+#      새 달 데이터만 추가된 경우(피처 구성·설정·기존 구간 동일) 저장된 부스터에 이어 학습(xgb_model), 아니면 전체 재학습
+#      이어 학습이 FULL_REFIT_EVERY회 쌓이면 전체 재학습하고, 같은 데이터의 이어 학습 결과와 예측 차이를 기록(warm_start_checks.csv)
+#   2. 타겟이 아직 확정되지 않은 최근 월(예: 1개월 뒤 Delta 모델은 마지막 달)의 피처로 예측
+#   3. 대시보드는 학습 없이 예측 테이블 파일 하나만 읽음
+# - 실행 예시:
+#     python src/Models/batch_forecast.py
+#     python src/Models/batch_forecast.py --retrain --use-best
+#     python src/Models/batch_forecast.py --update full
+
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.metrics import mean_absolute_error, r2_score
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from config import MODEL_FORECASTS_CSV, MODEL_REGISTRY_DIR, ensure_dirs
+from utils.file_store import append_csv, file_lock, write_csv
+from model_specs import MODEL_SPECS, get_spec
+import model_registry
+import param_search
+
+# 이어 학습(warm start)
+WARM_START_ROUNDS = 20       # 갱신 1회당 추가 트리 수
+WARM_START_CONTEXT = 12      # 신규 행과 함께 다시 보는 직전 개월 수
+FULL_REFIT_EVERY = 6         # 이어 학습이 이 횟수만큼 쌓이면 전체 재학습 (드리프트 방지)
+DRIFT_WARN_RATIO = 0.25      # 두 경로 예측 차이가 타겟 표준편차의 이 비율을 넘으면 경고
+
+FORECAST_COLS = [
+    'model', 'description', 'unit', 'base_month', 'prediction',
+    'model_version', 'trained_at', 'data_hash', 'generated_at',
+]
+
+
+def _fit_full(X, y, params):
+    """전체 기간으로 처음부터 학습 (기존 train_* 스크립트와 같은 방식)."""
+    model = xgb.XGBRegressor(**params)
+    model.fit(X, y)
+    return model
+
+
+def _fit_warm(base_model, X, y, new_mask, params):
+    """
+    저장된 부스터에 이어서 WARM_START_ROUNDS개 트리를 추가 학습 (xgb_model 이어 학습).
+    신규 행만으로는 월별 데이터가 1~2행뿐이라, 신규 행 + 직전 WARM_START_CONTEXT개월을 학습 구간으로 사용.
+    """
+    first_new = int(np.argmax(new_mask))
+    recent = slice(max(0, first_new - WARM_START_CONTEXT), len(X))
+    model = xgb.XGBRegressor(**{**params, 'n_estimators': WARM_START_ROUNDS})
+    model.fit(X.iloc[recent], y.iloc[recent], xgb_model=base_model.get_booster())
+    return model
+
+
+def _metrics(model, X, y):
+    pred = model.predict(X)
+    return {'in_sample_mae': mean_absolute_error(y, pred), 'in_sample_r2': r2_score(y, pred)}
+
+
+def warm_start_plan(meta, X, y, params):
+    """
+    저장된 최신 버전에 이어 학습할 수 있으면 신규 행 마스크를, 아니면 (None, 사유)를 반환.
+    조건: 피처 목록·설정이 같고, 기존 학습 구간 데이터가 그대로(수정 없음)이며, 그 뒤에 신규 행이 있을 것
+    """
+    if not meta:
+        return None, "저장된 모델 없음"
+    if meta['features'] != list(X.columns):
+        return None, "피처 구성 변경"
+    if meta['params'] != json.loads(json.dumps(params)):
+        return None, "학습 설정 변경"
+    old_mask = X.index <= pd.Timestamp(meta['train_end'])
+    if model_registry.dataset_hash(X[old_mask], y[old_mask]) != meta['data_hash']:
+        return None, "기존 학습 구간 데이터 수정"
+    if old_mask.all():
+        return None, "신규 행 없음"
+    return ~old_mask, None
+
+
+def compare_paths(warm_model, full_model, X, y, X_new):
+    """
+    이어 학습 모델과 전체 재학습 모델의 예측 차이 (타겟 표준편차 대비).
+    실제로 쓰이는 구간인 최근 WARM_START_CONTEXT개월 + 예측 대상 월 기준.
+    """
+    X_recent = X.iloc[-WARM_START_CONTEXT:]
+    X_all = pd.concat([X_recent, X_new]) if X_new is not None and len(X_new) else X_recent
+    diff = np.abs(warm_model.predict(X_all) - full_model.predict(X_all))
+    scale = float(y.std()) or 1.0
+    return {
+        'mean_abs_diff': float(diff.mean()),
+        'max_abs_diff': float(diff.max()),
+        'relative_diff': float(diff.mean() / scale),
+        'latest_abs_diff': float(diff[-1]),
+    }
+
+
+def _log_check(spec_name, meta, check):
+    path = Path(MODEL_REGISTRY_DIR) / spec_name / "warm_start_checks.csv"
+    row = pd.DataFrame([{'checked_at': meta['trained_at'], 'full_version': meta['version'],
+                         'warm_base_version': meta.get('base_version'), **check}])
+    append_csv(row, path)
+
+
+def get_model(spec, retrain=False, use_best=False, update='auto'):
+    """
+    저장소의 최신 모델이 현재 데이터·설정과 맞으면 재사용, 아니면 갱신한다.
+    update: auto(가능하면 이어 학습, FULL_REFIT_EVERY회마다 전체 재학습) / warm(가능하면 항상 이어 학습) / full(항상 전체 재학습)
+    반환: (model, meta, 갱신 방식 또는 None)
+    """
+    X, y = spec.build_dataset()
+    params = (param_search.best_params(spec.name) if use_best else None) or dict(spec.params)
+
+    if not retrain and model_registry.is_current(spec.name, model_registry.dataset_hash(X, y), params):
+        model, meta = model_registry.load_model(spec.name)
+        return model, meta, None
+
+    meta = model_registry.latest_meta(spec.name)
+    new_mask, reason = warm_start_plan(meta, X, y, params)
+    warm_count = meta.get('warm_starts_since_full', 0) if meta else 0
+    can_warm = new_mask is not None and not retrain and update != 'full'
+    refit_due = update == 'auto' and warm_count >= FULL_REFIT_EVERY
+
+    start = time.time()
+    if can_warm and not refit_due:
+        base_model, _ = model_registry.load_model(spec.name)
+        model = _fit_warm(base_model, X, y, new_mask, params)
+        meta = model_registry.register_model(
+            spec.name, model, X, y, _metrics(model, X, y), params,
+            fit_type='warm_start', base_version=meta['version'], new_rows=int(new_mask.sum()),
+            warm_starts_since_full=warm_count + 1, n_trees=model.get_booster().num_boosted_rounds(),
+            fit_seconds=round(time.time() - start, 3),
+        )
+        return model, meta, 'warm_start'
+
+    model = _fit_full(X, y, params)
+    fit_seconds = round(time.time() - start, 3)
+    extra = {}
+    if can_warm:
+        # 정기 전체 재학습: 같은 데이터로 이어 학습했을 때의 예측과 비교해 드리프트 확인
+        base_model, _ = model_registry.load_model(spec.name)
+        warm_model = _fit_warm(base_model, X, y, new_mask, params)
+        X_new = spec.build_inference() if spec.build_inference else None
+        extra = {'warm_start_check': compare_paths(warm_model, model, X, y, X_new), 'base_version': meta['version']}
+    elif reason and meta:
+        print(f"[{spec.name}] 이어 학습 불가 ({reason}) → 전체 재학습")
+
+    meta = model_registry.register_model(
+        spec.name, model, X, y, _metrics(model, X, y), params,
+        fit_type='full', warm_starts_since_full=0, n_trees=model.get_booster().num_boosted_rounds(),
+        fit_seconds=fit_seconds, **extra,
+    )
+    if 'warm_start_check' in extra:
+        check = extra['warm_start_check']
+        _log_check(spec.name, meta, check)
+        flag = " [주의] 차이가 큼" if check['relative_diff'] > DRIFT_WARN_RATIO else ""
+        print(f"[{spec.name}] 이어 학습 vs 전체 재학습 예측 차이: 평균 {check['mean_abs_diff']:.3f} "
+              f"(타겟 표준편차 대비 {check['relative_diff']:.1%}){flag}")
+    return model, meta, 'full'
+
+
+def forecast(spec, model, meta, generated_at):
+    """타겟이 없는 최근 월 피처로 예측한 행 목록."""
+    if spec.build_inference is None:
+        return pd.DataFrame(columns=FORECAST_COLS)
+    X_new = spec.build_inference()
+    if X_new.empty:
+        return pd.DataFrame(columns=FORECAST_COLS)
+
+    pred = model.predict(X_new[meta['features']])
+    return pd.DataFrame({
+        'model': spec.name,
+        'description': spec.description,
+        'unit': spec.unit,
+        'base_month': X_new.index.strftime('%Y-%m-%d'),
+        'prediction': pred.round(4),
+        'model_version': meta['version'],
+        'trained_at': meta['trained_at'],
+        'data_hash': meta['data_hash'],
+        'generated_at': generated_at,
+    })[FORECAST_COLS]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모델별 최신 예측 테이블 생성 (대시보드용)")
+    parser.add_argument("--model", choices=list(MODEL_SPECS) + ['all'], default='all', help="대상 모델 (기본: all)")
+    parser.add_argument("--retrain", action="store_true", help="저장된 모델이 최신이어도 다시 학습")
+    parser.add_argument("--use-best", action="store_true", help="하이퍼파라미터 탐색 결과의 최적 설정으로 학습")
+    parser.add_argument("--update", choices=['auto', 'warm', 'full'], default='auto',
+                        help="데이터 변경 시 갱신 방식 (auto: 이어 학습 + 정기 전체 재학습)")
+    args = parser.parse_args()
+
+    generated_at = datetime.now().isoformat(timespec='seconds')
+    names = list(MODEL_SPECS) if args.model == 'all' else [args.model]
+    frames, failed = [], []
+    for name in names:
+        spec = get_spec(name)
+        try:
+            model, meta, fit_type = get_model(spec, args.retrain, args.use_best, args.update)
+            df = forecast(spec, model, meta, generated_at)
+        except (FileNotFoundError, ValueError, KeyError) as e:
+            print(f"[{name}] 에러: {e}")
+            failed.append(name)
+            continue
+        status = {None: "저장 모델 사용", 'warm_start': "이어 학습", 'full': "전체 재학습"}[fit_type]
+        timing = f", {meta['fit_seconds']:.2f}초" if fit_type else ""
+        print(f"[{name}] {status} (버전 {meta['version']}{timing}) → 예측 {len(df)}건")
+        frames.append(df)
+
+    if frames:
+        df_out = pd.concat(frames, ignore_index=True)
+        ensure_dirs()
+        with file_lock(MODEL_FORECASTS_CSV):
+            # 일부 모델만 실행한 경우 나머지 모델의 기존 예측은 유지
+            if args.model != 'all' and MODEL_FORECASTS_CSV.exists():
+                df_old = pd.read_csv(str(MODEL_FORECASTS_CSV), encoding='utf-8-sig')
+                df_out = pd.concat([df_old[~df_old['model'].isin(names)], df_out], ignore_index=True)
+            write_csv(df_out, MODEL_FORECASTS_CSV)
+        print(f"저장 완료: {MODEL_FORECASTS_CSV} ({len(df_out)}행)")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
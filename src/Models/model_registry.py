@@ -0,0 +1,127 @@
+# [파일 정의서]
+# - 파일명: model_registry.py
+# - 역할: 분석 (모델 저장소)
+# - 대상: 수입육 (model_specs.py에 정의된 모델)
+# - 주요 기능: 학습된 XGBoost 부스터를 메타데이터와 함께 로컬(data/3_models/registry/)에 버전별로 저장·조회
+#   1. 버전 폴더: registry/<모델>/<버전>/booster.json + meta.json (피처 목록, 학습 데이터 해시, 설정, 지표)
+#   2. registry/<모델>/latest.json 이 최신 버전 메타를 가리킴 (임시 파일에 쓴 뒤 교체)
+#   3. 학습 데이터 해시·설정이 최신 버전과 같으면 재학습 없이 그대로 재사용 가능 (is_current)
+#   4. 모델별로 최근 KEEP_VERSIONS개 버전만 보관 (이어 학습 버전은 base_version으로 이전 버전을 가리킴)
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import xgboost as xgb
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from config import MODEL_REGISTRY_DIR
+
+KEEP_VERSIONS = 12          # 이어 학습 이력(전체 재학습 주기 2회분)까지 보관
+
+
+def dataset_hash(X, y):
+    """학습 데이터(X, y) 내용 + 컬럼 순서 해시."""
+    h = hashlib.sha1('|'.join(map(str, X.columns)).encode('utf-8'))
+    h.update(pd.util.hash_pandas_object(X, index=True).to_numpy().tobytes())
+    h.update(pd.util.hash_pandas_object(y, index=True).to_numpy().tobytes())
+    return h.hexdigest()[:16]
+
+
+def _write_json(obj, path):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False, indent=1, default=str)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path):
+    if not Path(path).exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        print(f"[경고] 모델 메타데이터를 읽을 수 없습니다: {path}")
+        return None
+
+
+def latest_meta(model_name, registry_dir=MODEL_REGISTRY_DIR):
+    """최신 버전 메타데이터 (없으면 None)."""
+    return _read_json(Path(registry_dir) / model_name / "latest.json")
+
+
+def list_versions(model_name, registry_dir=MODEL_REGISTRY_DIR):
+    """저장된 버전 메타데이터 목록 (오래된 순)."""
+    model_dir = Path(registry_dir) / model_name
+    if not model_dir.exists():
+        return []
+    metas = [_read_json(p / "meta.json") for p in sorted(model_dir.iterdir()) if p.is_dir()]
+    return [m for m in metas if m]
+
+
+def is_current(model_name, data_hash, params, registry_dir=MODEL_REGISTRY_DIR):
+    """최신 버전이 같은 데이터·설정으로 학습되었는지 여부."""
+    meta = latest_meta(model_name, registry_dir)
+    return bool(meta) and meta['data_hash'] == data_hash and meta['params'] == json.loads(json.dumps(params))
+
+
+def register_model(model_name, model, X, y, metrics, params, registry_dir=MODEL_REGISTRY_DIR, **extra):
+    """
+    학습된 XGBRegressor를 새 버전으로 저장하고 최신 버전으로 지정한다.
+    extra에 넘긴 항목(학습 방식 등)은 메타데이터에 그대로 기록된다. 반환: 메타데이터 dict
+    """
+    data_hash = dataset_hash(X, y)
+    trained_at = datetime.now()
+    version = f"{trained_at.strftime('%Y%m%d-%H%M%S')}-{data_hash[:8]}"
+    version_dir = Path(registry_dir) / model_name / version
+    version_dir.mkdir(parents=True, exist_ok=True)
+
+    model.get_booster().save_model(str(version_dir / "booster.json"))
+    meta = {
+        'model': model_name,
+        'version': version,
+        'trained_at': trained_at.isoformat(timespec='seconds'),
+        'data_hash': data_hash,
+        'features': list(X.columns),
+        'n_samples': len(X),
+        'train_start': X.index.min().strftime('%Y-%m-%d'),
+        'train_end': X.index.max().strftime('%Y-%m-%d'),
+        'params': params,
+        'metrics': {k: float(v) for k, v in metrics.items()},
+        **extra,
+    }
+    _write_json(meta, version_dir / "meta.json")
+    _write_json(meta, Path(registry_dir) / model_name / "latest.json")
+    _prune(model_name, registry_dir)
+    return meta
+
+
+def load_model(model_name, version=None, registry_dir=MODEL_REGISTRY_DIR):
+    """
+    저장된 모델을 불러온다 (version이 없으면 최신 버전).
+    반환: (XGBRegressor, 메타데이터 dict). 저장된 모델이 없으면 FileNotFoundError
+    """
+    meta = latest_meta(model_name, registry_dir) if version is None else \
+        _read_json(Path(registry_dir) / model_name / version / "meta.json")
+    if not meta:
+        raise FileNotFoundError(f"저장된 모델이 없습니다: {model_name}" + (f" ({version})" if version else ""))
+
+    model = xgb.XGBRegressor()
+    model.load_model(str(Path(registry_dir) / model_name / meta['version'] / "booster.json"))
+    return model, meta
+
+
+def _prune(model_name, registry_dir, keep=KEEP_VERSIONS):
+    version_dirs = sorted(p for p in (Path(registry_dir) / model_name).iterdir() if p.is_dir())
+    for old in version_dirs[:-keep]:
+        shutil.rmtree(old, ignore_errors=True)
@@ -0,0 +1,155 @@
+# [파일 정의서]
+# - 파일명: model_specs.py
+# - 역할: 분석 (모델 정의 공용)
+# - 대상: 수입육 (갈비)
+# - 주요 기능: 학습 스크립트 3종(train_baseline / train_rolling_horizon / train_pct_check)의
+#              데이터셋 구성(X, y)과 XGBoost 설정을 한곳에 모아, 학습 스크립트·워크포워드 백테스트가 같은 정의를 사용하도록 함
+#   - gap: 예측 시점에 아직 확정되지 않은 타겟을 학습에서 빼기 위한 간격 (타겟 기간 - 1개월)
+
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from utils.feature_store import load_features
+
+# 세 스크립트 공통 XGBoost 설정
+XGB_PARAMS = {
+    'n_estimators': 100,
+    'max_depth': 4,
+    'learning_rate': 0.05,
+    'random_state': 42,
+}
+
+
+@dataclass
+class ModelSpec:
+    name: str
+    description: str
+    build_dataset: Callable[[], tuple]        # () -> (X, y), DatetimeIndex 월별
+    gap: int = 0
+    params: dict = field(default_factory=lambda: dict(XGB_PARAMS))
+    build_inference: Optional[Callable[[], pd.DataFrame]] = None   # () -> 타겟이 아직 없는 최근 월의 X (예측용)
+    unit: str = '원'
+
+
+# ======================================================
+# [데이터셋] 모델별 X, y 구성
+# ======================================================
+def _unlabeled_rows(X_all, train_index):
+    """피처는 모두 있으나 미래 가격이 다 나오지 않아 학습 데이터에서 빠진 최근 행 (예측 대상)."""
+    X_all = X_all.dropna()
+    return X_all[X_all.index > train_index.max()]
+
+
+# 정답 유출 방지용 제외 컬럼
+BASELINE_LEAK_COLS = ['kr_price_lead_1', 'kr_price_lead_2', 'kr_price_diff_lead_1', 'kr_price_diff_lead_2']
+ROLLING_LEAK_COLS = [f'kr_price_lead_{i}' for i in range(1, 7)] + ['kr_price_max_6m', 'target_max_diff_6m']
+
+
+def build_baseline_dataset():
+    """1개월 뒤 가격 증감액(Delta) 예측."""
+    df = load_features('rib', 'delta')
+    target_col = 'kr_price_diff_lead_1'
+    return df.drop(columns=BASELINE_LEAK_COLS), df[target_col]
+
+
+def build_baseline_inference():
+    df = load_features('rib', 'delta', dropna=False)
+    return _unlabeled_rows(df.drop(columns=BASELINE_LEAK_COLS), load_features('rib', 'delta').index)
+
+
+def build_rolling_horizon_dataset():
+    """향후 6개월 내 최대 상승폭 예측."""
+    df = load_features('rib', 'rolling', horizon=6)
+    target_col = 'target_max_diff_6m'
+    # 정답 유출 방지: 1~6개월 미래 가격 정보 모두 제거
+    return df.drop(columns=ROLLING_LEAK_COLS), df[target_col]
+
+
+def build_rolling_horizon_inference():
+    df = load_features('rib', 'rolling', horizon=6, dropna=False)
+    return _unlabeled_rows(df.drop(columns=ROLLING_LEAK_COLS), load_features('rib', 'rolling', horizon=6).index)
+
+
+PCT_CHECK_FEATURES: List[str] = [
+    'kr_price_mom',
+    'kr_price_3m_mom',       # 과열 피로도
+    'is_holiday_peak',       # 시계열 (명절 효과)
+    'us_price_ma_3_mom', 'us_price_ma_6_mom',
+    'exchange_rate_ma_3_mom', 'exchange_rate_ma_6_mom',
+    'import_vol_mom', 'import_vol_yoy',
+    'stock_mom', 'stock_yoy'
+]
+
+
+def build_pct_check_frame(dropna=True):
+    """train_pct_check용 파생 변수(과열 피로도·명절 시즌성·이동평균 모멘텀)와 6개월 최대 상승률 타겟."""
+    df = load_features('rib', 'rolling', horizon=6, dropna=dropna).copy()
+
+    # 1. 과열 피로도 및 연속 상승 감지
+    df['kr_price_mom'] = df['kr_price'].pct_change() * 100
+    # 최근 3개월간 도매가가 누적으로 몇 %나 올랐는가? (시장의 피로도 측정)
+    df['kr_price_3m_mom'] = df['kr_price'].pct_change(periods=3) * 100
+
+    # 2. 갈비 특화: 시계열(명절) 시즌성
+    # 갈비는 설날(1~2월)과 추석(9~10월)이 최대 성수기.
+    # 도매 시장에서는 세트 작업을 위해 보통 1개월~1.5개월 전에 물량을 매입함.
+    # 따라서 도매 수요가 폭발하는 1월, 8월, 9월을 '명절 도매 성수기'로 지정.
+    df['month'] = df.index.month
+    df['is_holiday_peak'] = df['month'].isin([1, 8, 9]).astype(int)
+
+    # 기존 변수들 (기간 버퍼 및 수급)
+    df['import_vol_mom'] = df['import_vol'].pct_change() * 100
+    df['stock_mom'] = df['stock'].pct_change() * 100
+
+    df['us_price_ma_3'] = df['us_price'].rolling(window=3).mean()
+    df['us_price_ma_6'] = df['us_price'].rolling(window=6).mean()
+    df['exchange_rate_ma_3'] = df['exchange_rate'].rolling(window=3).mean()
+    df['exchange_rate_ma_6'] = df['exchange_rate'].rolling(window=6).mean()
+
+    df['us_price_ma_3_mom'] = df['us_price_ma_3'].pct_change() * 100
+    df['us_price_ma_6_mom'] = df['us_price_ma_6'].pct_change() * 100
+    df['exchange_rate_ma_3_mom'] = df['exchange_rate_ma_3'].pct_change() * 100
+    df['exchange_rate_ma_6_mom'] = df['exchange_rate_ma_6'].pct_change() * 100
+
+    df['import_vol_yoy'] = df['import_vol'].pct_change(12) * 100
+    df['stock_yoy'] = df['stock'].pct_change(12) * 100
+
+    # 타겟: 6개월 내 최대 상승률(%)
+    df['target_max_return_6m'] = (df['kr_price_max_6m'] - df['kr_price']) / df['kr_price'] * 100
+    return df.dropna() if dropna else df
+
+
+def build_pct_check_dataset():
+    """향후 6개월 내 최대 상승률(%) 예측 (정예 11개 변수)."""
+    df = build_pct_check_frame()
+    return df[PCT_CHECK_FEATURES], df['target_max_return_6m']
+
+
+def build_pct_check_inference():
+    df = build_pct_check_frame(dropna=False)
+    return _unlabeled_rows(df[PCT_CHECK_FEATURES], build_pct_check_frame().index)
+
+
+MODEL_SPECS = {
+    'baseline': ModelSpec('baseline', '1개월 뒤 가격 증감액(Delta)', build_baseline_dataset, gap=0,
+                          build_inference=build_baseline_inference),
+    'rolling_horizon': ModelSpec('rolling_horizon', '6개월 내 최대 상승폭', build_rolling_horizon_dataset, gap=5,
+                                 build_inference=build_rolling_horizon_inference),
+    'pct_check': ModelSpec('pct_check', '6개월 내 최대 상승률(%)', build_pct_check_dataset, gap=5,
+                           build_inference=build_pct_check_inference, unit='%'),
+}
+
+
+def get_spec(name):
+    if name not in MODEL_SPECS:
+        raise KeyError(f"정의되지 않은 모델: {name} (사용 가능: {', '.join(MODEL_SPECS)})")
+    return MODEL_SPECS[name]
@@ -0,0 +1,153 @@
+# [파일 정의서]
+# - 파일명: multi_series.py
+# - 역할: 분석 (다중 시계열 배치 학습·예측)
+# - 대상: 수입육 (dashboard_ready_data의 전 국가 × 부위, --by-brand-group 시 메이저 3사/기타 팩커까지)
+# - 데이터 소스: utils/series_panel.py (주간 도매가 + KMTA 월별 수입량·재고)
+# - 주요 기능: 시계열마다 별도 XGBoost 모델로 horizon주 뒤 가격 변동률(%)을 학습·예측
+#   1. 피처 행렬(전 시계열을 이어 붙인 읽기 전용 float64 배열)을 공유 메모리에 한 번만 올리고,
+#      워커 프로세스는 복사 없이 같은 메모리를 참조하여 자기 시계열 구간만 잘라 학습
+#   2. 마지막 HOLDOUT_WEEKS개 학습 행으로 홀드아웃 MAE를 잰 뒤 전체 행으로 다시 학습하여 최신 주 예측
+#   3. 결과는 data/2_dashboard/series_forecasts.csv, 처리량(시계열/초)을 함께 출력
+# - 실행 예시:
+#     python src/Models/multi_series.py
+#     python src/Models/multi_series.py --by-brand-group --horizon 8 --workers 4
+
+import os
+import sys
+import time
+import argparse
+from datetime import datetime
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from config import SERIES_FORECASTS_CSV, ensure_dirs
+from utils.series_panel import SERIES_KEYS, FEATURE_COLS, build_series_panel
+from utils.file_store import write_csv
+
+DEFAULT_HORIZON = 4         # 예측 대상: 4주 뒤 가격 변동률(%)
+MIN_TRAIN_ROWS = 20         # 타겟이 있는 주가 이보다 적은 시계열은 건너뜀
+HOLDOUT_WEEKS = 4
+
+SERIES_PARAMS = {
+    'n_estimators': 100,
+    'max_depth': 3,
+    'learning_rate': 0.05,
+    'random_state': 42,
+}
+
+MATRIX_COLS = FEATURE_COLS + ['target', 'price']
+_N_FEATURES = len(FEATURE_COLS)
+_TARGET, _PRICE = _N_FEATURES, _N_FEATURES + 1
+
+
+# ======================================================
+# [공유 메모리] 워커는 같은 패널 행렬을 복사 없이 참조
+# ======================================================
+_shm = None
+_matrix = None
+
+
+def _attach_panel(shm_name, shape):
+    global _shm, _matrix
+    _shm = shared_memory.SharedMemory(name=shm_name)
+    _matrix = np.ndarray(shape, dtype=np.float64, buffer=_shm.buf)
+
+
+def _fit_series(task):
+    """워커: [start, end) 행 구간(한 시계열)을 학습하고 최신 주를 예측."""
+    sid, start, end = task
+    block = _matrix[start:end]
+    X, y = block[:, :_N_FEATURES], block[:, _TARGET]
+    labeled = ~np.isnan(y)
+    n_train = int(labeled.sum())
+    result = {'sid': sid, 'n_train': n_train, 'holdout_mae': np.nan, 'predicted_change_pct': np.nan}
+    if n_train < MIN_TRAIN_ROWS:
+        result['status'] = 'skipped'
+        return result
+
+    X_lab, y_lab = X[labeled], y[labeled]
+    if n_train >= MIN_TRAIN_ROWS + HOLDOUT_WEEKS:
+        model = xgb.XGBRegressor(**SERIES_PARAMS, n_jobs=1)
+        model.fit(X_lab[:-HOLDOUT_WEEKS], y_lab[:-HOLDOUT_WEEKS])
+        result['holdout_mae'] = float(np.mean(np.abs(model.predict(X_lab[-HOLDOUT_WEEKS:]) - y_lab[-HOLDOUT_WEEKS:])))
+
+    model = xgb.XGBRegressor(**SERIES_PARAMS, n_jobs=1)
+    model.fit(X_lab, y_lab)
+    result['predicted_change_pct'] = float(model.predict(X[-1:])[0])
+    result['status'] = 'ok'
+    return result
+
+
+def run_multi_series(panel, horizon=DEFAULT_HORIZON, workers=None):
+    """
+    SERIES_KEYS + date 정렬된 패널로 시계열별 학습·예측.
+    반환: (시계열별 결과 DataFrame, 소요 초)
+    """
+    series = panel[SERIES_KEYS].drop_duplicates().reset_index(drop=True)
+    bounds = np.flatnonzero(panel[SERIES_KEYS].ne(panel[SERIES_KEYS].shift()).any(axis=1).to_numpy())
+    ends = np.append(bounds[1:], len(panel))
+    tasks = [(sid, int(s), int(e)) for sid, (s, e) in enumerate(zip(bounds, ends))]
+
+    matrix = panel[MATRIX_COLS].to_numpy(dtype=np.float64)
+    shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+    try:
+        np.ndarray(matrix.shape, dtype=np.float64, buffer=shm.buf)[:] = matrix
+        workers = workers or os.cpu_count() or 1
+        start = time.time()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_panel,
+                                 initargs=(shm.name, matrix.shape)) as pool:
+            results = list(pool.map(_fit_series, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+        elapsed = time.time() - start
+    finally:
+        shm.close()
+        shm.unlink()
+
+    df = pd.DataFrame(results).sort_values('sid').set_index('sid')
+    last = panel.iloc[ends - 1].reset_index(drop=True)
+    out = pd.concat([series, df.reset_index(drop=True)], axis=1)
+    out['base_date'] = last['date'].dt.strftime('%Y-%m-%d')
+    out['last_price'] = last['price'].round(0)
+    out['horizon_weeks'] = horizon
+    out['predicted_change_pct'] = out['predicted_change_pct'].round(3)
+    out['predicted_price'] = (out['last_price'] * (1 + out['predicted_change_pct'] / 100)).round(0)
+    out['holdout_mae'] = out['holdout_mae'].round(3)
+    cols = SERIES_KEYS + ['base_date', 'last_price', 'horizon_weeks', 'predicted_change_pct',
+                          'predicted_price', 'holdout_mae', 'n_train', 'status']
+    return out[cols], elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전 국가 × 부위 시계열 배치 학습·예측")
+    parser.add_argument("--horizon", type=int, default=DEFAULT_HORIZON, help="예측 시점 (주)")
+    parser.add_argument("--by-brand-group", action="store_true", help="메이저 3사 / 기타 팩커 시계열로 분리")
+    parser.add_argument("--workers", type=int, default=None, help="동시 학습 프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args()
+
+    try:
+        panel = build_series_panel(args.horizon, args.by_brand_group)
+    except FileNotFoundError as e:
+        print(f"에러: 원천 데이터 파일을 찾을 수 없습니다. ({e})")
+        sys.exit(1)
+
+    df_out, elapsed = run_multi_series(panel, args.horizon, args.workers)
+    n_ok = int((df_out['status'] == 'ok').sum())
+    print(f"시계열 {len(df_out)}개 중 {n_ok}개 학습·예측 ({len(df_out) - n_ok}개는 데이터 부족으로 제외)")
+    print(f"학습 소요 {elapsed:.1f}초 | 처리량 {len(df_out) / max(elapsed, 1e-9):.1f} 시계열/초")
+
+    df_out['generated_at'] = datetime.now().isoformat(timespec='seconds')
+    ensure_dirs()
+    write_csv(df_out, SERIES_FORECASTS_CSV)
+    print(f"저장 완료: {SERIES_FORECASTS_CSV}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+# [파일 정의서]
+# - 파일명: param_search.py
+# - 역할: 분석 (하이퍼파라미터 탐색)
+# - 대상: 수입육 (model_specs.py에 정의된 모델)
+# - 주요 기능: 워크포워드 검증 폴드 기준으로 XGBoost 설정을 병렬 탐색
+#   1. 그리드(grid) 또는 무작위(random, 시드 고정) 탐색 공간
+#   2. 워커 프로세스마다 폴드별 DMatrix를 한 번만 만들고 모든 시도(trial)에서 재사용
+#   3. 폴드마다 학습 구간 끝 INNER_VALID_SIZE개월(내부 검증)로 조기 종료(early stopping)하여 부스팅 횟수를 정하고,
+#      그 횟수로 학습 구간 전체를 다시 학습해 손대지 않은 테스트 구간 MAE로 시도를 평가 (폴드 평균)
+#   4. 완료된 시도는 로컬 SQLite(data/3_models/param_search.sqlite)에 기록 → 중단 후 재실행 시 남은 시도만 수행
+# - 실행 예시:
+#     python src/Models/walk_forward.py search --model baseline --strategy random --trials 40
+#     python src/Models/walk_forward.py run --model baseline --use-best
+
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+import itertools
+import random
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from config import PARAM_SEARCH_DB
+from model_specs import XGB_PARAMS
+
+MAX_ROUNDS = 1000
+EARLY_STOPPING_ROUNDS = 30
+INNER_VALID_SIZE = 6        # 조기 종료용 내부 검증 개월 수 (학습 구간의 마지막 달들, 학습 구간의 1/5 이내)
+
+# 그리드 탐색 공간 (모든 조합)
+PARAM_GRID = {
+    'max_depth': [2, 3, 4, 6],
+    'learning_rate': [0.02, 0.05, 0.1],
+    'subsample': [0.7, 1.0],
+    'colsample_bytree': [0.7, 1.0],
+    'min_child_weight': [1, 3],
+}
+
+# 무작위 탐색 공간: (분포, 하한, 상한)
+PARAM_SPACE = {
+    'max_depth': ('int', 2, 6),
+    'learning_rate': ('log', 0.01, 0.2),
+    'subsample': ('float', 0.5, 1.0),
+    'colsample_bytree': ('float', 0.5, 1.0),
+    'min_child_weight': ('int', 1, 6),
+    'reg_lambda': ('log', 0.1, 10.0),
+}
+
+
+# ======================================================
+# [탐색 공간] 시도 목록 생성 (같은 인자면 항상 같은 순서)
+# ======================================================
+def grid_trials(grid=PARAM_GRID):
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def random_trials(n_trials, seed=42, space=PARAM_SPACE):
+    rng = random.Random(seed)
+    trials = []
+    for _ in range(n_trials):
+        params = {}
+        for key in sorted(space):
+            kind, low, high = space[key]
+            if kind == 'int':
+                params[key] = rng.randint(low, high)
+            elif kind == 'log':
+                params[key] = round(float(np.exp(rng.uniform(np.log(low), np.log(high)))), 5)
+            else:
+                params[key] = round(rng.uniform(low, high), 4)
+        trials.append(params)
+    return trials
+
+
+def trial_key(params):
+    return hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def study_key(spec_name, mode, folds, X, y):
+    """모델·폴드 구성·학습 데이터가 같으면 같은 study (데이터가 바뀌면 새로 탐색)."""
+    h = hashlib.sha1(f"{spec_name}|{mode}|valid{INNER_VALID_SIZE}".encode())
+    for tr, te in folds:
+        h.update(f"{tr[0]}-{tr[-1]}:{te[0]}-{te[-1]};".encode())
+    h.update(pd.util.hash_pandas_object(X, index=True).to_numpy().tobytes())
+    h.update(pd.util.hash_pandas_object(y, index=True).to_numpy().tobytes())
+    return h.hexdigest()[:16]
+
+
+# ======================================================
+# [결과 DB] SQLite
+# ======================================================
+def open_db(path=PARAM_SEARCH_DB):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS trials (
+            study TEXT NOT NULL,
+            model TEXT NOT NULL,
+            mode TEXT NOT NULL,
+            trial_key TEXT NOT NULL,
+            params TEXT NOT NULL,
+            mae REAL,
+            best_rounds INTEGER,
+            fold_mae TEXT,
+            elapsed REAL,
+            created_at TEXT,
+            PRIMARY KEY (study, trial_key)
+        )
+    """)
+    return conn
+
+
+def completed_keys(conn, study):
+    return {row[0] for row in conn.execute("SELECT trial_key FROM trials WHERE study = ?", (study,))}
+
+
+def record_trial(conn, study, model, mode, result):
+    conn.execute(
+        "INSERT OR REPLACE INTO trials VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (study, model, mode, result['trial_key'], json.dumps(result['params'], sort_keys=True),
+         result['mae'], result['best_rounds'], json.dumps(result['fold_mae']), result['elapsed'],
+         datetime.now().isoformat(timespec='seconds')),
+    )
+    conn.commit()
+
+
+def load_results(model=None, study=None, path=PARAM_SEARCH_DB):
+    if not path.exists():
+        return pd.DataFrame()
+    conn = open_db(path)
+    query, args = "SELECT * FROM trials WHERE 1=1", []
+    if model:
+        query, args = query + " AND model = ?", args + [model]
+    if study:
+        query, args = query + " AND study = ?", args + [study]
+    df = pd.read_sql_query(query + " ORDER BY mae ASC", conn, params=args)
+    conn.close()
+    return df
+
+
+def best_params(model, mode='expanding', path=PARAM_SEARCH_DB):
+    """
+    결과 DB에서 해당 모델·방식의 (가장 최근 study 기준) 최저 MAE 설정을 XGBRegressor 인자로 반환 (없으면 None).
+    부스팅 횟수는 내부 검증 구간 조기 종료로 정해진 폴드 평균 best_rounds를 사용.
+    """
+    df = load_results(model, path=path)
+    df = df[df['mode'] == mode] if not df.empty else df
+    if df.empty:
+        return None
+    # 데이터가 갱신되면 study가 바뀌므로 가장 최근 study의 결과만 사용
+    latest_study = df.loc[df['created_at'].idxmax(), 'study']
+    row = df[df['study'] == latest_study].iloc[0]
+    params = dict(XGB_PARAMS)
+    params.update(json.loads(row['params']))
+    params['n_estimators'] = int(row['best_rounds'])
+    return params
+
+
+# ======================================================
+# [워커] 폴드별 DMatrix를 프로세스당 한 번만 생성
+# ======================================================
+_worker_folds = None
+_worker_threads = 1
+
+
+def inner_split(train_idx, valid_size=INNER_VALID_SIZE):
+    """학습 인덱스 → (내부 학습, 내부 검증). 검증은 시간상 마지막 달들 (학습 구간의 1/5 이내, 최소 1개월)."""
+    n_valid = min(valid_size, max(1, len(train_idx) // 5))
+    return train_idx[:-n_valid], train_idx[-n_valid:]
+
+
+def _init_worker(X_values, y_values, folds, n_threads):
+    global _worker_folds, _worker_threads
+    _worker_threads = n_threads
+
+    def dmatrix(idx):
+        return xgb.DMatrix(X_values[idx], label=y_values[idx], nthread=n_threads)
+
+    _worker_folds = []
+    for tr, te in folds:
+        fit_idx, valid_idx = inner_split(tr)
+        # (내부 학습, 내부 검증, 학습 전체, 테스트 입력, 테스트 정답)
+        _worker_folds.append((dmatrix(fit_idx), dmatrix(valid_idx), dmatrix(tr), dmatrix(te), y_values[te]))
+
+
+def _run_trial(params):
+    start = datetime.now()
+    booster_params = {
+        'objective': 'reg:squarederror',
+        'eval_metric': 'mae',
+        'seed': XGB_PARAMS['random_state'],
+        'nthread': _worker_threads,
+        **params,
+    }
+    fold_mae, rounds = [], []
+    for dfit, dvalid, dtrain, dtest, y_test in _worker_folds:
+        # 부스팅 횟수는 학습 구간 안의 내부 검증으로만 결정 (테스트 구간은 평가에만 사용)
+        booster = xgb.train(
+            booster_params, dfit, num_boost_round=MAX_ROUNDS,
+            evals=[(dvalid, 'valid')], early_stopping_rounds=EARLY_STOPPING_ROUNDS, verbose_eval=False,
+        )
+        n_rounds = booster.best_iteration + 1
+        booster = xgb.train(booster_params, dtrain, num_boost_round=n_rounds)
+        fold_mae.append(float(np.mean(np.abs(booster.predict(dtest) - y_test))))
+        rounds.append(n_rounds)
+
+    return {
+        'trial_key': trial_key(params),
+        'params': params,
+        'mae': float(np.mean(fold_mae)),
+        'best_rounds': int(round(np.mean(rounds))),
+        'fold_mae': fold_mae,
+        'elapsed': (datetime.now() - start).total_seconds(),
+    }
+
+
+def run_search(spec, folds, X, y, trials, mode='expanding', workers=None, db_path=PARAM_SEARCH_DB):
+    """
+    시도 목록을 병렬 평가하여 결과 DB에 기록한다. 이미 완료된 시도는 건너뛴다.
+    반환: 이번 study의 전체 결과 DataFrame (MAE 오름차순)
+    """
+    study = study_key(spec.name, mode, folds, X, y)
+    conn = open_db(db_path)
+    done = completed_keys(conn, study)
+    pending = [p for p in trials if trial_key(p) not in done]
+    print(f"study {study}: 전체 {len(trials)}개 시도 중 완료 {len(trials) - len(pending)}개, 남은 시도 {len(pending)}개")
+
+    if pending:
+        workers = workers or min(len(pending), os.cpu_count() or 1)
+        n_threads = max(1, (os.cpu_count() or 1) // workers)
+        X_values = X.to_numpy(dtype='float64')
+        y_values = y.to_numpy(dtype='float64')
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(X_values, y_values, folds, n_threads)) as pool:
+            futures = [pool.submit(_run_trial, p) for p in pending]
+            for i, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                record_trial(conn, study, spec.name, mode, result)
+                print(f"  [{i}/{len(pending)}] MAE {result['mae']:.3f} (rounds {result['best_rounds']}) {result['params']}")
+    conn.close()
+    return load_results(spec.name, study=study, path=db_path)
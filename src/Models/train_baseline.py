@@ -2,7 +2,7 @@
 # - 파일명: train_baseline.py
 # - 역할: 분석
 # - 대상: 수입육
-# - 데이터 소스: ml_features_rib.csv
+# - 데이터 소스: 피처 저장소 (utils/feature_store.py, 'rib' Delta 피처 세트 = ml_features_rib.csv와 동일)
 # - 주요 기능: 전체 69개월 데이터를 100% 학습하여 과거와 현재 패러다임을 모두 관통하는 핵심 변수 중요도(Feature Importance) 추출
 
 import os
@@ -17,41 +17,31 @@ parent_dir = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.append(parent_dir)
 
-from config import DATA_PROCESSED
+from model_specs import get_spec
+import model_registry
 
 def main():
-    file_path = os.path.join(DATA_PROCESSED, "ml_features_rib.csv")
-    if not os.path.exists(file_path):
-        print("에러: 파일을 찾을 수 없습니다.")
-        return
+    spec = get_spec('baseline')
 
-    # 데이터 로드
-    df = pd.read_csv(file_path, index_col=0, parse_dates=True)
-    
-    # 타겟: 1개월 뒤 가격 증감액 (Delta)
-    target_col = 'kr_price_diff_lead_1'
-    
-    # 정답 유출 방지
-    drop_cols = ['kr_price_lead_1', 'kr_price_lead_2', 'kr_price_diff_lead_1', 'kr_price_diff_lead_2']
-    X = df.drop(columns=drop_cols)
-    y = df[target_col]
+    # 데이터 로드 (피처 저장소: 원천이 바뀌지 않았으면 캐시에서 바로 로드)
+    # 타겟: 1개월 뒤 가격 증감액 (Delta), 미래 가격 컬럼은 제외 (정답 유출 방지)
+    try:
+        X, y = spec.build_dataset()
+    except FileNotFoundError as e:
+        print(f"에러: 원천 데이터 파일을 찾을 수 없습니다. ({e})")
+        return
 
     # 기획자 요청 반영: 데이터를 분할하지 않고 '전체 기간'을 모두 학습 (100% Train)
     X_train = X
     y_train = y
     
     print(f"==================================================")
-    print(f"  전체 기간({df.shape[0]}개월) 통합 학습 및 중요도 분석")
+    print(f"  전체 기간({X.shape[0]}개월) 통합 학습 및 중요도 분석")
     print(f"==================================================\n")
 
     # 모델 정의
     # 전체 데이터를 학습하므로 과적합을 적절히 제어하면서도 충분히 학습하도록 설정
-    model = xgb.XGBRegressor(
-        n_estimators=100,
-        max_depth=4,
-        learning_rate=0.05,
-        random_state=42
-    )
+    model = xgb.XGBRegressor(**spec.params)
     
     # 모델 학습 (전체 69개월 데이터)
     model.fit(X_train, y_train)
@@ -66,6 +56,10 @@ def main():
     print(f"설명력 (R-squared): {r2:.4f} (In-sample 이므로 높게 나옴)")
     print("---------------------------------------\n")
 
+    # 모델 저장소에 등록 (배치 추론·대시보드가 재학습 없이 사용)
+    meta = model_registry.register_model(spec.name, model, X_train, y_train, {'in_sample_mae': mae, 'in_sample_r2': r2}, spec.params)
+    print(f"모델 저장: {meta['version']}\n")
+
     # 변수 중요도 추출
     importance = model.feature_importances_
     feature_names = X.columns
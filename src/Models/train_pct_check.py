@@ -19,66 +19,22 @@ parent_dir = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.append(parent_dir)
 
-from config import DATA_PROCESSED
+from model_specs import get_spec, build_pct_check_frame, PCT_CHECK_FEATURES
+import model_registry
 
 def main():
-    file_path = os.path.join(DATA_PROCESSED, "ml_features_rolling_rib.csv")
-    if not os.path.exists(file_path):
-        print("에러: 데이터 파일이 없습니다.")
-        return
-
-    df = pd.read_csv(file_path, index_col=0, parse_dates=True)
-    df = df.copy()
-
-    # ----------------------------------------------------
-    # 1. [기획자 아이디어] 과열 피로도 및 연속 상승 감지
-    # ----------------------------------------------------
-    df['kr_price_mom'] = df['kr_price'].pct_change() * 100
-    # 최근 3개월간 도매가가 누적으로 몇 %나 올랐는가? (시장의 피로도 측정)
-    df['kr_price_3m_mom'] = df['kr_price'].pct_change(periods=3) * 100
-
-    # ----------------------------------------------------
-    # 2. [기획자 아이디어] 갈비 특화: 시계열(명절) 시즌성
-    # ----------------------------------------------------
-    # 주석: 갈비는 설날(1~2월)과 추석(9~10월)이 최대 성수기. 
-    # 도매 시장에서는 세트 작업을 위해 보통 1개월~1.5개월 전에 물량을 매입함.
-    # 따라서 도매 수요가 폭발하는 1월, 8월, 9월을 '명절 도매 성수기'로 지정.
-    df['month'] = df.index.month
-    df['is_holiday_peak'] = df['month'].isin([1, 8, 9]).astype(int)
-
-    # 기존 변수들 (기간 버퍼 및 수급)
-    df['import_vol_mom'] = df['import_vol'].pct_change() * 100
-    df['stock_mom'] = df['stock'].pct_change() * 100
-    
-    df['us_price_ma_3'] = df['us_price'].rolling(window=3).mean()
-    df['us_price_ma_6'] = df['us_price'].rolling(window=6).mean()
-    df['exchange_rate_ma_3'] = df['exchange_rate'].rolling(window=3).mean()
-    df['exchange_rate_ma_6'] = df['exchange_rate'].rolling(window=6).mean()
+    spec = get_spec('pct_check')
 
-    df['us_price_ma_3_mom'] = df['us_price_ma_3'].pct_change() * 100
-    df['us_price_ma_6_mom'] = df['us_price_ma_6'].pct_change() * 100
-    df['exchange_rate_ma_3_mom'] = df['exchange_rate_ma_3'].pct_change() * 100
-    df['exchange_rate_ma_6_mom'] = df['exchange_rate_ma_6'].pct_change() * 100
-
-    df['import_vol_yoy'] = df['import_vol'].pct_change(12) * 100
-    df['stock_yoy'] = df['stock'].pct_change(12) * 100
-
-    # 타겟: 6개월 내 최대 상승률(%)
-    df['target_max_return_6m'] = (df['kr_price_max_6m'] - df['kr_price']) / df['kr_price'] * 100
-
-    df = df.dropna()
+    # 과열 피로도·명절 시즌성·이동평균 모멘텀 변수와 6개월 최대 상승률 타겟은 model_specs에서 생성
+    try:
+        df = build_pct_check_frame()
+    except FileNotFoundError as e:
+        print(f"에러: 원천 데이터 파일을 찾을 수 없습니다. ({e})")
+        return
     target_col = 'target_max_return_6m'
     
     # 모델에 투입할 정예 11개 변수 (명절 변수 및 누적 피로도 추가)
-    features_to_use = [
-        'kr_price_mom', 
-        'kr_price_3m_mom',       # [추가] 과열 피로도
-        'is_holiday_peak',       # [추가] 시계열 (명절 효과)
-        'us_price_ma_3_mom', 'us_price_ma_6_mom',
-        'exchange_rate_ma_3_mom', 'exchange_rate_ma_6_mom',
-        'import_vol_mom', 'import_vol_yoy', 
-        'stock_mom', 'stock_yoy'
-    ]
+    features_to_use = PCT_CHECK_FEATURES
     
     X = df[features_to_use]
     y = df[target_col]
@@ -87,12 +43,17 @@ def main():
     print(f"  [파트 1] 핵심 변수 중요도 분석 (시즌성/과열 포함)")
     print(f"==================================================\n")
 
-    model = xgb.XGBRegressor(n_estimators=100, max_depth=4, learning_rate=0.05, random_state=42)
+    model = xgb.XGBRegressor(**spec.params)
     model.fit(X, y)
 
     predictions = model.predict(X)
     print("--- 모델 평가 결과 ---")
     print(f"설명력 (R-squared): {r2_score(y, predictions):.4f}")
+
+    # 모델 저장소에 등록 (배치 추론·대시보드가 재학습 없이 사용)
+    metrics = {'in_sample_mae': mean_absolute_error(y, predictions), 'in_sample_r2': r2_score(y, predictions)}
+    meta = model_registry.register_model(spec.name, model, X, y, metrics, spec.params)
+    print(f"모델 저장: {meta['version']}")
     
     fi_df = pd.DataFrame({'Feature': features_to_use, 'Importance': model.feature_importances_})
     fi_df = fi_df.sort_values(by='Importance', ascending=False).reset_index(drop=True)
@@ -14,24 +14,19 @@ parent_dir = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.append(parent_dir)
 
-from config import DATA_PROCESSED
+from model_specs import get_spec
+import model_registry
 
 def main():
-    # 롤링 윈도우 전용 데이터 로드
-    file_path = os.path.join(DATA_PROCESSED, "ml_features_rolling_rib.csv")
-    if not os.path.exists(file_path):
-        print("에러: 파일을 찾을 수 없습니다. feature_engineering_rolling.py를 먼저 실행하세요.")
-        return
+    spec = get_spec('rolling_horizon')
 
-    df = pd.read_csv(file_path, index_col=0, parse_dates=True)
-    
-    # 타겟: 향후 6개월 내 최대 상승폭
-    target_col = 'target_max_diff_6m'
-    
-    # 정답 유출 방지: 1~6개월 미래 가격 정보 모두 제거
-    leak_cols = [f'kr_price_lead_{i}' for i in range(1, 7)] + ['kr_price_max_6m', 'target_max_diff_6m']
-    X = df.drop(columns=leak_cols)
-    y = df[target_col]
+    # 롤링 윈도우 전용 데이터 로드 (피처 저장소)
+    # 타겟: 향후 6개월 내 최대 상승폭, 1~6개월 미래 가격 정보는 모두 제외 (정답 유출 방지)
+    try:
+        X, y = spec.build_dataset()
+    except FileNotFoundError as e:
+        print(f"에러: 원천 데이터 파일을 찾을 수 없습니다. ({e})")
+        return
 
     # 기획자 로직: 전체 패턴 학습 (In-sample 분석)
     X_train = X
@@ -41,12 +36,7 @@ def main():
     print(f"  [6개월 버퍼 모델] 통합 학습 및 중요도 분석")
     print(f"==================================================\n")
 
-    model = xgb.XGBRegressor(
-        n_estimators=100,
-        max_depth=4,
-        learning_rate=0.05,
-        random_state=42
-    )
+    model = xgb.XGBRegressor(**spec.params)
     
     model.fit(X_train, y_train)
 
@@ -59,6 +49,10 @@ def main():
     print(f"설명력 (R-squared): {r2:.4f} (In-sample)")
     print("-----------------------------------\n")
 
+    # 모델 저장소에 등록 (배치 추론·대시보드가 재학습 없이 사용)
+    meta = model_registry.register_model(spec.name, model, X_train, y_train, {'in_sample_mae': mae, 'in_sample_r2': r2}, spec.params)
+    print(f"모델 저장: {meta['version']}\n")
+
     # 변수 중요도 추출
     importance = model.feature_importances_
     feature_names = X.columns
@@ -0,0 +1,220 @@
+# [파일 정의서]
+# - 파일명: walk_forward.py
+# - 역할: 분석 (워크포워드 백테스트)
+# - 대상: 수입육 (model_specs.py에 정의된 모델)
+# - 주요 기능: 월별 피처 테이블을 시간 순서대로 나눠 '과거로 학습 → 다음 구간 예측'을 반복하는 표본 외(Out-of-sample) 평가
+#   1. expanding(확장: 처음부터 현재까지 학습) / sliding(고정 길이 창) 두 가지 학습 구간 방식
+#   2. 폴드마다 별도 프로세스에서 학습 (ProcessPoolExecutor, 프로세스별 XGBoost 스레드 수 분배)
+#   3. 폴드별 MAE / R² 와 예측값을 data/3_models/backtests/ 에 CSV로 저장
+#   4. search 하위 명령: 같은 폴드로 하이퍼파라미터 병렬 탐색 (param_search.py)
+# - 실행 예시:
+#     python src/Models/walk_forward.py --model baseline --mode expanding
+#     python src/Models/walk_forward.py run --model all --mode sliding --window 36 --test-size 3 --workers 4
+#     python src/Models/walk_forward.py search --model baseline --strategy grid
+#     python src/Models/walk_forward.py run --model baseline --use-best
+
+import os
+import sys
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.metrics import mean_absolute_error, r2_score
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from config import BACKTEST_DIR
+from utils.file_store import write_csv
+from model_specs import MODEL_SPECS, get_spec
+import param_search
+
+DEFAULT_MIN_TRAIN = 36      # 첫 폴드 최소 학습 개월 수 (expanding)
+DEFAULT_TEST_SIZE = 3       # 폴드당 예측 개월 수
+
+
+def make_folds(n_samples, mode='expanding', min_train=DEFAULT_MIN_TRAIN, test_size=DEFAULT_TEST_SIZE,
+               window=None, gap=0, step=None):
+    """
+    시간 순서 폴드 목록 [(train_idx, test_idx), ...]를 만든다.
+    - expanding: 학습 구간 = [0, 테스트 시작 - gap)
+    - sliding  : 학습 구간 = 최근 window개월 (테스트 시작 - gap 직전까지)
+    gap개월은 학습에서 제외 (테스트 시점에 아직 확정되지 않은 미래 구간 타겟)
+    """
+    step = step or test_size
+    window = window or min_train
+    first_test = (min_train if mode == 'expanding' else window) + gap
+
+    folds = []
+    for test_start in range(first_test, n_samples, step):
+        train_end = test_start - gap
+        train_start = 0 if mode == 'expanding' else max(0, train_end - window)
+        test_idx = np.arange(test_start, min(test_start + test_size, n_samples))
+        folds.append((np.arange(train_start, train_end), test_idx))
+    return folds
+
+
+def _fit_fold(task):
+    """워커 프로세스: 폴드 하나를 학습·예측 (스레드 수는 워커마다 지정)."""
+    fold, X_train, y_train, X_test, y_test, params, n_threads = task
+    model = xgb.XGBRegressor(**params, n_jobs=n_threads)
+    model.fit(X_train, y_train)
+    pred = model.predict(X_test)
+    return fold, pred
+
+
+def run_walk_forward(spec, mode='expanding', min_train=DEFAULT_MIN_TRAIN, test_size=DEFAULT_TEST_SIZE,
+                     window=None, workers=None, params=None):
+    """
+    모델 정의(ModelSpec)에 대해 워크포워드 평가를 수행한다.
+    반환: (폴드별 지표 DataFrame, 예측값 DataFrame)
+    """
+    X, y = spec.build_dataset()
+    folds = make_folds(len(X), mode, min_train, test_size, window, gap=spec.gap)
+    if not folds:
+        raise ValueError(f"데이터({len(X)}개월)가 최소 학습 기간보다 짧아 폴드를 만들 수 없습니다.")
+
+    workers = workers or min(len(folds), os.cpu_count() or 1)
+    n_threads = max(1, (os.cpu_count() or 1) // workers)
+    params = dict(params or spec.params)
+
+    X_values = X.to_numpy(dtype='float64')
+    y_values = y.to_numpy(dtype='float64')
+    tasks = [
+        (i, X_values[tr], y_values[tr], X_values[te], y_values[te], params, n_threads)
+        for i, (tr, te) in enumerate(folds)
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = dict(pool.map(_fit_fold, tasks))
+
+    metric_rows, pred_rows = [], []
+    for i, (tr, te) in enumerate(folds):
+        pred, actual = results[i], y_values[te]
+        metric_rows.append({
+            'model': spec.name,
+            'mode': mode,
+            'fold': i,
+            'train_start': X.index[tr[0]],
+            'train_end': X.index[tr[-1]],
+            'test_start': X.index[te[0]],
+            'test_end': X.index[te[-1]],
+            'n_train': len(tr),
+            'n_test': len(te),
+            'mae': mean_absolute_error(actual, pred),
+            'r2': r2_score(actual, pred) if len(te) > 1 else np.nan,
+        })
+        pred_rows.append(pd.DataFrame({
+            'model': spec.name,
+            'mode': mode,
+            'fold': i,
+            'date': X.index[te],
+            'actual': actual,
+            'predicted': pred,
+        }))
+
+    return pd.DataFrame(metric_rows), pd.concat(pred_rows, ignore_index=True)
+
+
+def save_results(df_metrics, df_pred, spec_name, mode):
+    BACKTEST_DIR.mkdir(parents=True, exist_ok=True)
+    metrics_path = BACKTEST_DIR / f"{spec_name}_{mode}_folds.csv"
+    pred_path = BACKTEST_DIR / f"{spec_name}_{mode}_predictions.csv"
+    write_csv(df_metrics, metrics_path)
+    write_csv(df_pred, pred_path)
+    return metrics_path, pred_path
+
+
+def summarize(df_metrics, df_pred):
+    """전체 표본 외 예측을 모은 MAE / R²."""
+    return {
+        'folds': len(df_metrics),
+        'oos_months': len(df_pred),
+        'mae': mean_absolute_error(df_pred['actual'], df_pred['predicted']),
+        'r2': r2_score(df_pred['actual'], df_pred['predicted']) if len(df_pred) > 1 else np.nan,
+    }
+
+
+def _add_fold_args(parser):
+    parser.add_argument("--model", choices=list(MODEL_SPECS) + ['all'], default='all', help="대상 모델 (기본: all)")
+    parser.add_argument("--mode", choices=['expanding', 'sliding'], default='expanding', help="학습 구간 방식")
+    parser.add_argument("--min-train", type=int, default=DEFAULT_MIN_TRAIN, help="expanding 첫 폴드 최소 학습 개월 수")
+    parser.add_argument("--window", type=int, default=None, help="sliding 학습 창 길이 (기본: --min-train)")
+    parser.add_argument("--test-size", type=int, default=DEFAULT_TEST_SIZE, help="폴드당 예측 개월 수")
+    parser.add_argument("--workers", type=int, default=None, help="동시 학습 프로세스 수 (기본: CPU 수)")
+
+
+def cmd_run(args, spec):
+    params = None
+    if args.use_best:
+        params = param_search.best_params(spec.name, args.mode)
+        print("탐색 결과 최적 설정 사용:" if params else "탐색 결과가 없어 기본 설정 사용", params or "")
+
+    start = time.time()
+    df_metrics, df_pred = run_walk_forward(
+        spec, args.mode, args.min_train, args.test_size, args.window, args.workers, params
+    )
+    summary = summarize(df_metrics, df_pred)
+    metrics_path, pred_path = save_results(df_metrics, df_pred, spec.name, args.mode)
+    print(f"폴드 {summary['folds']}개 / 표본 외 {summary['oos_months']}개월 ({time.time() - start:.1f}초)")
+    print(f"평균 절대 오차 (MAE): {summary['mae']:.2f}")
+    print(f"설명력 (R-squared): {summary['r2']:.4f} (Out-of-sample)")
+    print(f"저장: {metrics_path.name}, {pred_path.name}")
+
+
+def cmd_search(args, spec):
+    X, y = spec.build_dataset()
+    folds = make_folds(len(X), args.mode, args.min_train, args.test_size, args.window, gap=spec.gap)
+    if not folds:
+        raise ValueError(f"데이터({len(X)}개월)가 최소 학습 기간보다 짧아 폴드를 만들 수 없습니다.")
+    trials = (param_search.grid_trials() if args.strategy == 'grid'
+              else param_search.random_trials(args.trials, args.seed))
+
+    start = time.time()
+    df = param_search.run_search(spec, folds, X, y, trials, args.mode, args.workers)
+    print(f"탐색 완료 ({time.time() - start:.1f}초) — 상위 5개 설정 (검증 폴드 평균 MAE 기준)")
+    print(df[['mae', 'best_rounds', 'params']].head(5).to_string(index=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="워크포워드(표본 외) 백테스트 및 하이퍼파라미터 탐색")
+    sub = parser.add_subparsers(dest="command")
+
+    p_run = sub.add_parser("run", help="워크포워드 백테스트 (기본)")
+    _add_fold_args(p_run)
+    p_run.add_argument("--use-best", action="store_true", help="탐색 결과 DB의 최적 설정으로 평가")
+
+    p_search = sub.add_parser("search", help="워크포워드 폴드 기준 하이퍼파라미터 탐색")
+    _add_fold_args(p_search)
+    p_search.add_argument("--strategy", choices=['grid', 'random'], default='random', help="탐색 방식")
+    p_search.add_argument("--trials", type=int, default=40, help="random 탐색 시도 수")
+    p_search.add_argument("--seed", type=int, default=42, help="random 탐색 시드 (같은 시드면 재실행 시 이어서 탐색)")
+
+    # 하위 명령 없이 실행하면 run (기존 사용법 유지)
+    argv = sys.argv[1:]
+    if not argv or argv[0] not in ("run", "search", "-h", "--help"):
+        argv = ["run"] + argv
+    args = parser.parse_args(argv)
+
+    handler = cmd_search if args.command == "search" else cmd_run
+    names = list(MODEL_SPECS) if args.model == 'all' else [args.model]
+    for name in names:
+        spec = get_spec(name)
+        print(f"\n==================================================")
+        print(f"  [{name}] {spec.description} — {args.command} ({args.mode})")
+        print(f"==================================================")
+        try:
+            handler(args, spec)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"에러: {e}")
+
+
+if __name__ == "__main__":
+    main()
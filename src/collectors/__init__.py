@@ -9,6 +9,7 @@
 - crawl_imp_stock_monthly: KMTA 재고 데이터 수집
 - crawl_imp_food_safety: 식약처 검역 데이터 수집
 - crawl_imp_price_history: 미트박스 과거 시세 데이터 수집
+- crawl_imp_price_history_batch: 미트박스 과거 시세 일괄 백필 (전체 siseSeq)
 - crawl_com_usd_krw: 환율 데이터 수집
 - crawl_han_auction_api: 축산물품질평가원 경락가격 데이터 수집
 """
@@ -19,6 +20,7 @@ __all__ = [
     'crawl_imp_stock_monthly',
     'crawl_imp_food_safety',
     'crawl_imp_price_history',
+    'crawl_imp_price_history_batch',
     'crawl_com_usd_krw',
     'crawl_han_auction_api',
 ]
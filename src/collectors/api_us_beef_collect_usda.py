@@ -10,6 +10,7 @@ from dotenv import load_dotenv
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import USDA_BEEF_HISTORY_CSV, ensure_dirs
+from utils.file_store import write_csv
 
 # [파일 정의서]
 # - 파일명: src/collectors/api_us_beef_collect_usda.py
@@ -89,7 +90,7 @@ def save_checkpoint(new_data, save_path):
     df_final = df_final.sort_values(by=sort_cols, ascending=[False, True, True])
     df_final = df_final.drop(columns=['temp_dt'])
     
-    df_final.to_csv(save_path, index=False, encoding='utf-8-sig')
+    write_csv(df_final, save_path)
     return len(df_final)
 
 def fetch_and_append():
@@ -21,6 +21,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import DATA_RAW, RAW_CAFE_CRAWLING_CSV
 from utils.selenium_chrome import build_chrome_driver
+from utils.file_store import write_csv
 
 # 타겟 게시판 URL
 BOARDS = {
@@ -207,7 +208,7 @@ def main():
         if all_data:
             df = pd.DataFrame(all_data)
             os.makedirs(DATA_RAW, exist_ok=True)
-            df.to_csv(RAW_CAFE_CRAWLING_CSV, index=False, encoding='utf-8-sig')
+            write_csv(df, RAW_CAFE_CRAWLING_CSV)
             print(f"\n[완료] 크롤링 완료! 총 {len(df)}건의 데이터가 저장되었습니다.")
             print(f"저장 경로: {RAW_CAFE_CRAWLING_CSV}")
         else:
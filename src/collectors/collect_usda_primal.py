@@ -8,6 +8,7 @@ from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import USDA_PRIMAL_HISTORY_CSV, ensure_dirs
+from utils.file_store import write_csv
 
 # [파일 정의서]
 # - 파일명: collect_usda_primal.py
@@ -66,7 +67,7 @@ def collect_all_primal_data():
 
     # DataFrame으로 변환 후 CSV 저장
     df = pd.DataFrame(all_data)
-    df.to_csv(str(OUTPUT_FILE), index=False, encoding='utf-8-sig')
+    write_csv(df, OUTPUT_FILE)
     print("=" * 60)
     print(f"[수집 완료] 총 {len(df)}건의 Primal 데이터 적재 성공!")
     print(f"[저장 위치] {OUTPUT_FILE.resolve()}")
@@ -9,6 +9,7 @@ from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import DATA_RAW
+from utils.file_store import write_excel
 
 # [파일 정의서]
 # - 파일명: crawl_com_usd_krw.py
@@ -138,7 +139,7 @@ def update_exchange_rate():
         
         # 저장
         DATA_RAW.mkdir(parents=True, exist_ok=True)
-        df_final.to_excel(str(FILE_PATH), index=False, engine='openpyxl')
+        write_excel(df_final, FILE_PATH, engine='openpyxl')
         print(f"[완료] 업데이트 완료! 최종 데이터 기간: {df_final.iloc[0]['Date']} ~ {df_final.iloc[-1]['Date']}")
         
     else:
@@ -1,92 +1,262 @@
+import argparse
+import itertools
+import json
+import re
 import requests
 import pandas as pd
 import xml.etree.ElementTree as ET
-import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-from config import DATA_RAW, ensure_dirs
+from config import HAN_AUCTION_PARQUET, HAN_AUCTION_STATE_JSON, ensure_dirs
+from utils.columnar_store import read_table, upsert_table
+from utils.file_store import atomic_replace
 
 # [파일 정의서]
 # - 파일명: crawl_han_auction_api.py
 # - 역할: 수집 (축산물품질평가원 경락가격)
 # - 대상: 한우 부분육 경락가격 (등급별)
-# - 방식: 공공 API 호출 (XML 응답)
+# - 방식: 공공 API 호출 (XML 응답, numOfRows/pageNo 페이지 순회)
 # - 주요 기능: 축산물품질평가원(EKAPE) API를 통해 한우 부분육의 등급별 경락가격 데이터를 수집
-#              지정된 기간의 도축장별 데이터를 XML로 수신하여 엑셀로 저장
-
-def get_beef_primal_cut_prices():
-    # 1. API 접속 정보 설정 (가이드 문서 v1.1 기준) 
-    url = "http://data.ekape.or.kr/openapi-data/service/user/grade/auct/beefGrade"
-    
-    # 재발급받으신 인증키를 입력하세요.
-    service_key = "a8f4ac5762418c8d94aaccf7d88141b9999ad37f1a157f0ef83cf140c58fab09"
-    
-    # 2. 요청 파라미터 설정 [cite: 15, 20]
-    params = {
-        'serviceKey': service_key,
-        'startYmd': '20240101',      # 경매 시작일
-        'endYmd': '20240110',        # 경매 종료일
-        'abattCd': '1005',           # 김해축공 (선택 사항)
-        'sexCd': '1'                 # 1: 암, 2: 수, 3: 거세 (선택 사항)
-    }
-
-    # 방화벽 차단 방지를 위한 헤더 설정
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+#              경매일 × 도축장 × 성별 단위로 제한된 동시 요청을 보내고, 응답은 iterparse로 스트리밍 파싱
+#              결과는 Parquet 컬럼형 테이블(han_auction_prices.parquet)에 증분 누적
+#              실패한 (일자×도축장×성별) 단위는 상태 파일(han_auction_state.json)에 남겨 다음 실행 때 다시 요청
+#              (증분 시작일은 마지막 수집일 기준이라, 상태 파일이 없으면 실패 구간이 영구 누락됨)
+# - 실행 예시:
+#     python src/collectors/crawl_han_auction_api.py                                   → 마지막 수집일 다음날부터 증분
+#     python src/collectors/crawl_han_auction_api.py --start 20240101 --end 20240131 --abatt 1005 0302
 
-    try:
-        print(f"--- 부분육 경락가격 수집 시도 (기간: {params['startYmd']} ~ {params['endYmd']}) ---")
-        response = requests.get(url, params=params, headers=headers)
-        
-        if response.status_code == 200:
-            root = ET.fromstring(response.content)
-            
-            # 응답 결과 확인 
-            result_code = root.find('.//resultCode').text
-            result_msg = root.find('.//resultMsg').text
-            
-            if result_code == '00':
-                items = root.findall('.//item')
-                if not items:
-                    print("데이터가 없습니다. 조건(날짜, 시장코드 등)을 확인해주세요.")
-                    return None
-                
-                # 데이터 파싱 
-                data_list = []
-                for item in items:
-                    row = {child.tag: child.text for child in item}
-                    data_list.append(row)
-                
-                df = pd.DataFrame(data_list)
-                print(f"[완료] 성공: {len(df)}건의 부위별 데이터를 수집했습니다.")
-                return df
-            else:
-                print(f"[에러] API 에러: {result_msg} (코드: {result_code})")
+API_URL = "http://data.ekape.or.kr/openapi-data/service/user/grade/auct/beefGrade"
+
+# 재발급받으신 인증키를 입력하세요.
+SERVICE_KEY = "a8f4ac5762418c8d94aaccf7d88141b9999ad37f1a157f0ef83cf140c58fab09"
+
+# 방화벽 차단 방지를 위한 헤더 설정
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+DEFAULT_ABATT_CODES = ['1005']         # 김해축공
+DEFAULT_SEX_CODES = ['1', '2', '3']    # 1: 암, 2: 수, 3: 거세
+DEFAULT_START = "20240101"             # 저장소가 비어 있을 때의 최초 수집 시작일
+NUM_OF_ROWS = 100
+DEFAULT_WORKERS = 4
+REQUEST_TIMEOUT = 30
+FLUSH_EVERY = 50                       # N개 (일자×도축장×성별) 단위마다 중간 저장
+
+KEY_COLS = ['auction_date', 'abattCd', 'sexCd', 'cutmeatName']
+# 수치 필드: 등급별 경락 평균가(hanAvg0~, han_1Avg…)와 두수·상자 수(hanBoxCnt, han_0Cnt, yukBoxCnt, yuk_5Cnt…)
+# 그 밖의 필드(부위명·등급명 등, API에 새로 추가되는 필드 포함)는 원문 그대로 문자열로 저장
+NUMERIC_COL_PATTERN = re.compile(r'^(han|yuk)(_\d+)?(Avg\d*|BoxCnt|Cnt)$')
+NO_DATA_CODES = {'03'}                 # NODATA_ERROR: 해당 조건의 경매 없음
+
+
+class EkapeApiError(Exception):
+    """API가 정상 코드('00')가 아닌 결과를 반환한 경우."""
+
+
+_thread_local = threading.local()
+
+
+def _session():
+    if not hasattr(_thread_local, "session"):
+        s = requests.Session()
+        s.headers.update(HEADERS)
+        _thread_local.session = s
+    return _thread_local.session
+
+
+def _iter_page_items(params, header):
+    """
+    한 페이지를 스트리밍으로 받아 item 단위로 yield 한다.
+    응답 전체를 메모리에 올리지 않도록 iterparse 후 처리한 요소는 즉시 clear.
+    header에는 resultCode / resultMsg / totalCount가 채워진다.
+    """
+    with _session().get(API_URL, params=params, stream=True, timeout=REQUEST_TIMEOUT) as response:
+        if response.status_code != 200:
+            raise EkapeApiError(f"HTTP {response.status_code}")
+        response.raw.decode_content = True
+
+        for _, elem in ET.iterparse(response.raw, events=('end',)):
+            if elem.tag == 'item':
+                yield {child.tag: child.text for child in elem}
+                elem.clear()
+            elif elem.tag in ('resultCode', 'resultMsg', 'totalCount'):
+                header[elem.tag] = elem.text
+
+    code = header.get('resultCode')
+    if code not in (None, '00') and code not in NO_DATA_CODES:
+        raise EkapeApiError(f"{header.get('resultMsg')} (코드: {code})")
+
+
+def fetch_auction_day(ymd, abatt_cd, sex_cd):
+    """경매일 하루 × 도축장 × 성별 조건의 전체 페이지를 수집해 행 리스트로 반환한다."""
+    rows = []
+    page_no = 1
+    while True:
+        params = {
+            'serviceKey': SERVICE_KEY,
+            'startYmd': ymd,
+            'endYmd': ymd,
+            'abattCd': abatt_cd,
+            'sexCd': sex_cd,
+            'numOfRows': NUM_OF_ROWS,
+            'pageNo': page_no,
+        }
+        header = {}
+        page_count = 0
+        for item in _iter_page_items(params, header):
+            item['auction_date'] = ymd
+            item['abattCd'] = abatt_cd
+            item['sexCd'] = sex_cd
+            rows.append(item)
+            page_count += 1
+
+        total_count = int(header.get('totalCount') or 0)
+        if page_count < NUM_OF_ROWS or page_no * NUM_OF_ROWS >= total_count:
+            break
+        page_no += 1
+    return rows
+
+
+def to_typed_frame(rows):
+    """수집 행을 컬럼형 저장용 타입으로 변환한다 (날짜, NUMERIC_COL_PATTERN 수치 필드, 나머지는 문자열)."""
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+    df['auction_date'] = pd.to_datetime(df['auction_date'], format='%Y%m%d')
+    for col in df.columns:
+        if col == 'auction_date':
+            continue
+        if NUMERIC_COL_PATTERN.match(col):
+            df[col] = pd.to_numeric(df[col].str.replace(',', '', regex=False), errors='coerce').astype('float64')
         else:
-            print(f"[에러] 통신 에러: HTTP {response.status_code}")
+            df[col] = df[col].astype('string')
+    return df
+
+
+def _date_range(start_ymd, end_ymd):
+    start = datetime.strptime(start_ymd, '%Y%m%d')
+    end = datetime.strptime(end_ymd, '%Y%m%d')
+    return [(start + timedelta(days=i)).strftime('%Y%m%d') for i in range((end - start).days + 1)]
+
+
+def load_failed_units(path=HAN_AUCTION_STATE_JSON):
+    """상태 파일의 미수집(실패) 단위 집합 {(일자, 도축장, 성별)}."""
+    if not Path(path).exists():
+        return set()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return {tuple(unit) for unit in json.load(f).get('failed', [])}
+    except (OSError, ValueError):
+        print("[경고] 상태 파일을 읽을 수 없어 이전 실패 단위 재시도를 건너뜁니다.")
+        return set()
+
+
+def save_failed_units(failed, path=HAN_AUCTION_STATE_JSON):
+    """미수집 단위를 상태 파일에 저장 (임시 파일 → 교체)."""
+    state = {'failed': sorted(list(unit) for unit in failed),
+             'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+    with atomic_replace(path) as tmp_path:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=1)
+
+
+def get_next_start_date():
+    """저장소의 마지막 경매일 다음 날을 반환 (저장소가 없으면 DEFAULT_START)."""
+    df = read_table(HAN_AUCTION_PARQUET, columns=['auction_date'])
+    if df is None or df.empty:
+        return DEFAULT_START
+    return (df['auction_date'].max() + timedelta(days=1)).strftime('%Y%m%d')
+
+
+def collect_auction_prices(start_ymd, end_ymd, abatt_codes=DEFAULT_ABATT_CODES,
+                           sex_codes=DEFAULT_SEX_CODES, workers=DEFAULT_WORKERS):
+    """
+    기간 × 도축장 × 성별 조합과 이전 실행에서 실패한 조합을 제한된 동시 요청으로 수집하여 저장소에 누적한다.
+    이번 실행에서 실패한 조합 수를 반환한다 (실패 단위는 상태 파일에 남아 다음 실행 때 재시도).
+    """
+    ensure_dirs()
+    tasks = list(itertools.product(_date_range(start_ymd, end_ymd), abatt_codes, sex_codes))
+    failed = load_failed_units()
+    retry = sorted(failed - set(tasks))
+    tasks += retry
+    print(f"--- 부분육 경락가격 수집 (기간: {start_ymd} ~ {end_ymd}, 요청 단위 {len(tasks)}개"
+          f"(이전 실패 재시도 {len(retry)}개 포함), 동시 {workers}개) ---")
+    if not tasks:
+        return 0
+
+    pending, done, fail_cnt, row_cnt = [], [], 0, 0
+
+    def flush():
+        # 저장소에 반영된 단위만 실패 목록에서 제거 → 중단되어도 누락 단위가 상태 파일에 남음
+        if pending:
+            df = to_typed_frame(pending)
+            total = upsert_table(df, HAN_AUCTION_PARQUET, KEY_COLS)
+            print(f"[자동 저장] {len(df)}건 추가 → 누적 {total}건")
+            pending.clear()
+        failed.difference_update(done)
+        done.clear()
+        save_failed_units(failed)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch_auction_day, *task): task for task in tasks}
+        for i, future in enumerate(as_completed(futures), start=1):
+            ymd, abatt_cd, sex_cd = futures[future]
+            try:
+                rows = future.result()
+            except (requests.RequestException, ET.ParseError, EkapeApiError) as e:
+                fail_cnt += 1
+                failed.add((ymd, abatt_cd, sex_cd))
+                print(f"[에러] {ymd} 도축장 {abatt_cd} 성별 {sex_cd}: {e}")
+                continue
+            pending.extend(rows)
+            done.append((ymd, abatt_cd, sex_cd))
+            row_cnt += len(rows)
+            if i % FLUSH_EVERY == 0:
+                flush()
+    flush()
+
+    print(f"[완료] 수집 {row_cnt}건 / 실패 {fail_cnt}개 조건 (다음 실행 재시도 대상 누적 {len(failed)}개)")
+    return fail_cnt
+
+
+def get_beef_primal_cut_prices(start_ymd='20240101', end_ymd='20240110', abatt_cd='1005', sex_cd='1'):
+    """단일 도축장·성별·기간 조회 결과를 DataFrame으로 반환 (저장하지 않음)."""
+    rows = []
+    for ymd in _date_range(start_ymd, end_ymd):
+        rows.extend(fetch_auction_day(ymd, abatt_cd, sex_cd))
+    if not rows:
+        print("데이터가 없습니다. 조건(날짜, 시장코드 등)을 확인해주세요.")
+        return None
+    df = to_typed_frame(rows)
+    print(f"[완료] 성공: {len(df)}건의 부위별 데이터를 수집했습니다.")
+    return df
+
+
+def main():
+    yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y%m%d')
+    parser = argparse.ArgumentParser(description="축평원 한우 부분육 경락가격 증분 수집")
+    parser.add_argument("--start", default=None, help="경매 시작일 YYYYMMDD (기본: 저장소 마지막 수집일 다음 날)")
+    parser.add_argument("--end", default=yesterday, help="경매 종료일 YYYYMMDD (기본: 어제)")
+    parser.add_argument("--abatt", nargs="+", default=DEFAULT_ABATT_CODES, help="도축장 코드 목록")
+    parser.add_argument("--sex", nargs="+", default=DEFAULT_SEX_CODES, help="성별 코드 목록 (1: 암, 2: 수, 3: 거세)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="동시 요청 수")
+    args = parser.parse_args()
+
+    start_ymd = args.start or get_next_start_date()
+    if start_ymd > args.end and not load_failed_units():
+        print("[성공] 이미 최신 상태입니다. 수집할 데이터가 없습니다.")
+        return
+
+    fail_cnt = collect_auction_prices(start_ymd, args.end, args.abatt, args.sex, args.workers)
+    print(f"저장 위치: {HAN_AUCTION_PARQUET}")
+    raise SystemExit(0 if fail_cnt == 0 else 1)
 
-    except Exception as e:
-        print(f"오류 발생: {e}")
-    
-    return None
 
 if __name__ == "__main__":
-    primal_cut_df = get_beef_primal_cut_prices()
-    
-    if primal_cut_df is not None:
-        # 모델링에 중요한 주요 컬럼만 우선 확인 
-        # hanAvg0: 1++등급, hanAvg1: 1+등급, hanAvg2: 1등급 가격
-        cols = ['cutmeatName', 'hanAvg0', 'hanAvg1', 'hanAvg2', 'hanBoxCnt']
-        display_cols = [c for c in cols if c in primal_cut_df.columns]
-        
-        print("\n--- 수집 데이터 샘플 (상위 5건) ---")
-        print(primal_cut_df[display_cols].head())
-        
-        # 엑셀 파일 저장
-        ensure_dirs()
-        save_path = DATA_RAW / "beef_primal_cut_prices.xlsx"
-        primal_cut_df.to_excel(str(save_path), index=False)
-        print(f"\n'{save_path}' 파일로 저장되었습니다.")
\ No newline at end of file
+    main()
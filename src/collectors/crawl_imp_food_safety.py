@@ -34,6 +34,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import DATA_RAW, MASTER_IMPORT_VOLUME_CSV, ensure_dirs
 from utils.selenium_chrome import build_chrome_driver
+from utils.file_store import file_lock, write_csv
 
 ensure_dirs()
 MASTER_FILE = MASTER_IMPORT_VOLUME_CSV
@@ -282,32 +283,33 @@ def integrate_to_master(new_safety_df):
     part_cols = [c for c in pivoted.columns if c.startswith('부위별_') and '계_합계' not in c]
     pivoted['부위별_계_합계'] = pivoted[part_cols].sum(axis=1)
 
-    if MASTER_FILE.exists():
-        master_df = pd.read_csv(str(MASTER_FILE))
+    with file_lock(MASTER_FILE):
+        if MASTER_FILE.exists():
+            master_df = pd.read_csv(str(MASTER_FILE))
         
-        if '구분' not in master_df.columns:
-            possible_cols = [c for c in master_df.columns if '구분' in c]
-            if possible_cols:
-                print(f"[수정] 잘못된 컬럼명 감지 및 수정: {possible_cols[0]} -> 구분")
-                master_df.rename(columns={possible_cols[0]: '구분'}, inplace=True)
-
-        master_columns = master_df.columns.tolist()
-        pivoted_aligned = pivoted.reindex(columns=master_columns, fill_value=0)
+            if '구분' not in master_df.columns:
+                possible_cols = [c for c in master_df.columns if '구분' in c]
+                if possible_cols:
+                    print(f"[수정] 잘못된 컬럼명 감지 및 수정: {possible_cols[0]} -> 구분")
+                    master_df.rename(columns={possible_cols[0]: '구분'}, inplace=True)
+
+            master_columns = master_df.columns.tolist()
+            pivoted_aligned = pivoted.reindex(columns=master_columns, fill_value=0)
         
-        target_dates = pivoted_aligned['std_date'].unique()
-        master_df = master_df[~master_df['std_date'].isin(target_dates)]
+            target_dates = pivoted_aligned['std_date'].unique()
+            master_df = master_df[~master_df['std_date'].isin(target_dates)]
         
-        final_df = pd.concat([master_df, pivoted_aligned], axis=0, ignore_index=True)
-    else:
-        final_df = pivoted
+            final_df = pd.concat([master_df, pivoted_aligned], axis=0, ignore_index=True)
+        else:
+            final_df = pivoted
 
-    try:
-        final_df = final_df.sort_values(by=['std_date', '구분'], ascending=[False, True])
-    except KeyError:
-        print("[경고] 정렬 기준 컬럼('구분')을 찾을 수 없어 날짜로만 정렬합니다.")
-        final_df = final_df.sort_values(by=['std_date'], ascending=False)
+        try:
+            final_df = final_df.sort_values(by=['std_date', '구분'], ascending=[False, True])
+        except KeyError:
+            print("[경고] 정렬 기준 컬럼('구분')을 찾을 수 없어 날짜로만 정렬합니다.")
+            final_df = final_df.sort_values(by=['std_date'], ascending=False)
 
-    final_df.to_csv(str(MASTER_FILE), index=False, encoding='utf-8-sig')
+        write_csv(final_df, MASTER_FILE)
     print(f"[완료] 통합 저장 완료 (합계 컬럼 재계산됨)")
 
 # =========================================================
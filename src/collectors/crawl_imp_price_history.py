@@ -7,6 +7,7 @@ from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import DATA_RAW, ensure_dirs
+from utils.file_store import write_excel
 
 # [파일 정의서]
 # - 파일명: crawl_imp_price_history.py
@@ -55,7 +56,7 @@ def get_meatbox_exact_data():
                 file_name = f"meatbox_sise_{payload['siseSeq']}.xlsx"
                 save_path = DATA_RAW / file_name
                 
-                df.to_excel(str(save_path), index=False)
+                write_excel(df, save_path)
                 
                 print(f"[완료] 성공! 총 {len(df)}일치의 데이터를 가져왔습니다.")
                 print(f"[경로] 저장 위치: {save_path}")
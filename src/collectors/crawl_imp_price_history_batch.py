@@ -0,0 +1,298 @@
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import requests
+import urllib3
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from config import (
+    MEATBOX_ID_LIST_XLSX,
+    MEATBOX_HISTORY_BATCH_DIR,
+    MEATBOX_HISTORY_PARQUET,
+    MEATBOX_HISTORY_STATE_JSON,
+    ensure_dirs,
+)
+from utils.columnar_store import upsert_table
+
+# [파일 정의서]
+# - 파일명: crawl_imp_price_history_batch.py
+# - 역할: 수집 (미트박스 과거 시세 일괄 백필)
+# - 대상: 수입육 (meatbox_id_list.xlsx 전체 siseSeq)
+# - 방식: API 호출 (JSON 응답, 동시 요청 + 초당 요청 수 제한)
+# - 주요 기능:
+#   1. ID 리스트의 모든 siseSeq에 대해 최근 1년치 차트 시세를 동시 수집
+#   2. siseSeq별 상태 파일(meatbox_history_state.json)로 중단 후 재실행 시 이어서 수집
+#   3. 모든 시계열을 siseSeq × 일자 키의 단일 Parquet 이력 테이블로 병합 저장
+# - 실행 예시:
+#     python src/collectors/crawl_imp_price_history_batch.py                 → 미완료 ID만 수집
+#     python src/collectors/crawl_imp_price_history_batch.py --force         → 전체 재수집
+#     python src/collectors/crawl_imp_price_history_batch.py --seed-batch    → 기존 history_batch/*.xlsx 이관
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+API_URL = "https://www.meatbox.co.kr/fo/sise/getSiseChartInfoList.json"
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Referer': 'https://www.meatbox.co.kr/fo/sise/siseMain.do',
+    'Origin': 'https://www.meatbox.co.kr',
+    'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8'
+}
+
+HISTORY_COLS = ['siseSeq', 'date', 'part_name', 'country', 'storage', 'wholesale_price']
+KEY_COLS = ['siseSeq', 'date']
+
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 2.0          # 초당 최대 요청 수 (전체 스레드 합산)
+REQUEST_TIMEOUT = 15
+MAX_RETRIES = 3
+FLUSH_EVERY = 20            # N개 ID 수집마다 이력 테이블에 중간 저장
+
+
+class RateLimiter:
+    """모든 스레드가 공유하는 요청 간격 제한기 (초당 rate회)."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+_thread_local = threading.local()
+
+
+def _session():
+    """스레드별 requests.Session 재사용 (연결 재활용)."""
+    if not hasattr(_thread_local, "session"):
+        s = requests.Session()
+        s.headers.update(HEADERS)
+        s.verify = False
+        _thread_local.session = s
+    return _thread_local.session
+
+
+def load_id_list(path=MEATBOX_ID_LIST_XLSX):
+    """ID 리스트를 읽어 siseSeq 기준 중복 제거한 메타 데이터를 반환한다."""
+    df = pd.read_excel(str(path))
+    if 'siseSeq' not in df.columns:
+        raise ValueError("ID 리스트에 'siseSeq' 컬럼이 존재하지 않습니다.")
+    df = df.dropna(subset=['siseSeq']).copy()
+    df['siseSeq'] = df['siseSeq'].astype('int64')
+    return df.drop_duplicates(subset=['siseSeq'], keep='last').reset_index(drop=True)
+
+
+def load_state(path=MEATBOX_HISTORY_STATE_JSON):
+    if not Path(path).exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        print("[경고] 상태 파일을 읽을 수 없어 처음부터 수집합니다.")
+        return {}
+
+
+def save_state(state, path=MEATBOX_HISTORY_STATE_JSON):
+    """상태 파일을 임시 파일에 쓴 뒤 교체하여, 중단 시에도 깨진 JSON이 남지 않게 한다."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+
+def _extract_chart_rows(data_json):
+    """API 응답(JSON)에서 차트 행 리스트를 꺼낸다. 응답 구조 두 가지를 모두 지원."""
+    if isinstance(data_json, list):
+        return data_json
+    if isinstance(data_json, dict):
+        data = data_json.get('data')
+        if isinstance(data, dict) and isinstance(data.get('chartInfoList'), list):
+            return data['chartInfoList']
+    return None
+
+
+def _to_history_frame(rows, meta):
+    """차트 행을 이력 테이블 스키마로 변환한다."""
+    df = pd.DataFrame(rows)
+    date_col = next((c for c in ('siseDate', 'baseDate', 'date', '기준일자') if c in df.columns), None)
+    price_col = next((c for c in ('price', 'sise', '도매시세') if c in df.columns), None)
+    if date_col is None or price_col is None:
+        return None
+
+    out = pd.DataFrame({
+        'date': pd.to_datetime(df[date_col], errors='coerce'),
+        'wholesale_price': pd.to_numeric(df[price_col], errors='coerce').astype('float64'),
+    })
+    out['siseSeq'] = int(meta['siseSeq'])
+    out['part_name'] = meta.get('품목명')
+    out['country'] = meta.get('원산지')
+    out['storage'] = meta.get('보관')
+    out = out.dropna(subset=['date'])
+    return out[HISTORY_COLS]
+
+
+def fetch_history(meta, limiter):
+    """단일 siseSeq의 1년치 차트 시세를 요청한다. (status, DataFrame|None, message) 반환."""
+    params = {'siseSeq': str(meta['siseSeq']), 'searchPeriod': 'year', 'term': '12'}
+    last_error = ""
+    for attempt in range(1, MAX_RETRIES + 1):
+        limiter.wait()
+        try:
+            response = _session().post(API_URL, data=params, timeout=REQUEST_TIMEOUT)
+            if response.status_code != 200:
+                last_error = f"HTTP {response.status_code}"
+            else:
+                rows = _extract_chart_rows(response.json())
+                if not rows:
+                    return 'empty', None, "응답은 정상이나 데이터 없음"
+                df = _to_history_frame(rows, meta)
+                if df is None or df.empty:
+                    return 'empty', None, "날짜/가격 컬럼을 찾지 못함"
+                return 'ok', df, f"{len(df)}건"
+        except (requests.RequestException, ValueError) as e:
+            last_error = str(e)
+        time.sleep(attempt)  # 재시도 간 점증 대기
+    return 'error', None, last_error
+
+
+def seed_from_batch_files(id_meta, state):
+    """아카이브 배치(history_batch/sise_<ID>.xlsx) 파일을 이력 테이블로 이관한다."""
+    files = sorted(MEATBOX_HISTORY_BATCH_DIR.glob("sise_*.xlsx"))
+    if not files:
+        print("[안내] 이관할 history_batch 파일이 없습니다.")
+        return 0
+
+    meta_by_id = {int(r['siseSeq']): r for r in id_meta.to_dict('records')}
+    frames = []
+    for f in files:
+        try:
+            sise_seq = int(f.stem.split('_')[1])
+            df_raw = pd.read_excel(str(f))
+        except (ValueError, IndexError, OSError) as e:
+            print(f" -> [스킵] {f.name}: {e}")
+            continue
+        # 배치 파일의 siseSeq 컬럼은 API 응답값(0)으로 덮여 있어 파일명의 ID를 사용
+        meta = dict(meta_by_id.get(sise_seq, {}))
+        meta['siseSeq'] = sise_seq
+        for col in ('품목명', '원산지', '보관'):
+            if col not in meta and col in df_raw.columns:
+                meta[col] = df_raw[col].iloc[0]
+        df = _to_history_frame(df_raw.to_dict('records'), meta)
+        if df is None or df.empty:
+            continue
+        frames.append(df)
+        state[str(sise_seq)] = {
+            'status': 'seeded', 'rows': len(df),
+            'last_date': df['date'].max().strftime('%Y-%m-%d'),
+            'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+
+    if not frames:
+        return 0
+    total = upsert_table(pd.concat(frames, ignore_index=True), MEATBOX_HISTORY_PARQUET, KEY_COLS)
+    save_state(state)
+    print(f"[이관 완료] {len(frames)}개 파일 → 이력 테이블 누적 {total}행")
+    return len(frames)
+
+
+def _is_done(entry, today):
+    """오늘 이미 성공(또는 빈 응답 확인)한 ID는 재실행 시 건너뛴다."""
+    if not entry:
+        return False
+    return entry.get('status') in ('ok', 'empty') and str(entry.get('updated_at', '')).startswith(today)
+
+
+def run_backfill(workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, force=False, limit=None):
+    ensure_dirs()
+    id_meta = load_id_list()
+    state = {} if force else load_state()
+    today = datetime.now().strftime('%Y-%m-%d')
+
+    targets = [m for m in id_meta.to_dict('records') if force or not _is_done(state.get(str(m['siseSeq'])), today)]
+    if limit:
+        targets = targets[:limit]
+
+    print("=" * 60)
+    print(f"[시작] 미트박스 과거 시세 백필: 대상 {len(targets)}개 / 전체 {len(id_meta)}개")
+    print(f"  동시 작업 {workers}개, 초당 최대 {rate}회 요청")
+    print("=" * 60)
+    if not targets:
+        print("[성공] 모든 ID가 이미 최신 상태입니다.")
+        return True
+
+    limiter = RateLimiter(rate)
+    pending, counts = [], {'ok': 0, 'empty': 0, 'error': 0}
+
+    def flush():
+        if pending:
+            total = upsert_table(pd.concat(pending, ignore_index=True), MEATBOX_HISTORY_PARQUET, KEY_COLS)
+            pending.clear()
+            print(f"[자동 저장] 이력 테이블 누적 {total}행")
+        save_state(state)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch_history, m, limiter): m for m in targets}
+        for i, future in enumerate(as_completed(futures), start=1):
+            meta = futures[future]
+            status, df, message = future.result()
+            counts[status] += 1
+            entry = {'status': status, 'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+            if df is not None:
+                pending.append(df)
+                entry['rows'] = len(df)
+                entry['last_date'] = df['date'].max().strftime('%Y-%m-%d')
+            else:
+                entry['message'] = message
+            state[str(meta['siseSeq'])] = entry
+            print(f"[{i}/{len(targets)}] {meta['siseSeq']} ({meta.get('품목명', '-')}) -> {status} {message}")
+
+            if i % FLUSH_EVERY == 0:
+                flush()
+    flush()
+
+    print("-" * 60)
+    print(f"[완료] 성공 {counts['ok']} / 데이터 없음 {counts['empty']} / 실패 {counts['error']}")
+    print(f"저장 위치: {MEATBOX_HISTORY_PARQUET}")
+    if counts['error']:
+        print("[안내] 실패한 ID는 재실행 시 자동으로 다시 수집합니다.")
+    return counts['error'] == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="미트박스 과거 시세 일괄 백필 (siseSeq 전체)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="동시 요청 스레드 수")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="초당 최대 요청 수 (전체 합산)")
+    parser.add_argument("--force", action="store_true", help="상태 파일을 무시하고 전체 재수집")
+    parser.add_argument("--limit", type=int, default=None, help="이번 실행에서 수집할 최대 ID 수")
+    parser.add_argument("--seed-batch", action="store_true",
+                        help="기존 history_batch/*.xlsx 파일을 이력 테이블로 이관만 수행")
+    args = parser.parse_args()
+
+    if args.seed_batch:
+        ensure_dirs()
+        seed_from_batch_files(load_id_list(), load_state())
+        return
+
+    ok = run_backfill(workers=args.workers, rate=args.rate, force=args.force, limit=args.limit)
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
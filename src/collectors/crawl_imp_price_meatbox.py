@@ -26,6 +26,7 @@ import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import DATA_PROCESSED
 from utils.selenium_chrome import build_chrome_driver
+from utils.file_store import write_csv
 
 URL = "https://www.meatbox.co.kr/fo/sise/siseListPage.do"
 
@@ -343,7 +344,7 @@ def get_price_data(min_expected_pages: int = MIN_EXPECTED_PAGES) -> bool:
                     f"(잔여 {len(new_master_df)}행)",
                     flush=True,
                 )
-            new_master_df.to_csv(str(master_file), index=False, encoding="utf-8-sig")
+            write_csv(new_master_df, master_file)
 
             print(f"\n[성공] 데이터 저장 완료! (오늘 수집: {len(final_df)}건)")
             return True
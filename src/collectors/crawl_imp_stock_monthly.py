@@ -17,6 +17,7 @@ from datetime import datetime
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import DATA_RAW, BEEF_STOCK_XLSX
+from utils.file_store import write_excel
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -169,14 +170,14 @@ if __name__ == "__main__":
             else:
                 final_df = new_data_df
             
-            final_df.to_excel(save_path, index=False)
+            write_excel(final_df, save_path)
             
             print("\n" + "="*40)
             print(f"[완료] 재고 데이터 수집 및 저장 성공!")
             print(f"[전체] 총 {len(final_df)}건")
             print("="*40)
         elif existing_df is not None and not existing_df.empty:
-            existing_df.to_excel(save_path, index=False) # 청소된 데이터 다시 저장
+            write_excel(existing_df, save_path) # 청소된 데이터 다시 저장
             print("\n" + "="*40)
             print("[정보] 신규 등록된 데이터가 없습니다 (협회 미업데이트)")
             print("="*40)
@@ -10,6 +10,7 @@ from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import DATA_RAW
+from utils.file_store import file_lock, write_csv
 
 # [파일 정의서]
 # - 파일명: src/crawl_imp_volume_monthly.py
@@ -197,26 +198,27 @@ if all_data:
     new_df = pd.concat(all_data, ignore_index=True)
 
     # 기존 데이터가 있으면 병합
-    existing_df = None
-    if os.path.exists(SAVE_PATH):
-        try:
-            existing_df = pd.read_csv(SAVE_PATH, encoding='utf-8-sig')
-        except Exception:
-            existing_df = None
-
-    if existing_df is not None and not existing_df.empty:
-        # 기존 + 신규 병합, 중복 제거 (std_date + 구분 기준)
-        final_df = pd.concat([existing_df, new_df], ignore_index=True)
-        final_df = final_df.drop_duplicates(subset=['std_date', '구분'], keep='last')
-        print(f"[병합] 기존 {len(existing_df)}행 + 신규 {len(new_df)}행 = 총 {len(final_df)}행")
-    else:
-        final_df = new_df
+    with file_lock(SAVE_PATH):
+        existing_df = None
+        if os.path.exists(SAVE_PATH):
+            try:
+                existing_df = pd.read_csv(SAVE_PATH, encoding='utf-8-sig')
+            except Exception:
+                existing_df = None
+
+        if existing_df is not None and not existing_df.empty:
+            # 기존 + 신규 병합, 중복 제거 (std_date + 구분 기준)
+            final_df = pd.concat([existing_df, new_df], ignore_index=True)
+            final_df = final_df.drop_duplicates(subset=['std_date', '구분'], keep='last')
+            print(f"[병합] 기존 {len(existing_df)}행 + 신규 {len(new_df)}행 = 총 {len(final_df)}행")
+        else:
+            final_df = new_df
 
-    # [핵심] 날짜 기준 내림차순 정렬 (최신순)
-    final_df = final_df.sort_values(by=['std_date', '구분'], ascending=[False, True])
+        # [핵심] 날짜 기준 내림차순 정렬 (최신순)
+        final_df = final_df.sort_values(by=['std_date', '구분'], ascending=[False, True])
 
-    # 저장
-    final_df.to_csv(SAVE_PATH, index=False, encoding='utf-8-sig')
+        # 저장
+        write_csv(final_df, SAVE_PATH)
 
     print(f"[완료] 수집 및 정렬 완료!")
     print(f"[저장 경로] {SAVE_PATH}")
@@ -16,10 +16,23 @@ PROJECT_ROOT = _this_file.parent.parent
 DATA_RAW = PROJECT_ROOT / "data" / "0_raw"
 DATA_PROCESSED = PROJECT_ROOT / "data" / "1_processed"
 DATA_DASHBOARD = PROJECT_ROOT / "data" / "2_dashboard"
+DATA_MODELS = PROJECT_ROOT / "data" / "3_models"
 
 # 주요 파일 경로 (편의용)
 MASTER_PRICE_CSV = DATA_PROCESSED / "master_price_data.csv"
 DASHBOARD_READY_CSV = DATA_DASHBOARD / "dashboard_ready_data.csv"
+MODEL_FORECASTS_CSV = DATA_DASHBOARD / "model_forecasts.csv"           # 배치 추론 결과 (대시보드 표시용)
+SERIES_FORECASTS_CSV = DATA_DASHBOARD / "series_forecasts.csv"         # 국가 × 부위 시계열별 배치 예측
+HOME_SUMMARY_CSV = DATA_DASHBOARD / "home_part_summary.csv"            # Home 부위별 시세 변동 요약 (전처리 시 미리 계산)
+MARKET_HIGHLIGHTS_CSV = DATA_DASHBOARD / "market_highlights.csv"      # Price Dashboard 품목별 12개월 등락 (원산지 범위별)
+PRICE_CUBE_PARQUET = DATA_DASHBOARD / "price_cube.parquet"           # 날짜 × 국가 × 부위 × 브랜드 그룹 평균가 큐브 (상세 화면 조회용)
+LANDED_COST_PAIRS_PARQUET = DATA_DASHBOARD / "landed_cost_pairs.parquet"  # 매핑 쌍별 미국 상륙 원가 vs 한국 도매가 일별 시계열
+SUPPLY_IMPORT_PARQUET = DATA_DASHBOARD / "supply_import_long.parquet"      # 월 × 국가 × 부위 수입량 (long, 수입량 분석 화면)
+SUPPLY_MONTHLY_PARQUET = DATA_DASHBOARD / "supply_import_monthly.parquet"  # 월 × 국가('합계' 포함) 총 수입량·YoY·YTD
+SUPPLY_PART_PARQUET = DATA_DASHBOARD / "supply_import_by_part.parquet"    # 월 × 부위('합계' 포함) 국가 통합 수입량
+SUPPLY_STOCK_PARQUET = DATA_DASHBOARD / "supply_stock.parquet"            # 월 × 부위 재고량 + 3/6/12개월 전 대비 변동률
+DASHBOARD_ENRICHED_PARQUET = DATA_PROCESSED / "dashboard_enriched.parquet"      # 필터 전 전체 시계열 (증분 재계산 기준)
+DASHBOARD_ENRICHED_STATE_JSON = DATA_PROCESSED / "dashboard_enriched_state.json"
 MASTER_IMPORT_VOLUME_CSV = DATA_RAW / "master_import_volume.csv"
 BEEF_STOCK_XLSX = DATA_RAW / "beef_stock_data.xlsx"
 EXCHANGE_RATE_XLSX = DATA_RAW / "exchange_rate_data.xlsx"
@@ -27,9 +40,34 @@ USDA_BEEF_HISTORY_CSV = DATA_RAW / "usda_beef_history.csv"
 USDA_PRIMAL_HISTORY_CSV = DATA_RAW / "usda_primal_history.csv"
 PROCESSED_USDA_COST_CSV = DATA_PROCESSED / "processed_usda_cost.csv"
 USDA_PLATE_USD_KG_CSV = DATA_PROCESSED / "usda_plate_usd_kg.csv"
+USDA_MAPPING_INDEX_CSV = DATA_PROCESSED / "usda_mapping_index.csv"   # item_description → 한글 부위명 조회 테이블
+FEATURE_STORE_DIR = DATA_PROCESSED / "feature_store"                 # 월별 ML 기본 패널 캐시 (원천 해시별 Parquet)
+LAG_SCAN_DIR = DATA_PROCESSED / "lag_scan"                           # USDA 품목 × 미트박스 부위 시차 상관 캐시
+DASHBOARD_CACHE_DIR = DATA_PROCESSED / "dashboard_cache"             # 대시보드 원천 파일의 Parquet 사본 (파일 수정 시각·크기별)
+
+# 모델 평가·산출물
+BACKTEST_DIR = DATA_MODELS / "backtests"                              # 워크포워드 폴드별 지표·예측값
+PARAM_SEARCH_DB = DATA_MODELS / "param_search.sqlite"                  # 하이퍼파라미터 탐색 시도 기록
+MODEL_REGISTRY_DIR = DATA_MODELS / "registry"                         # 학습된 부스터 + 메타데이터(피처 목록·데이터 해시·지표)
 MANUAL_KOR_PRICE_CSV = DATA_RAW / "manual_kor_price.csv"
 SHORT_PLATE_WHOLESALE_XLSX = DATA_RAW / "beef_Short Plate_wholesale_price.xlsx"
 
+# 미트박스 과거 시세 백필 (siseSeq × 일자 컬럼형 이력 테이블)
+MEATBOX_ID_LIST_XLSX = DATA_RAW / "meatbox_id_list.xlsx"
+MEATBOX_HISTORY_BATCH_DIR = DATA_RAW / "history_batch"
+MEATBOX_HISTORY_PARQUET = DATA_RAW / "meatbox_price_history.parquet"
+MEATBOX_HISTORY_STATE_JSON = DATA_RAW / "meatbox_history_state.json"
+
+# 축평원 한우 부분육 경락가격 (경매일 × 도축장 × 성별 × 부위 컬럼형 누적)
+HAN_AUCTION_PARQUET = DATA_RAW / "han_auction_prices.parquet"
+HAN_AUCTION_STATE_JSON = DATA_RAW / "han_auction_state.json"
+
+# 공유 데이터 파일 쓰기 잠금 (utils/file_store.py, 대상 파일별 잠금 파일)
+LOCK_DIR = PROJECT_ROOT / "data" / ".locks"
+
+# 대시보드 성능 계측 로그 (utils/perf_monitor.py, 실행마다 JSON 한 줄)
+DASHBOARD_PERF_LOG = PROJECT_ROOT / "logs" / "dashboard_perf.log"
+
 # Chromedriver (collectors에서 사용)
 CHROMEDRIVER_PATH = SRC_DIR / "chromedriver.exe"
 
@@ -8,143 +8,121 @@ from datetime import datetime, timedelta
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import DASHBOARD_READY_CSV
+from utils import dashboard_data, perf_monitor
+from utils.downsample import downsample_frame
+from utils.market_highlights import build_market_highlights
+from utils.price_cube import ALL_COUNTRY, BRAND_GROUPS, VALUE_COLS, build_price_cube
 
 # [파일 정의서]
 # - 파일명: 01_Price_Dashboard.py
 # - 역할: 시세 데이터 시각화 (미시적 뷰)
-# - 데이터 소스: data/2_dashboard/dashboard_ready_data.csv
+# - 데이터 소스: data/2_dashboard/price_cube.parquet (국가 × 부위 × 브랜드 그룹 일별 평균), data/2_dashboard/market_highlights.csv (등락 요약)
+#   (둘 다 전처리 시 계산, 파일이 없으면 dashboard_ready_data.csv로 한 번 계산)
+#   (utils/dashboard_data.py 공유 캐시 — 파일 수정 시각·크기가 바뀌면 자동 재로드)
 # - 업데이트: CASE A를 Market Highlights(브랜드별 등락) 화면으로 개편
+# - 성능 계측: utils/perf_monitor.py (URL에 ?debug=1 → 사이드바 계측 패널, 구간별 시간·캐시 적중)
 
 # --------------------------------------------------------------------------------
 # 1. 페이지 기본 설정 및 데이터 로드
 # --------------------------------------------------------------------------------
 st.set_page_config(page_title="소고기 시세 대시보드", page_icon="", layout="wide")
+perf_monitor.start_page("01_Price_Dashboard")
 
-@st.cache_data
-def load_data():
-    if not DASHBOARD_READY_CSV.exists():
+DASHBOARD_COLS = ['date', 'category', 'part', 'brand', 'wholesale_price', 'ma7', 'ma30']
+
+@perf_monitor.cached
+def _compute_price_cube(cache_key):
+    """파이프라인 실행 전(price_cube.parquet 없음)이면 dashboard_ready로 한 번 계산"""
+    df = dashboard_data.load_dashboard_ready(columns=DASHBOARD_COLS)
+    if df is None:
         return None
-    df = pd.read_csv(str(DASHBOARD_READY_CSV))
-    df['date'] = pd.to_datetime(df['date'])
-    
-    # [추가된 핵심 로직] 가공된 파일의 컬럼명을 대시보드에 맞게 호환시켜줍니다.
-    df = df.rename(columns={
-        'category': 'country',
-        'part': 'part_clean',
-        'brand': 'brand_clean'
-    })
-    
-    return df
+    return build_price_cube(df.rename(columns={'category': 'country'})).set_index(['country', 'part']).sort_index()
 
-df = load_data()
+@perf_monitor.timed("가격 큐브 로드", "load")
+def load_data():
+    # 공유 캐시(utils/dashboard_data.py): 파일이 갱신되면 다음 조회부터 새 데이터
+    # 국가 × 부위 × 브랜드 그룹 일별 평균 큐브, (country, part) 인덱스
+    cube = dashboard_data.load_price_cube()
+    if cube is None:
+        cube = _compute_price_cube(dashboard_data.file_key(DASHBOARD_READY_CSV))
+    return cube
+
+cube = load_data()
 
-# 메이저 3사 브랜드 식별 패턴 (대소문자 무시)
-MAJOR_BRAND_PATTERN = r"IBP|Excel|Swift|엑셀|스위프트"
+# Market Highlights 표에 한 번에 보이는 행 수 (나머지는 표 안에서 스크롤)
+HIGHLIGHT_VISIBLE_ROWS = 10
 
 # --------------------------------------------------------------------------------
-# 1-b. Market Highlights 계산 함수 및 렌더 헬퍼
+# 1-b. Market Highlights 로드 함수 및 표 렌더 헬퍼
 # --------------------------------------------------------------------------------
-def calculate_market_highlights(df_input):
-    """각 품목별 12개월 최고/최저 대비 등락률 산출, 전체 목록 반환"""
-    if df_input is None or df_input.empty:
-        return None, None
-
-    global_latest_date = df_input['date'].max()
-    active_cutoff = global_latest_date - timedelta(days=7)
-    one_year_ago = global_latest_date - timedelta(days=365)
-    df_1y = df_input[df_input['date'] >= one_year_ago]
-
-    product_groups = df_1y.groupby(['country', 'brand_clean', 'part_clean'])
-    highlights = []
-
-    for (country, brand, part), group_df in product_groups:
-        if len(group_df) < 2:
-            continue
-        traded = group_df.dropna(subset=['wholesale_price'])
-        if traded.empty:
-            continue
-        last_trade_date = traded['date'].max()
-        if last_trade_date < active_cutoff:
-            continue
-
-        current_price = traded[traded['date'] == last_trade_date]['wholesale_price'].mean()
-        max_price_12m = traded['wholesale_price'].max()
-        min_price_12m = traded['wholesale_price'].min()
-
-        drop_rate = (current_price - max_price_12m) / max_price_12m if max_price_12m > 0 else 0
-        rise_rate = (current_price - min_price_12m) / min_price_12m if min_price_12m > 0 else 0
-
-        highlights.append({
-            'country': country, 'brand': brand, 'part': part,
-            'current_price': current_price,
-            'max_12m': max_price_12m, 'min_12m': min_price_12m,
-            'drop_rate': drop_rate, 'rise_rate': rise_rate
-        })
-
-    if not highlights:
+@perf_monitor.cached
+def _compute_market_highlights(cache_key):
+    """파이프라인 실행 전(market_highlights.csv 없음)이면 dashboard_ready로 한 번 계산"""
+    df = dashboard_data.load_dashboard_ready(columns=DASHBOARD_COLS)
+    return build_market_highlights(df.rename(columns={'category': 'country'}))
+
+
+@perf_monitor.timed("Market Highlights 로드", "load")
+def load_market_highlights():
+    """전처리 단계(utils/market_highlights.py)가 원산지 범위별로 미리 계산한 등락 테이블"""
+    highlights_df = dashboard_data.load_market_highlights()
+    if highlights_df is None:
+        highlights_df = _compute_market_highlights(dashboard_data.file_key(DASHBOARD_READY_CSV))
+    return highlights_df
+
+
+@perf_monitor.timed("calculate_market_highlights", "filter")
+def calculate_market_highlights(scope):
+    """선택한 원산지 범위의 12개월 최고/최저 대비 등락 목록 (하락, 상승)"""
+    highlights_df = load_market_highlights()
+    highlights_df = highlights_df[highlights_df['scope'] == scope]
+    if highlights_df.empty:
         return None, None
 
-    highlights_df = pd.DataFrame(highlights)
     all_drops = highlights_df[highlights_df['drop_rate'] < 0].sort_values('drop_rate', ascending=True)
     all_rises = highlights_df[highlights_df['rise_rate'] > 0].sort_values('rise_rate', ascending=False)
     return all_drops, all_rises
 
 
-def _render_drop_row(row, key_prefix):
-    c1, c2, c3 = st.columns([4, 1.5, 1.5])
-    with c1:
-        st.markdown(
-            f"**{row['part']}**<br>"
-            f"<span style='font-size:0.8em; color:grey'>{row['brand']} ({row['country']})</span>",
-            unsafe_allow_html=True)
-    with c2:
-        st.markdown(f"<div style='padding-top:5px'>{int(row['current_price']):,}원</div>", unsafe_allow_html=True)
-    with c3:
-        st.markdown(f"<div style='color:blue; padding-top:5px'><b>{row['drop_rate']*100:.1f}%</b></div>", unsafe_allow_html=True)
-    st.markdown("<hr style='margin:0.2em 0;border:none;border-bottom:1px solid #f0f0f0;'>", unsafe_allow_html=True)
-
-
-def _render_rise_row(row, key_prefix):
-    c1, c2, c3 = st.columns([4, 1.5, 1.5])
-    with c1:
-        st.markdown(
-            f"**{row['part']}**<br>"
-            f"<span style='font-size:0.8em; color:grey'>{row['brand']} ({row['country']})</span>",
-            unsafe_allow_html=True)
-    with c2:
-        st.markdown(f"<div style='padding-top:5px'>{int(row['current_price']):,}원</div>", unsafe_allow_html=True)
-    with c3:
-        st.markdown(f"<div style='color:red; padding-top:5px'><b>+{row['rise_rate']*100:.1f}%</b></div>", unsafe_allow_html=True)
-    st.markdown("<hr style='margin:0.2em 0;border:none;border-bottom:1px solid #f0f0f0;'>", unsafe_allow_html=True)
+@perf_monitor.timed("Market Highlights 표", "render")
+def _render_highlight_table(rows, rate_col, rate_label, rate_format, color):
+    """등락 목록을 st.dataframe 하나로 표시 (스크롤·정렬은 브라우저에서 처리)"""
+    table = pd.DataFrame({
+        '품목': rows['part'],
+        '브랜드': rows['brand'].astype(str) + ' (' + rows['country'].astype(str) + ')',
+        '현재가': rows['current_price'].round(0),
+        rate_label: rows[rate_col] * 100,
+    })
+    st.dataframe(
+        table.style.map(lambda _: f'color: {color}; font-weight: bold', subset=[rate_label]),
+        column_config={
+            '품목': st.column_config.TextColumn(width='medium'),
+            '브랜드': st.column_config.TextColumn(width='medium'),
+            '현재가': st.column_config.NumberColumn('현재가 (원)', format='localized'),
+            rate_label: st.column_config.NumberColumn(rate_label, format=rate_format),
+        },
+        use_container_width=True,
+        height=(min(len(table), HIGHLIGHT_VISIBLE_ROWS) + 1) * 35 + 3,
+        hide_index=True
+    )
 
 # --------------------------------------------------------------------------------
 # 2. 사이드바 (검색 필터)
 # --------------------------------------------------------------------------------
 st.sidebar.header("검색 필터")
 
-if df is None:
+if cube is None:
     st.error("데이터 파일(dashboard_ready_data.csv)을 찾을 수 없습니다.")
+    perf_monitor.finish_page()
     st.stop()
 
-# (1) 국가 선택
-# [src/pages/01_Price_Dashboard.py 수정]
-
-# (1) 에러가 발생하는 기존 코드
-# country_list = sorted(df['country'].unique().tolist())
-
-# (2) 다음과 같이 수정 (dropna() 추가)
-country_list = sorted(df['country'].dropna().unique().tolist())
-selected_country = st.sidebar.selectbox("원산지 선택", ['전체'] + country_list)
-
-# 데이터 1차 필터링 (국가)
-if selected_country != '전체':
-    df_country = df[df['country'] == selected_country].copy()
-else:
-    df_country = df.copy()
+# (1) 국가 선택 ('전체'는 큐브에 전 국가 합산 행으로 들어 있음)
+country_list = sorted(c for c in cube.index.get_level_values('country').unique() if c != ALL_COUNTRY)
+selected_country = st.sidebar.selectbox("원산지 선택", [ALL_COUNTRY] + country_list)
 
 # (2) 부위 선택 (핵심: '전체 보기' 옵션 추가)
-# 부위 목록 추출
-part_options = sorted(df_country['part_clean'].unique())
+# 부위 목록 추출 (정렬된 인덱스에서 국가 구간만 조회)
+part_options = sorted(cube.loc[selected_country].index.unique())
 # 메인 화면 진입 시 '전체 보기(요약)'이 기본값
 selected_part = st.sidebar.selectbox("부위 선택", ["전체 보기 (가격 동향 요약)"] + part_options)
 
@@ -157,16 +135,9 @@ selected_part = st.sidebar.selectbox("부위 선택", ["전체 보기 (가격 
 # ================================================================================
 if selected_part == "전체 보기 (가격 동향 요약)":
     st.title("Market Highlights")
-    st.caption("최근 1년간 가격 변동폭이 큰 품목 (브랜드별 상세)")
-
-    st.markdown("""
-        <style>
-        .stMarkdown p { margin-bottom: 0.2rem; }
-        [data-testid="column"] { padding: 0; }
-        </style>
-    """, unsafe_allow_html=True)
+    st.caption("최근 1년간 가격 변동폭이 큰 품목 (브랜드별 상세) | 표 안에서 스크롤하면 전체 목록, 열 제목을 누르면 정렬")
 
-    all_drops, all_rises = calculate_market_highlights(df_country)
+    all_drops, all_rises = calculate_market_highlights(selected_country)
 
     if all_drops is not None and all_rises is not None:
         col_drop, spacer, col_rise = st.columns([1, 0.05, 1])
@@ -177,19 +148,7 @@ if selected_part == "전체 보기 (가격 동향 요약)":
         with col_drop:
             st.markdown(f"#### Price Drop ({len(all_drops)}건)")
 
-            h1, h2, h3 = st.columns([4, 1.5, 1.5])
-            h1.markdown(":grey[**품목 (브랜드)**]")
-            h2.markdown(":grey[**현재가**]")
-            h3.markdown(":grey[**하락률**]")
-            st.markdown("<hr style='margin:0;border:none;border-bottom:2px solid #ddd;'>", unsafe_allow_html=True)
-
-            for i, (idx, row) in enumerate(all_drops.iloc[:10].iterrows()):
-                _render_drop_row(row, f"d_{idx}")
-
-            if len(all_drops) > 10:
-                with st.expander("목록 전체 펼치기"):
-                    for i, (idx, row) in enumerate(all_drops.iloc[10:].iterrows()):
-                        _render_drop_row(row, f"d_exp_{idx}")
+            _render_highlight_table(all_drops, 'drop_rate', '하락률', '%.1f%%', 'blue')
 
         # ------------------------------------------------------------------
         # [Right Column] Price Rise
@@ -197,19 +156,7 @@ if selected_part == "전체 보기 (가격 동향 요약)":
         with col_rise:
             st.markdown(f"#### Price Rise ({len(all_rises)}건)")
 
-            h1, h2, h3 = st.columns([4, 1.5, 1.5])
-            h1.markdown(":grey[**품목 (브랜드)**]")
-            h2.markdown(":grey[**현재가**]")
-            h3.markdown(":grey[**상승률**]")
-            st.markdown("<hr style='margin:0;border:none;border-bottom:2px solid #ddd;'>", unsafe_allow_html=True)
-
-            for i, (idx, row) in enumerate(all_rises.iloc[:10].iterrows()):
-                _render_rise_row(row, f"r_{idx}")
-
-            if len(all_rises) > 10:
-                with st.expander("목록 전체 펼치기"):
-                    for i, (idx, row) in enumerate(all_rises.iloc[10:].iterrows()):
-                        _render_rise_row(row, f"r_exp_{idx}")
+            _render_highlight_table(all_rises, 'rise_rate', '상승률', '+%.1f%%', 'red')
     else:
         st.info("데이터가 충분하지 않아 순위를 계산할 수 없습니다.")
 
@@ -220,27 +167,12 @@ else:
     # ----------------------------------------------------------------------------
     # B-1. 추가 필터 (브랜드, 기간) - 상세 화면에서만 노출
     # ----------------------------------------------------------------------------
-    # 해당 부위의 데이터만 필터링
-    df_part = df_country[df_country['part_clean'] == selected_part]
-    
-    # 브랜드 필터: 메인 기준은 메이저 3사 평균, 비교용으로 기타 팩커/전체 제공
-    brand_series = df_part['brand_clean'].fillna("").astype(str)
-    major_mask_all = brand_series.str.contains(MAJOR_BRAND_PATTERN, case=False, regex=True, na=False)
-    other_mask_all = (
-        (~major_mask_all)
-        & (brand_series.str.strip() != "")
-        & (brand_series.str.strip() != "-")
-    )
+    # 해당 국가·부위의 큐브 구간 (인덱스 조회 한 번, 브랜드 그룹별 일별 평균이 미리 계산되어 있음)
+    df_part = cube.loc[(selected_country, selected_part)]
+    available_groups = set(df_part['brand_group'].unique())
 
-    has_major = major_mask_all.any()
-    has_other = other_mask_all.any()
-
-    brand_ui_options = []
-    if has_major:
-        brand_ui_options.append("메이저 3사")
-    if has_other:
-        brand_ui_options.append("기타 팩커")
-    brand_ui_options.append("전체")
+    # 브랜드 필터: 메인 기준은 메이저 3사 평균, 비교용으로 기타 팩커/전체 제공
+    brand_ui_options = [g for g in BRAND_GROUPS if g == "전체" or g in available_groups]
     
     st.sidebar.markdown("---")
     st.sidebar.subheader("브랜드 필터")
@@ -250,37 +182,30 @@ else:
     st.sidebar.subheader("조회 기간")
     period_options = ["3개월", "12개월", "36개월", "전체"]
     selected_period = st.sidebar.radio("기간 선택", period_options, index=0, horizontal=True, label_visibility="collapsed")
+    full_resolution = st.sidebar.checkbox(
+        "원본 해상도로 보기", value=False,
+        help="기본은 긴 기간을 차트 폭에 맞게 줄여 표시합니다 (고점·저점 유지). 확대해서 일별 점을 모두 보려면 선택하세요."
+    )
     
     # ----------------------------------------------------------------------------
     # B-2. 데이터 가공 (상세)
     # ----------------------------------------------------------------------------
-    # 기간 필터링
-    max_date = df_part['date'].max()
-    min_date = df_part['date'].min()
+    # 기간 필터링 (해당 부위 전체 브랜드 기준 기간)
+    df_all_brands = df_part[df_part['brand_group'] == "전체"]
+    max_date = df_all_brands['date'].max()
+    min_date = df_all_brands['date'].min()
     
     if selected_period == "3개월": start_date = max_date - timedelta(days=90)
     elif selected_period == "12개월": start_date = max_date - timedelta(days=365)
     elif selected_period == "36개월": start_date = max_date - timedelta(days=365*3)
     else: start_date = min_date
     
-    mask = (df_part['date'] >= start_date) & (df_part['date'] <= max_date)
-    
-    # 브랜드 필터링
-    if selected_brand_ui == '메이저 3사':
-        display_brand = "메이저 3사 평균"
-        target_df = df_part[mask & major_mask_all]
-    elif selected_brand_ui == '기타 팩커':
-        display_brand = "기타 팩커 평균"
-        target_df = df_part[mask & other_mask_all]
-    else:
-        display_brand = "시장 전체 평균"
-        target_df = df_part[mask]
-        
-    # 차트용 데이터 (일별 평균)
-    if not target_df.empty:
-        chart_df = target_df.groupby('date')[['wholesale_price', 'ma7', 'ma30']].mean().reset_index()
-    else:
-        chart_df = pd.DataFrame()
+    display_brand = {"메이저 3사": "메이저 3사 평균", "기타 팩커": "기타 팩커 평균", "전체": "시장 전체 평균"}[selected_brand_ui]
+
+    # 차트용 데이터 (일별 평균, 큐브에서 그룹·기간만 선택)
+    with perf_monitor.timed("상세 브랜드·기간 필터", "filter"):
+        mask = (df_part['brand_group'] == selected_brand_ui) & (df_part['date'] >= start_date) & (df_part['date'] <= max_date)
+        chart_df = df_part.loc[mask, ['date'] + VALUE_COLS].reset_index(drop=True)
         
     # ----------------------------------------------------------------------------
     # B-3. 화면 구성 (KPI + 차트)
@@ -325,22 +250,30 @@ else:
         
         # (2) 차트 (Plotly)
         st.subheader("가격 추이 분석")
+        # 긴 기간은 차트 폭 수준으로 다운샘플링 (utils/downsample.py, LTTB)
+        with perf_monitor.timed("차트 다운샘플링", "aggregate"):
+            plot_df = chart_df if full_resolution else downsample_frame(chart_df, 'date', ['wholesale_price', 'ma7', 'ma30'])
         fig = go.Figure()
         
         # 메인 가격선
-        fig.add_trace(go.Scatter(x=chart_df['date'], y=chart_df['wholesale_price'], 
+        fig.add_trace(go.Scatter(x=plot_df['date'], y=plot_df['wholesale_price'], 
                                  mode='lines+markers', name='도매가', 
                                  line=dict(color='#FF4B4B', width=2)))
         # 이평선
-        fig.add_trace(go.Scatter(x=chart_df['date'], y=chart_df['ma7'], 
+        fig.add_trace(go.Scatter(x=plot_df['date'], y=plot_df['ma7'], 
                                  mode='lines', name='7일 이동평균', 
                                  line=dict(color='#FFA15A', width=1, dash='dot')))
-        fig.add_trace(go.Scatter(x=chart_df['date'], y=chart_df['ma30'], 
+        fig.add_trace(go.Scatter(x=plot_df['date'], y=plot_df['ma30'], 
                                  mode='lines', name='30일 이동평균', 
                                  line=dict(color='#1F77B4', width=1.5)))
         
         fig.update_layout(height=500, hovermode="x unified", margin=dict(l=20, r=20, t=30, b=20))
-        st.plotly_chart(fig, use_container_width=True)
+        with perf_monitor.timed("가격 추이 차트", "render"):
+            st.plotly_chart(fig, use_container_width=True)
+        if len(plot_df) < len(chart_df):
+            st.caption(f"표시 {len(plot_df):,}개 / 전체 {len(chart_df):,}개 일자 (고점·저점 유지 다운샘플링, 사이드바에서 원본 해상도 선택 가능)")
         
     else:
-        st.warning("선택하신 조건에 해당하는 데이터가 없습니다.")
\ No newline at end of file
+        st.warning("선택하신 조건에 해당하는 데이터가 없습니다.")
+
+perf_monitor.finish_page()
@@ -9,54 +9,47 @@ from datetime import datetime, timedelta
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import MASTER_IMPORT_VOLUME_CSV
+from utils import dashboard_data, perf_monitor, supply_analytics
 
 # [파일 정의서]
 # - 파일명: 02_Import_Analysis.py
 # - 역할: 수입량 데이터 시각화
-# - 데이터 소스: data/0_raw/master_import_volume.csv
+# - 데이터 소스: data/2_dashboard/supply_import_long.parquet, supply_import_monthly.parquet (utils/supply_analytics.py, 원천: data/0_raw/master_import_volume.csv)
 # - 주요 기능: 국가별/부위별 교차 분석, YoY(전년 대비) 비교, 기간 필터링
+# - 성능 계측: utils/perf_monitor.py (URL에 ?debug=1 → 사이드바 계측 패널)
 
 # --------------------------------------------------------------------------------
 # 1. 페이지 설정 및 데이터 로드
 # --------------------------------------------------------------------------------
 st.set_page_config(page_title="수입량 분석", page_icon="", layout="wide")
-
-def _volume_file_mtime():
-    """master_import_volume.csv 수정 시각. 크롤러 갱신 시 캐시 자동 무효화."""
-    return MASTER_IMPORT_VOLUME_CSV.stat().st_mtime if MASTER_IMPORT_VOLUME_CSV.exists() else 0
-
-@st.cache_data
-def load_data(_cache_key):
-    if not MASTER_IMPORT_VOLUME_CSV.exists():
-        return None
-    df = pd.read_csv(str(MASTER_IMPORT_VOLUME_CSV))
-    
-    # 컬럼명 정리 ('부위별_' 접두어 제거 등 시각화용 전처리)
-    # 현재 컬럼: std_date, 구분, 부위별_갈비_합계, ...
-    
-    # 멜트(Melt)를 통해 분석하기 좋은 형태로 변환 (Long Format)
-    # 변환 후: [std_date, country, part, volume]
-    id_vars = ['std_date', '구분']
-    value_vars = [c for c in df.columns if '부위별_' in c and '계_합계' not in c] # '계'는 제외하고 부위만
-    
-    df_long = df.melt(id_vars=id_vars, value_vars=value_vars, var_name='part_raw', value_name='volume')
-    
-    # 전처리
-    df_long['date'] = pd.to_datetime(df_long['std_date'])
-    df_long['country'] = df_long['구분']
-    df_long['part'] = df_long['part_raw'].str.replace('부위별_', '').str.replace('_합계', '')
-    df_long['year'] = df_long['date'].dt.year
-    df_long['month'] = df_long['date'].dt.month
-    
-    # 필요한 컬럼만 남기기
-    final_df = df_long[['date', 'year', 'month', 'country', 'part', 'volume']].sort_values('date')
-    
-    return final_df
-
-df = load_data(_volume_file_mtime())
+perf_monitor.start_page("02_Import_Analysis")
+
+@perf_monitor.cached
+def _compute_supply(cache_key):
+    """파이프라인 실행 전(수급 테이블 없음)이면 원천 wide 파일로 한 번 계산. cache_key: 원천 파일 (수정 시각, 크기)"""
+    df_raw = dashboard_data.load_import_volume()
+    if df_raw is None:
+        return None, None
+    df_long = supply_analytics.build_import_long(df_raw)
+    return df_long, supply_analytics.build_import_monthly(df_long)
+
+@perf_monitor.timed("수급 테이블 로드", "load")
+def load_data():
+    """
+    [date, year, month, country, part, volume] long 테이블과 월 × 국가('합계' 포함) 총량·YoY·YTD 테이블.
+    utils/supply_analytics.py 가 미리 만든 Parquet을 그대로 조회 (utils/dashboard_data.py 공유 캐시)
+    """
+    df_long = dashboard_data.load_supply_imports()
+    df_monthly = dashboard_data.load_supply_monthly()
+    if df_long is None or df_monthly is None:
+        df_long, df_monthly = _compute_supply(dashboard_data.file_key(MASTER_IMPORT_VOLUME_CSV))
+    return df_long, df_monthly
+
+df, df_monthly = load_data()
 
 if df is None:
     st.error("데이터 파일(master_import_volume.csv)을 찾을 수 없습니다.")
+    perf_monitor.finish_page()
     st.stop()
 
 # --------------------------------------------------------------------------------
@@ -83,7 +76,8 @@ else:
     start_date = df['date'].min()
 
 # 데이터 필터링 (기간 기준)
-filtered_df = df[df['date'] >= start_date].copy()
+with perf_monitor.timed("기간 필터", "filter"):
+    filtered_df = df[df['date'] >= start_date].copy()
 
 # --------------------------------------------------------------------------------
 # 3. KPI 요약 (전년 동기 대비)
@@ -91,36 +85,24 @@ filtered_df = df[df['date'] >= start_date].copy()
 st.title("수입 소고기 물량 분석")
 st.markdown(f"**조회 기간:** {start_date.strftime('%Y-%m')} ~ {max_date.strftime('%Y-%m')}")
 
-# KPI 계산을 위한 데이터 준비
-current_month_date = max_date
-last_year_date = max_date - pd.DateOffset(years=1)
+with perf_monitor.timed("KPI 계산", "aggregate"):
+    # KPI: 최신 월 '합계' 행 (전년 동월·YTD 증감률은 전처리에서 계산됨)
+    kpi = df_monthly[(df_monthly['date'] == max_date) & (df_monthly['country'] == supply_analytics.TOTAL_LABEL)].iloc[0]
 
-# (1) 당월 총 수입량
-curr_vol = df[df['date'] == current_month_date]['volume'].sum()
-last_year_vol = df[df['date'] == last_year_date]['volume'].sum()
+    # (1) 당월 총 수입량
+    curr_vol, yoy_pct = kpi['volume'], kpi['yoy_pct']
 
-if last_year_vol > 0:
-    yoy_pct = ((curr_vol - last_year_vol) / last_year_vol) * 100
-else:
-    yoy_pct = 0
+    # (2) 연간 누적(YTD) 수입량
+    curr_ytd_vol, ytd_pct = kpi['ytd'], kpi['ytd_pct']
 
-# (2) 연간 누적(YTD) 수입량
-current_year = max_date.year
-curr_ytd_vol = df[df['year'] == current_year]['volume'].sum()
-last_ytd_vol = df[(df['year'] == current_year - 1) & (df['date'] <= last_year_date)]['volume'].sum()
+    # (3) 국가별 비중 (조회 기간 내)
+    period_vol = df_monthly[df_monthly['date'] >= start_date].groupby('country')['volume'].sum()
+    total_period_vol = period_vol.get(supply_analytics.TOTAL_LABEL, 0)
+    us_vol = period_vol.get('미국', 0)
+    au_vol = period_vol.get('호주', 0)
 
-if last_ytd_vol > 0:
-    ytd_pct = ((curr_ytd_vol - last_ytd_vol) / last_ytd_vol) * 100
-else:
-    ytd_pct = 0
-
-# (3) 국가별 비중 (조회 기간 내)
-total_period_vol = filtered_df['volume'].sum()
-us_vol = filtered_df[filtered_df['country'] == '미국']['volume'].sum()
-au_vol = filtered_df[filtered_df['country'] == '호주']['volume'].sum()
-
-us_share = (us_vol / total_period_vol * 100) if total_period_vol > 0 else 0
-au_share = (au_vol / total_period_vol * 100) if total_period_vol > 0 else 0
+    us_share = (us_vol / total_period_vol * 100) if total_period_vol > 0 else 0
+    au_share = (au_vol / total_period_vol * 100) if total_period_vol > 0 else 0
 
 # KPI 카드 출력
 col1, col2, col3, col4 = st.columns(4)
@@ -141,7 +123,7 @@ st.divider()
 tab1, tab2 = st.tabs(["국가별 분석 (Country View)", "부위별 분석 (Part View)"])
 
 # [Tab 1] 국가별 분석: 특정 국가를 선택하면 그 나라의 부위별 구성을 보여줌
-with tab1:
+with tab1, perf_monitor.timed("국가별 분석 탭", "render"):
     st.subheader("국가별 수입 트렌드 및 부위 구성")
     
     # 국가 선택
@@ -152,7 +134,7 @@ with tab1:
     country_df = filtered_df[filtered_df['country'] == selected_country]
     
     # 차트 1: 월별 총 수입량 추이 (Line)
-    daily_vol = country_df.groupby('date')['volume'].sum().reset_index()
+    daily_vol = df_monthly[(df_monthly['country'] == selected_country) & (df_monthly['date'] >= start_date)]
     fig_line = px.line(daily_vol, x='date', y='volume', markers=True, 
                        title=f"{selected_country} 월별 총 수입량 추이")
     fig_line.update_layout(height=400)
@@ -167,7 +149,7 @@ with tab1:
     st.plotly_chart(fig_bar, use_container_width=True)
 
 # [Tab 2] 부위별 분석: 특정 부위를 선택하면 미국 vs 호주 경쟁 현황을 보여줌
-with tab2:
+with tab2, perf_monitor.timed("부위별 분석 탭", "render"):
     st.subheader("주요 부위별 국가 간 경쟁 현황")
     
     # 부위 선택
@@ -195,6 +177,8 @@ with tab2:
 # --------------------------------------------------------------------------------
 # 5. 데이터 테이블 (다운로드용)
 # --------------------------------------------------------------------------------
-with st.expander("원본 데이터 확인하기"):
+with st.expander("원본 데이터 확인하기"), perf_monitor.timed("원본 데이터 표", "render"):
     st.dataframe(filtered_df.sort_values(by=['date', 'country', 'part'], ascending=[False, True, True]), 
-                 use_container_width=True)
\ No newline at end of file
+                 use_container_width=True)
+
+perf_monitor.finish_page()
@@ -9,81 +9,49 @@ from datetime import datetime
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import BEEF_STOCK_XLSX, MASTER_IMPORT_VOLUME_CSV
+from utils import dashboard_data, perf_monitor, supply_analytics
 
 # [파일 정의서]
 # - 파일명: 03_Inventory_Management.py
 # - 역할: 재고 현황 요약 및 부위별 상세 시계열 분석
 # - 업데이트: 수입량 '합계' 데이터 생성 로직 추가 (라인 차트 미표출 오류 해결)
+# - 데이터 소스: data/2_dashboard/supply_stock.parquet, supply_import_by_part.parquet (utils/supply_analytics.py,
+#   원천: data/0_raw/beef_stock_data.xlsx, master_import_volume.csv)
+# - 성능 계측: utils/perf_monitor.py (URL에 ?debug=1 → 사이드바 계측 패널)
 
 # --------------------------------------------------------------------------------
 # 1. 페이지 및 데이터 로드 설정
 # --------------------------------------------------------------------------------
 st.set_page_config(page_title="재고 관리 및 수급 분석", page_icon="", layout="wide")
-
-def _data_files_mtime():
-    """재고/수입 데이터 파일의 최종 수정 시각. 캐시 키로 사용해 파일 갱신 시 자동 재로드."""
-    t1 = BEEF_STOCK_XLSX.stat().st_mtime if BEEF_STOCK_XLSX.exists() else 0
-    t2 = MASTER_IMPORT_VOLUME_CSV.stat().st_mtime if MASTER_IMPORT_VOLUME_CSV.exists() else 0
-    return max(t1, t2)
-
-@st.cache_data
-def load_data(_cache_key):
+perf_monitor.start_page("03_Inventory_Management")
+
+@perf_monitor.cached
+def _compute_supply(cache_key):
+    """파이프라인 실행 전(수급 테이블 없음)이면 원천 파일로 한 번 계산. cache_key: 원천 파일들의 (수정 시각, 크기)"""
+    df_stock = dashboard_data.load_beef_stock()
+    df_raw = dashboard_data.load_import_volume()
+    df_inv = supply_analytics.build_stock(df_stock) if df_stock is not None else None
+    if df_raw is None:
+        return df_inv, pd.DataFrame(columns=supply_analytics.PART_COLS)
+    return df_inv, supply_analytics.build_import_by_part(supply_analytics.build_import_long(df_raw))
+
+@perf_monitor.timed("수급 테이블 로드", "load")
+def load_data():
     """
-    재고(Inventory) 및 수입(Import) 데이터를 로드하고 전처리합니다.
-    _cache_key: 파일 수정 시각으로, 크롤러 등으로 CSV가 갱신되면 캐시가 갱신됩니다.
+    재고(부위별 재고량 + 3/6/12개월 전 대비 변동률)와 부위별 수입량('합계' 포함) 테이블.
+    utils/supply_analytics.py 가 미리 만든 Parquet을 그대로 조회 (utils/dashboard_data.py 공유 캐시)
     """
-    if not BEEF_STOCK_XLSX.exists():
-        return None, None
-
-    try:
-        df_inv = pd.read_excel(str(BEEF_STOCK_XLSX))
-    except:
-        df_inv = pd.read_csv(str(BEEF_STOCK_XLSX))
-
-    col_map = {}
-    for col in df_inv.columns:
-        if '기준년월' in col: col_map[col] = 'date'
-        elif '부위별' in col: col_map[col] = 'part'
-        elif '조사재고량' in col: col_map[col] = 'inventory'
-    
-    df_inv = df_inv.rename(columns=col_map)
-    
-    if 'inventory' in df_inv.columns:
-        df_inv = df_inv[~df_inv['inventory'].astype(str).str.contains("없습니다|자료가", na=False)]
-        df_inv['inventory'] = df_inv['inventory'].astype(str).str.replace(',', '').astype(float)
-    
-    df_inv['date'] = pd.to_datetime(df_inv['date'])
-    
-    # --- 2. 수입량 데이터 로드 ---
-    df_imp = pd.DataFrame()
-    if MASTER_IMPORT_VOLUME_CSV.exists():
-        df_imp = pd.read_csv(str(MASTER_IMPORT_VOLUME_CSV))
-        df_imp['date'] = pd.to_datetime(df_imp['std_date'])
-        
-        # Melt 수행
-        id_vars = ['date', '구분']
-        val_vars = [c for c in df_imp.columns if '부위별_' in c and '계_합계' not in c]
-        
-        if val_vars:
-            df_melt = df_imp.melt(id_vars=id_vars, value_vars=val_vars, var_name='part_raw', value_name='import_vol')
-            df_melt['part'] = df_melt['part_raw'].str.replace('부위별_', '').str.replace('_합계', '')
-            
-            # (1) 부위별 합계 (국가 구분 없이 합침)
-            df_by_part = df_melt.groupby(['date', 'part'])['import_vol'].sum().reset_index()
-            
-            # (2) [수정] 전체 합계(Total) 계산 후 추가
-            df_total = df_melt.groupby('date')['import_vol'].sum().reset_index()
-            df_total['part'] = '합계'
-            
-            # (3) 데이터 병합
-            df_imp = pd.concat([df_by_part, df_total], ignore_index=True)
-
+    df_inv = dashboard_data.load_supply_stock()
+    df_imp = dashboard_data.load_supply_by_part()
+    if df_inv is None or df_imp is None:
+        df_inv, df_imp = _compute_supply((dashboard_data.file_key(BEEF_STOCK_XLSX), dashboard_data.file_key(MASTER_IMPORT_VOLUME_CSV)))
     return df_inv, df_imp
 
-df_inv, df_imp = load_data(_data_files_mtime())
+df_inv, df_imp = load_data()
 
 if df_inv is None:
     st.error("재고 데이터 파일이 없습니다.")
+    perf_monitor.finish_page()
     st.stop()
 
 # --------------------------------------------------------------------------------
@@ -125,8 +93,9 @@ elif period_option == "12개월":
 elif period_option == "36개월":
     start_date = latest_date - pd.DateOffset(months=35)
 
-df_inv_filtered = df_inv[df_inv['date'] >= start_date].copy()
-df_imp_filtered = df_imp[df_imp['date'] >= start_date].copy() if not df_imp.empty else pd.DataFrame()
+with perf_monitor.timed("기간 필터", "filter"):
+    df_inv_filtered = df_inv[df_inv['date'] >= start_date].copy()
+    df_imp_filtered = df_imp[df_imp['date'] >= start_date].copy() if not df_imp.empty else pd.DataFrame()
 
 # --------------------------------------------------------------------------------
 # 4. 메인 화면: 인사이트 테이블
@@ -135,45 +104,24 @@ st.title("재고(Inventory) 인사이트")
 st.markdown(f"**기준 시점:** {latest_date.strftime('%Y년 %m월')} (최신 업데이트)")
 st.caption("기준 시점은 재고 데이터(beef_stock_data.xlsx) 기준입니다. 최신 월이 안 나오면 `src/collectors/crawl_imp_stock_monthly.py`를 실행한 뒤 이 페이지를 새로고침하세요.")
 
-# 날짜 계산
-date_3m_ago = latest_date - pd.DateOffset(months=3)
-date_6m_ago = latest_date - pd.DateOffset(months=6)
-date_12m_ago = latest_date - pd.DateOffset(months=12)
-
-# 요약 테이블 생성 함수
-def calculate_changes_list(df, target_date, comp_dates, target_parts):
-    data_list = []
-    
-    for part in target_parts:
-        part_df = df[df['part'] == part]
-        curr_row = part_df[part_df['date'] == target_date]
-        if curr_row.empty: continue
-        curr_val = curr_row['inventory'].values[0]
-        
-        row_dict = {
-            "부위": part,
-            "현재고(톤)": curr_val
-        }
-        
-        for label, comp_date in comp_dates.items():
-            comp_row = part_df[part_df['date'] == comp_date]
-            if not comp_row.empty:
-                prev_val = comp_row['inventory'].values[0]
-                pct = ((curr_val - prev_val) / prev_val) * 100 if prev_val > 0 else 0
-                row_dict[label] = pct
-            else:
-                row_dict[label] = None
-        
-        data_list.append(row_dict)
-    return pd.DataFrame(data_list)
-
-comp_dates = {
-    "3개월 전 대비": date_3m_ago,
-    "6개월 전 대비": date_6m_ago,
-    "1년 전 대비": date_12m_ago
+# 최신 월 부위별 재고와 3/6/12개월 전 대비 변동률 (전처리에서 계산됨, 비교 월 데이터가 없으면 결측)
+change_labels = {
+    "pct_3m": "3개월 전 대비",
+    "pct_6m": "6개월 전 대비",
+    "pct_12m": "1년 전 대비"
 }
 
-df_insight = calculate_changes_list(df_inv, latest_date, comp_dates, target_parts_for_table)
+with perf_monitor.timed("재고 변동 요약표 조회", "filter"):
+    df_insight = (
+        df_inv[df_inv['date'] == latest_date]
+        .set_index('part')
+        .reindex(target_parts_for_table)
+        .dropna(subset=['inventory'])
+        .rename_axis('부위')
+        .reset_index()
+        [['부위', 'inventory'] + list(change_labels)]
+        .rename(columns={'inventory': '현재고(톤)', **change_labels})
+    )
 
 # --- [스타일링: 주식 시장 스타일] ---
 def format_trend_text(val):
@@ -199,15 +147,16 @@ st.subheader(f"{selected_option} 재고 변동 현황")
 
 table_height = (len(df_insight) + 1) * 35 + 3
 
-st.dataframe(
-    df_insight.style
-    .format({"현재고(톤)": "{:,.0f}"})
-    .format(format_trend_text, subset=["3개월 전 대비", "6개월 전 대비", "1년 전 대비"])
-    .map(color_variant, subset=["3개월 전 대비", "6개월 전 대비", "1년 전 대비"]),
-    use_container_width=True,
-    height=table_height,
-    hide_index=True
-)
+with perf_monitor.timed("재고 변동 요약표", "render"):
+    st.dataframe(
+        df_insight.style
+        .format({"현재고(톤)": "{:,.0f}"})
+        .format(format_trend_text, subset=["3개월 전 대비", "6개월 전 대비", "1년 전 대비"])
+        .map(color_variant, subset=["3개월 전 대비", "6개월 전 대비", "1년 전 대비"]),
+        use_container_width=True,
+        height=table_height,
+        hide_index=True
+    )
 
 st.caption("※ 배경색 가이드: 붉은색(재고 상승/증가), 파란색(재고 하락/감소)")
 st.divider()
@@ -220,7 +169,7 @@ chart_title_part = "전체 합계(Total)" if selected_option == "전체 보기"
 tab1, tab2 = st.tabs(["상세 추이 분석", "수입 vs 재고 비교"])
 
 # [Tab 1] 재고 추이 (막대 차트)
-with tab1:
+with tab1, perf_monitor.timed("재고 추이 탭", "render"):
     st.subheader(f"{chart_title_part} 재고 추이 ({period_option})")
     
     chart_data = df_inv_filtered[df_inv_filtered['part'] == chart_target_part].sort_values('date')
@@ -240,7 +189,7 @@ with tab1:
         st.plotly_chart(fig, use_container_width=True)
 
 # [Tab 2] 수입 vs 재고 (재고=Bar, 수입=Line)
-with tab2:
+with tab2, perf_monitor.timed("수입 vs 재고 탭", "render"):
     st.subheader(f"{chart_title_part} 수급(Supply vs Stock) 분석")
     
     if df_imp_filtered.empty:
@@ -307,4 +256,6 @@ with tab2:
         # 데이터 시차 안내 문구
         if not merged['재고량(톤)'].dropna().empty:
             last_inv_date = merged['재고량(톤)'].dropna().index.max().strftime('%Y-%m')
-            st.caption(f"참고: 재고 데이터는 {last_inv_date}까지만 제공됩니다. (이후 구간은 수입량만 표시됨)")
\ No newline at end of file
+            st.caption(f"참고: 재고 데이터는 {last_inv_date}까지만 제공됩니다. (이후 구간은 수입량만 표시됨)")
+
+perf_monitor.finish_page()
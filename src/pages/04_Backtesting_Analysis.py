@@ -1,130 +1,146 @@
 import streamlit as st
-import pandas as pd
-import os
-import numpy as np
+import plotly.express as px
 from pathlib import Path
 
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-from config import DASHBOARD_READY_CSV, MANUAL_KOR_PRICE_CSV, PROCESSED_USDA_COST_CSV
+from config import DASHBOARD_READY_CSV, PROCESSED_USDA_COST_CSV
+from utils.lag_scanner import load_lag_table, DEFAULT_MAX_LAG
+from utils import dashboard_data, perf_monitor
+from utils.downsample import downsample_frame
+from utils import landed_cost
 
 # [파일 정의서]
 # - 파일명: 04_Backtesting_Analysis.py
 # - 역할: 시각화
-# - 대상: 수입육 (미국산 삼겹양지)
-# - 주요 기능: 수기 데이터(ffill 보간)와 자동화 데이터를 병합하여, 미국 USDA 상륙 원가와 한국 도매가의 시차(Time Lag)를 완벽히 분석함.
+# - 대상: 수입육 (USDA 품목 ↔ 미트박스 부위 매핑 쌍, 기본 Short Plate ↔ 삼겹양지)
+# - 주요 기능: 파이프라인이 만든 쌍별 일별 시계열(data/2_dashboard/landed_cost_pairs.parquet)에서 선택한 쌍만 조회하여
+#              미국 USDA 상륙 원가와 한국 도매가를 비교함.
+#              전 USDA 품목 × 미트박스 부위 시차 상관 히트맵 (utils/lag_scanner.py 캐시 테이블 조회)
+# - 성능 계측: utils/perf_monitor.py (URL에 ?debug=1 → 사이드바 계측 패널)
 
 # ======================================================
 # [설정] 기본 환경 설정 및 경로 지정
 # ======================================================
 st.set_page_config(page_title="백테스팅 및 시차 분석", layout="wide")
+perf_monitor.start_page("04_Backtesting_Analysis")
 
-KOR_AUTO_PATH = DASHBOARD_READY_CSV
-KOR_MANUAL_PATH = MANUAL_KOR_PRICE_CSV
-US_DATA_PATH = PROCESSED_USDA_COST_CSV
+DEFAULT_PAIR = '삼겹양지-미국'      # 기존 분석 기준 쌍 (Short Plate ↔ 삼겹양지)
 
 # ======================================================
-# [함수] 데이터 결합 및 최적화 로직
+# [함수] 데이터 로드 (파이프라인이 만든 쌍별 일별 시계열 조회)
 # ======================================================
-@st.cache_data
-def load_and_merge_data():
-    # --------------------------------------------------
-    # 1. 달력 뼈대 생성 (2024년 1월 1일 ~ 현재)
-    # --------------------------------------------------
-    start_date = pd.to_datetime("2024-01-01")
-    end_date = pd.to_datetime('today')
-    calendar_df = pd.DataFrame({'date': pd.date_range(start=start_date, end=end_date)})
-
-    # --------------------------------------------------
-    # 2. 한국 수기 데이터(Manual) 로드 및 보간 (Option A, Option C)
-    # --------------------------------------------------
-    if KOR_MANUAL_PATH.exists():
-        df_manual = pd.read_csv(KOR_MANUAL_PATH)
-        df_manual['date'] = pd.to_datetime(df_manual['date'])
-        df_manual_target = df_manual[df_manual['part'] == '삼겹양지'][['date', 'wholesale_price']]
-        df_manual_target = df_manual_target.rename(columns={'wholesale_price': 'Manual_Price'})
-        
-        # 달력에 수기 데이터를 붙이고 계단식 보간(ffill) 적용
-        df_kor_combined = pd.merge(calendar_df, df_manual_target, on='date', how='left')
-        df_kor_combined['Manual_Price'] = df_kor_combined['Manual_Price'].fillna(method='ffill')
-    else:
-        # 수기 파일이 없으면 빈 컬럼 생성
-        df_kor_combined = calendar_df.copy()
-        df_kor_combined['Manual_Price'] = np.nan
-
-    # --------------------------------------------------
-    # 3. 한국 자동화 데이터(Auto) 로드
-    # --------------------------------------------------
-    df_auto = pd.read_csv(KOR_AUTO_PATH)
-    df_auto['date'] = pd.to_datetime(df_auto['date'])
-    mask_kor = (df_auto['category'] == '미국') & (df_auto['part'] == '삼겹양지')
-    
-    df_auto_filtered = df_auto[mask_kor].groupby('date')['wholesale_price'].mean().reset_index()
-    df_auto_filtered = df_auto_filtered.rename(columns={'wholesale_price': 'Auto_Price'})
-    
-    # 달력에 자동화 데이터를 병합
-    df_kor_combined = pd.merge(df_kor_combined, df_auto_filtered, on='date', how='left')
-
-    # --------------------------------------------------
-    # 4. 자동화 우선 충돌 해결 로직 (Req 3)
-    # --------------------------------------------------
-    # Auto_Price가 있으면 그것을 쓰고, 없으면 Manual_Price(보간된 값)를 사용한다.
-    df_kor_combined['KOR_Price_KRW_kg'] = df_kor_combined['Auto_Price'].fillna(df_kor_combined['Manual_Price'])
-
-    # --------------------------------------------------
-    # 5. 미국 USDA 상륙 원가 로드 및 병합
-    # --------------------------------------------------
-    df_us = pd.read_csv(US_DATA_PATH)
-    df_us['Date'] = pd.to_datetime(df_us['Date'])
-    
-    df_us_valid = df_us.dropna(subset=['item_description', 'weighted_average_KRW_kg'])
-    mask_plate = df_us_valid['item_description'].str.contains('short plate', case=False)
-    mask_skirt = df_us_valid['item_description'].str.contains('skirt', case=False)
-    
-    df_us_filtered = df_us_valid[mask_plate & ~mask_skirt]
-    df_us_daily = df_us_filtered.groupby('Date')['weighted_average_KRW_kg'].mean().reset_index()
-    df_us_daily = df_us_daily.rename(columns={'Date': 'date', 'weighted_average_KRW_kg': 'US_Cost_KRW_kg'})
-
-    # 최종 한-미 데이터 병합
-    df_merged = pd.merge(calendar_df, df_us_daily, on='date', how='left')
-    df_merged = pd.merge(df_merged, df_kor_combined[['date', 'KOR_Price_KRW_kg']], on='date', how='left')
-
-    return df_merged
+@perf_monitor.cached
+def _compute_pair_series(cache_key):
+    """파이프라인 실행 전(landed_cost_pairs.parquet 없음)이면 원천 파일로 한 번 계산"""
+    if not (PROCESSED_USDA_COST_CSV.exists() and DASHBOARD_READY_CSV.exists()):
+        return None
+    us_daily, us_items = landed_cost.load_us_daily()
+    series = landed_cost.build_pair_series(us_daily, us_items, landed_cost.load_kr_daily())
+    return series.set_index('pair').sort_index()
+
+@perf_monitor.timed("쌍별 시계열 로드", "load")
+def load_pair_series():
+    """쌍 이름 인덱스의 일별 시계열 (utils/dashboard_data.py 공유 캐시)"""
+    pairs = dashboard_data.load_landed_cost_pairs()
+    if pairs is None:
+        pairs = _compute_pair_series(tuple(dashboard_data.file_key(p) for p in (PROCESSED_USDA_COST_CSV, DASHBOARD_READY_CSV)))
+    return pairs
+
+@perf_monitor.cached
+def _lag_scan(cache_key):
+    """원천 파일 버전(cache_key)별로 한 번만 조회 → 파이프라인이 원천을 갱신하면 다음 조회에서 새로 계산"""
+    return load_lag_table()
+
+@perf_monitor.timed("시차 분석 테이블 로드", "load")
+def load_lag_scan():
+    """전 품목 쌍 시차 곡선·순위표 (원천이 바뀌지 않았으면 Parquet 캐시에서 바로 로드)"""
+    return _lag_scan(tuple(dashboard_data.file_key(p) for p in (PROCESSED_USDA_COST_CSV, DASHBOARD_READY_CSV)))
 
 # ======================================================
 # [화면] 대시보드 UI 구성
 # ======================================================
 def main():
     st.title("한-미 소고기 가격 백테스팅 분석")
-    st.markdown("수기 과거 데이터와 자동화 최신 데이터를 결합하여 시차(Time Lag)를 정밀하게 분석합니다.")
-
-    with st.spinner('데이터를 병합하고 보간(Interpolation)하는 중입니다...'):
-        df_chart = load_and_merge_data()
-
-    if df_chart.empty:
-        st.error("시각화할 데이터가 없습니다.")
-        return
+    st.markdown("매핑된 부위 쌍별로 미국 USDA 상륙 원가와 한국 도매가를 비교하고 시차(Time Lag)를 분석합니다.")
 
-    tab1, tab2 = st.tabs(["시계열 차트 분석", "병합 데이터 상세 보기"])
+    pairs = load_pair_series()
+    tab1, tab2, tab3 = st.tabs(["시계열 차트 분석", "병합 데이터 상세 보기", "품목별 시차 상관 히트맵"])
 
-    with tab1:
-        st.subheader("🇺🇸 미국 Short Plate vs 🇰🇷 한국 삼겹양지 비교 (2024년 이후)")
+    if pairs is None or pairs.empty:
+        with tab1:
+            st.error("시각화할 데이터가 없습니다. (processed_usda_cost.csv, dashboard_ready_data.csv 필요)")
+    else:
+        pair_options = pairs.index.unique().tolist()
+        selected_pair = st.sidebar.selectbox(
+            "비교 쌍 (한국 부위-국가)", pair_options,
+            index=pair_options.index(DEFAULT_PAIR) if DEFAULT_PAIR in pair_options else 0
+        )
+        df_chart = pairs.loc[[selected_pair]].reset_index(drop=True).rename(columns={
+            'us_cost_krw_kg': 'US_Cost_KRW_kg', 'kr_price_krw_kg': 'KOR_Price_KRW_kg'
+        })
+        us_items = df_chart['us_items'].iloc[0]
+
+        with tab1, perf_monitor.timed("시계열 차트 탭", "render"):
+            st.subheader(f"🇺🇸 미국 {us_items} vs 🇰🇷 한국 {selected_pair}")
+            st.markdown(
+                "* **파란색 선(US_Cost)**: 미국 상륙 추정 원가 (USD/kg × 환율)\n"
+                "* **빨간색 선(KOR_Price)**: 한국 미트박스 도매가 (브랜드 통합 일별 평균)"
+            )
+
+            chart_cols = ['US_Cost_KRW_kg', 'KOR_Price_KRW_kg']
+            full_resolution = st.checkbox("원본 해상도로 보기", value=False, help="기본은 차트 폭에 맞게 줄여 표시합니다 (고점·저점 유지).")
+            chart_data = df_chart if full_resolution else downsample_frame(df_chart, 'date', chart_cols)
+            chart_data = chart_data.set_index('date')
+            st.line_chart(
+                chart_data[chart_cols], 
+                height=500,
+                color=["#1f77b4", "#d62728"]
+            )
+
+        with tab2, perf_monitor.timed("상세 데이터 탭", "render"):
+            st.subheader("일자별 상세 데이터")
+            df_display = df_chart[['date', 'US_Cost_KRW_kg', 'KOR_Price_KRW_kg']].sort_values(by='date', ascending=False)
+            st.dataframe(df_display, use_container_width=True, hide_index=True)
+
+    with tab3, perf_monitor.timed("시차 상관 히트맵 탭", "render"):
+        st.subheader("🇺🇸 USDA 품목 × 🇰🇷 미트박스 부위 최적 시차")
         st.markdown(
-            "* **파란색 선(US_Cost)**: 미국 상륙 추정 원가\n"
-            "* **빨간색 선(KOR_Price)**: 한국 미트박스 실거래가 (과거 수기 데이터 계단식 보간 + 최신 자동화 데이터)"
+            f"* 주간 평균 + 4주 이동평균 스무딩 후, 0~{DEFAULT_MAX_LAG}주 시차별 상관계수 중 최댓값 (칸 안 숫자 = 최적 시차, 주)\n"
+            "* 시차 > 0: 미국 원가가 먼저 움직이고 한국 도매가가 뒤따름"
         )
-        
-        chart_data = df_chart.set_index('date')
-        st.line_chart(
-            chart_data[['US_Cost_KRW_kg', 'KOR_Price_KRW_kg']], 
-            height=500,
-            color=["#1f77b4", "#d62728"]
+        try:
+            df_curves, df_rank = load_lag_scan()
+        except FileNotFoundError as e:
+            st.warning(f"시차 분석에 필요한 파일이 없습니다: {e}")
+            return
+        if df_rank.empty:
+            st.info("겹치는 기간이 충분한 품목 쌍이 없습니다.")
+            return
+
+        corr_grid = df_rank.pivot_table(index='us_item', columns='part', values='best_corr')
+        lag_grid = df_rank.pivot_table(index='us_item', columns='part', values='best_lag').reindex_like(corr_grid)
+        fig = px.imshow(
+            corr_grid, color_continuous_scale='RdBu_r', zmin=-1, zmax=1, aspect='auto',
+            labels={'x': '미트박스 부위', 'y': 'USDA 품목', 'color': '최대 상관계수'},
         )
-
-    with tab2:
-        st.subheader("일자별 상세 데이터")
-        df_display = df_chart.sort_values(by='date', ascending=False)
-        st.dataframe(df_display, use_container_width=True, hide_index=True)
+        fig.update_traces(text=lag_grid.to_numpy(), texttemplate="%{text:.0f}")
+        fig.update_layout(height=max(400, 28 * len(corr_grid) + 150))
+        st.plotly_chart(fig, use_container_width=True)
+
+        st.markdown("##### 쌍별 시차 곡선")
+        pair_labels = (df_rank['us_item'] + " → " + df_rank['part']).tolist()
+        selected = st.selectbox("품목 쌍 (최대 상관계수 순)", pair_labels)
+        row = df_rank.iloc[pair_labels.index(selected)]
+        curve = df_curves[
+            (df_curves['us_item'] == row['us_item']) & (df_curves['country'] == row['country']) & (df_curves['part'] == row['part'])
+        ]
+        fig_curve = px.line(curve, x='lag', y='corr', markers=True, labels={'lag': '시차 (주)', 'corr': '상관계수'})
+        fig_curve.add_vline(x=row['best_lag'], line_dash='dash', line_color='red')
+        st.plotly_chart(fig_curve, use_container_width=True)
+
+        st.dataframe(df_rank, use_container_width=True, hide_index=True)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+    perf_monitor.finish_page()
\ No newline at end of file
@@ -14,7 +14,7 @@ from pathlib import Path
 # - 실행 옵션:
 #     python src/run_daily_update.py                → 가격 파이프라인만 (기본, 기존 동작)
 #     python src/run_daily_update.py --price-only   → 가격 파이프라인만 (명시적)
-#     python src/run_daily_update.py --full          → 전체 수집 + 전처리
+#     python src/run_daily_update.py --full          → 전체 수집 + 전처리 + 모델 예측 갱신
 # - 성공 시 Git: 모든 단계 성공(fail==0)이면 data/, docs/DATA_DICTIONARY.md 자동 커밋 (--no-commit 으로 끔)
 # - 푸시: --push 또는 환경변수 PIPELINE_GIT_PUSH=1
 
@@ -29,6 +29,8 @@ GIT_PIPELINE_PATHS = [
     "data/2_dashboard",
     "docs/DATA_DICTIONARY.md",
 ]
+# .gitignore 로 개발 중 실수 커밋을 막는 생성 산출물 경로 → 파이프라인 커밋에서만 강제 스테이징
+GIT_FORCE_ADD_PATHS = {"data/2_dashboard"}
 
 
 def _run_step(label, script_path, critical=True):
@@ -73,6 +75,10 @@ def _util(name):
     return os.path.join(CURRENT_DIR, "utils", name)
 
 
+def _model(name):
+    return os.path.join(CURRENT_DIR, "Models", name)
+
+
 def _git_available() -> bool:
     try:
         r = subprocess.run(
@@ -116,14 +122,17 @@ def _try_git_commit_and_push(
         print("\n[Git] 커밋 대상 경로가 없어 건너뜁니다.")
         return
 
+    force_add = [rel for rel in to_add if rel in GIT_FORCE_ADD_PATHS]
     try:
-        subprocess.run(
-            ["git", "add", "--"] + to_add,
-            cwd=root,
-            check=True,
-            capture_output=True,
-            text=True,
-        )
+        for paths, flags in (([rel for rel in to_add if rel not in GIT_FORCE_ADD_PATHS], []), (force_add, ["-f"])):
+            if paths:
+                subprocess.run(
+                    ["git", "add"] + flags + ["--"] + paths,
+                    cwd=root,
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
     except subprocess.CalledProcessError as e:
         print(f"\n[Git] git add 실패: {e.stderr or e}")
         return
@@ -183,6 +192,11 @@ MONTHLY_COLLECTORS = [
     ("식약처 수입 검역 실적",             _collector("crawl_imp_food_safety.py")),
 ]
 
+# 월별 수집 직후 수입량·재고 화면용 long 테이블 갱신 (--full 전용)
+SUPPLY_PROCESSORS = [
+    ("KMTA 수입량·재고 → supply_* 수급 테이블", _util("supply_analytics.py")),
+]
+
 USDA_PROCESSORS = [
     ("USDA 원가 산출 (환율 반영)",       _util("process_usda_data.py")),
     ("USDA Plate USD/kg 변환",          _util("preprocess_primal.py")),
@@ -192,6 +206,16 @@ COMMON_PROCESSORS = [
     ("미트박스 전처리 → dashboard_ready", _util("preprocess_meat_data.py")),
 ]
 
+# USDA 원가와 미트박스 시세가 모두 필요한 비교 시계열 (--full 전용)
+ANALYSIS_PROCESSORS = [
+    ("USDA 원가 × 미트박스 부위 일별 시계열 → landed_cost_pairs", _util("landed_cost.py")),
+]
+
+MODEL_UPDATERS = [
+    ("모델 예측 갱신 → model_forecasts", _model("batch_forecast.py")),
+    ("국가 × 부위 시계열 예측 → series_forecasts", _model("multi_series.py")),
+]
+
 SCHEMA_UPDATER = [
     ("DATA_DICTIONARY 스키마 갱신",       _util("extract_data_schema.py")),
 ]
@@ -233,9 +257,9 @@ def run_price_only():
 
 
 def run_full():
-    """전체 수집: 일별 + 월별 수집 → USDA 전처리 → 미트박스 전처리 → 스키마 갱신"""
+    """전체 수집: 일별 + 월별 수집 → USDA 전처리 → 미트박스 전처리 → 모델 예측 갱신 → 스키마 갱신"""
     print("=" * 60)
-    print("  모드: --full (전체 수집 + 전처리)")
+    print("  모드: --full (전체 수집 + 전처리 + 모델 예측 갱신)")
     print("=" * 60)
 
     total, success, fail = 0, 0, 0
@@ -266,6 +290,12 @@ def run_full():
             success += 1
         else:
             fail += 1
+    for label, path in SUPPLY_PROCESSORS:
+        total += 1
+        if _run_step(f"[수급 전처리] {label}", path, critical=False):
+            success += 1
+        else:
+            fail += 1
 
     # -- 3단계: USDA 전처리 --
     print(f"\n{'='*60}")
@@ -282,16 +312,27 @@ def run_full():
     print(f"\n{'='*60}")
     print("  [4] 미트박스 전처리")
     print(f"{'='*60}")
-    for label, path in COMMON_PROCESSORS:
+    for label, path in COMMON_PROCESSORS + ANALYSIS_PROCESSORS:
         total += 1
         if _run_step(f"[전처리] {label}", path, critical=False):
             success += 1
         else:
             fail += 1
 
-    # -- 5단계: 스키마 갱신 --
+    # -- 5단계: 모델 예측 갱신 (데이터가 바뀐 모델만 재학습) --
+    print(f"\n{'='*60}")
+    print("  [5] 모델 예측 갱신")
+    print(f"{'='*60}")
+    for label, path in MODEL_UPDATERS:
+        total += 1
+        if _run_step(f"[모델] {label}", path, critical=False):
+            success += 1
+        else:
+            fail += 1
+
+    # -- 6단계: 스키마 갱신 --
     print(f"\n{'='*60}")
-    print("  [5] 문서 갱신")
+    print("  [6] 문서 갱신")
     print(f"{'='*60}")
     for label, path in SCHEMA_UPDATER:
         total += 1
@@ -311,7 +352,7 @@ def main():
 사용 예시:
   python src/run_daily_update.py               가격 파이프라인만 (기본)
   python src/run_daily_update.py --price-only   가격 파이프라인만 (명시적)
-  python src/run_daily_update.py --full          전체 수집 + 전처리
+  python src/run_daily_update.py --full          전체 수집 + 전처리 + 모델 예측 갱신
   python src/run_daily_update.py --full --push   전체 수집 후 커밋 + git push
 
 성공 시(모든 단계 성공) data/, docs/DATA_DICTIONARY.md 가 자동 커밋됩니다.
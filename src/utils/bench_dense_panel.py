@@ -0,0 +1,64 @@
+import time
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from utils.preprocess_meat_data import load_daily_prices, enrich_with_groupby
+from utils.dense_panel import enrich_price_panel
+
+# [파일 정의서]
+# - 파일명: bench_dense_panel.py
+# - 역할: 검증 (성능 벤치마크)
+# - 대상: 공통 (대시보드용 시세 가공)
+# - 주요 기능: 기존 groupby 경로(enrich_with_groupby)와 밀집 행렬 엔진(enrich_price_panel)의
+#              실행 시간을 비교하고, 두 결과가 완전히 같은지(값·순서·결측 위치) 확인
+# - 실행 예시: python src/utils/bench_dense_panel.py --repeat 3
+
+COMPARE_COLS = [
+    'country', 'part', 'brand', 'date', 'category',
+    'wholesale_price', 'ma7', 'ma30', 'min_total', 'max_total',
+]
+
+
+def _timeit(func, df, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="dense 엔진 vs 기존 groupby 경로 벤치마크")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (최소 시간 기준)")
+    args = parser.parse_args()
+
+    df = load_daily_prices()
+    if df is None:
+        return
+    n_series = df.groupby(['country', 'part', 'brand']).ngroups
+    print(f"입력: {len(df)}행 / 시계열 {n_series}개 / 반복 {args.repeat}회")
+
+    t_legacy, legacy = _timeit(enrich_with_groupby, df, args.repeat)
+    t_dense, dense = _timeit(enrich_price_panel, df, args.repeat)
+
+    print(f"- groupby 경로 : {t_legacy:8.3f}초 ({len(legacy)}행)")
+    print(f"- dense 엔진   : {t_dense:8.3f}초 ({len(dense)}행)")
+    print(f"- 속도 향상    : {t_legacy / t_dense:8.1f}배")
+
+    left = legacy[COMPARE_COLS].reset_index(drop=True)
+    right = dense[COMPARE_COLS].reset_index(drop=True)
+    try:
+        pd.testing.assert_frame_equal(left, right, check_dtype=False, check_exact=True)
+        print("[일치] 두 경로의 결과가 완전히 같습니다.")
+    except AssertionError as e:
+        print(f"[불일치] {e}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import MASTER_PRICE_CSV, DATA_RAW
+from utils.normalize_part_brand import split_part_brand
 
 # [파일 정의서]
 # - 파일명: src/utils/check_existing_names.py
@@ -50,6 +51,15 @@ def check_master_file():
             print("품목명 관련 컬럼을 자동으로 찾지 못했습니다. 위 컬럼 목록을 보고 알려주세요.")
             print(df.head(3))
 
+        # 5. 표준 부위명 / 브랜드 분리 결과 (대시보드와 동일한 정규화 규칙)
+        if 'part_name' in df.columns:
+            parsed = split_part_brand(df['part_name'], df['brand'] if 'brand' in df.columns else None)
+            part_counts = parsed.drop_duplicates().groupby('part')['brand'].nunique().sort_index()
+            print(f"[표준 부위명] {len(part_counts)}개 (부위별 브랜드 수)")
+            for part, n_brand in part_counts.items():
+                print(f"   - {part} ({n_brand}개 브랜드)")
+            print("-" * 50)
+
     except Exception as e:
         print(f"에러 발생: {e}")
 
@@ -0,0 +1,53 @@
+import pandas as pd
+from contextlib import nullcontext
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from utils.file_store import atomic_replace, file_lock
+
+# [파일 정의서]
+# - 파일명: columnar_store.py
+# - 역할: 공통 (저장소 헬퍼)
+# - 대상: 공통
+# - 주요 기능: Parquet 기반 컬럼형 테이블 읽기 및 키 기준 병합 저장(upsert)
+#              수집기·전처리 단계가 누적 이력 테이블을 같은 방식으로 관리하도록 일원화
+#              저장은 임시 파일 → 원자적 교체 (utils/file_store.py), upsert는 읽기-병합-저장 전체를 파일 잠금으로 보호
+
+PARQUET_ENGINE = "pyarrow"
+
+
+def read_table(path, columns=None):
+    """Parquet 테이블을 읽는다. 파일이 없으면 None을 반환한다."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    return pd.read_parquet(str(path), columns=columns, engine=PARQUET_ENGINE)
+
+
+def write_table(df, path, lock=True):
+    """
+    DataFrame을 Parquet 테이블로 저장한다 (인덱스 미포함, 임시 파일 → 원자적 교체).
+    해시·버전별 이름의 캐시 파일처럼 쓰는 쪽이 경합하지 않는 경로는 lock=False (잠금 파일을 만들지 않음)
+    """
+    with (file_lock(path) if lock else nullcontext()), atomic_replace(path) as tmp_path:
+        df.to_parquet(str(tmp_path), index=False, engine=PARQUET_ENGINE)
+
+
+def upsert_table(df_new, path, key_cols, sort_cols=None):
+    """
+    기존 테이블에 신규 행을 병합한다.
+    key_cols가 같은 행은 신규 값으로 대체(keep='last')하고, sort_cols 기준으로 정렬해 저장한다.
+    저장된 전체 행 수를 반환한다.
+    """
+    with file_lock(path):
+        df_old = read_table(path)
+        if df_old is not None and not df_old.empty:
+            df_all = pd.concat([df_old, df_new], ignore_index=True)
+        else:
+            df_all = df_new.copy()
+
+        df_all = df_all.drop_duplicates(subset=key_cols, keep="last")
+        df_all = df_all.sort_values(by=sort_cols or key_cols).reset_index(drop=True)
+        write_table(df_all, path)
+    return len(df_all)
@@ -0,0 +1,214 @@
+import threading
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from config import (
+    DASHBOARD_READY_CSV, HOME_SUMMARY_CSV, MARKET_HIGHLIGHTS_CSV, MODEL_FORECASTS_CSV,
+    MASTER_IMPORT_VOLUME_CSV, BEEF_STOCK_XLSX, PRICE_CUBE_PARQUET, LANDED_COST_PAIRS_PARQUET,
+    SUPPLY_IMPORT_PARQUET, SUPPLY_MONTHLY_PARQUET, SUPPLY_PART_PARQUET, SUPPLY_STOCK_PARQUET,
+    DASHBOARD_CACHE_DIR,
+)
+from utils.columnar_store import PARQUET_ENGINE, read_table, write_table
+from utils.file_store import read_snapshot
+
+# [파일 정의서]
+# - 파일명: dashboard_data.py
+# - 역할: 공통 (대시보드 데이터 접근)
+# - 대상: 공통 (Home.py, pages/*)
+# - 주요 기능: 대시보드 페이지가 쓰는 원천 파일을 한 곳에서 읽어 프로세스 안에서 공유
+#   1. 캐시 키 = 원천 파일의 (수정 시각 ns, 크기) → 파이프라인이 파일을 갱신하면 서버 재시작 없이 다음 조회부터 새 데이터
+#   2. CSV/엑셀은 처음 한 번만 파싱(날짜 변환 포함)하여 data/1_processed/dashboard_cache/ 에 Parquet 사본으로 저장,
+#      이후(다른 프로세스·재시작 포함)에는 Parquet에서 필요한 컬럼만 읽음 (Parquet 원천은 사본 없이 바로 읽음)
+#   3. 로드 결과는 모듈 전역 캐시에 보관되어 모든 페이지·세션이 같은 프레임을 공유
+#      → 반환된 프레임은 수정하지 말 것 (필요하면 copy/assign 후 사용)
+#   - 원천은 파일 핸들 하나로 읽고 그 핸들의 버전을 캐시 키로 사용 (utils/file_store.py read_snapshot, 교체 중 읽기에도 일관)
+#   4. 적중/미적중·사본 읽기·원천 파싱 횟수 누적 (cache_stats, utils/perf_monitor.py 계측 패널에서 사용)
+
+
+_cache = {}                 # (원천 경로, 컬럼) → (파일 키, DataFrame)
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'sidecar_reads': 0, 'source_parses': 0}
+
+
+def file_key(path):
+    """원천 파일의 (수정 시각 ns, 크기). 파일이 없으면 None. Streamlit 캐시 인자로도 사용."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def cache_stats():
+    """프로세스 시작 이후 누적 캐시 통계 사본 (hits, misses, sidecar_reads, source_parses)."""
+    with _lock:
+        return dict(_stats)
+
+
+def _count(name):
+    with _lock:
+        _stats[name] += 1
+
+
+def _sidecar_path(path, key):
+    return Path(DASHBOARD_CACHE_DIR) / f"{Path(path).stem}-{key[0]}-{key[1]}.parquet"
+
+
+def _write_sidecar(df, path, key):
+    """Parquet 사본 저장 (임시 파일 → 원자적 교체), 같은 원천의 이전 사본은 삭제."""
+    sidecar = _sidecar_path(path, key)
+    try:
+        # 파일명에 원천 버전이 들어가 있어 같은 이름을 쓰는 프로세스는 같은 내용 → 잠금 없이 교체
+        write_table(df, sidecar, lock=False)
+    except (OSError, ValueError, TypeError) as e:
+        # 혼합 타입 컬럼 등으로 Parquet 변환이 안 되면 사본 없이 메모리 캐시만 사용
+        print(f"[dashboard_data] Parquet 사본 저장 생략 ({Path(path).name}): {e}")
+        return
+    for old in sidecar.parent.glob(f"{Path(path).stem}-*.parquet"):
+        if old != sidecar:
+            old.unlink(missing_ok=True)
+
+
+def _read_source(path, key, columns, dates, reader):
+    """
+    (실제로 읽은 파일 버전, DataFrame). 원천은 read_snapshot으로 한 번 열어 읽으므로
+    파이프라인이 읽는 도중 파일을 교체해도 내용과 버전(캐시 키·사본 이름)이 어긋나지 않음
+    """
+    if Path(path).suffix == '.parquet':
+        return read_snapshot(path, lambda f: pd.read_parquet(f, columns=columns, engine=PARQUET_ENGINE))
+
+    sidecar = _sidecar_path(path, key)
+    if sidecar.exists():
+        try:
+            df = read_table(sidecar, columns=columns)
+            _count('sidecar_reads')
+            return key, df
+        except (OSError, ValueError):
+            pass
+
+    version, df = read_snapshot(path, reader)
+    if df is None:
+        return None, None
+    _count('source_parses')
+    for col in dates:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col])
+    _write_sidecar(df, path, version)
+    return version, (df[columns] if columns else df)
+
+
+def load_frame(path, columns=None, dates=(), reader=None, prepare=None):
+    """
+    원천 파일을 (파일 키 기준) 캐시에서 읽는다. 파일이 없으면 None.
+    columns: 필요한 컬럼만 (None이면 전체), dates: datetime으로 변환할 컬럼, reader: 바이너리 파일 핸들 → DataFrame (기본 utf-8-sig CSV)
+    원천이 Parquet이면 사본 없이 바로 읽고, prepare가 있으면 읽은 프레임을 한 번 가공해 캐시 (인덱스 설정 등)
+    """
+    key = file_key(path)
+    if key is None:
+        return None
+
+    cache_id = (str(path), tuple(columns) if columns else None)
+    with _lock:
+        hit = _cache.get(cache_id)
+        if hit is not None and hit[0] == key:
+            _stats['hits'] += 1
+            return hit[1]
+        _stats['misses'] += 1
+
+    reader = reader or (lambda f: pd.read_csv(f, encoding='utf-8-sig'))
+    key, df = _read_source(path, key, list(columns) if columns else None, dates, reader)
+    if df is None:
+        return None
+    if prepare is not None:
+        df = prepare(df)
+    with _lock:
+        # 같은 원천의 이전 파일 키 항목은 정리
+        for stale in [k for k, (old_key, _) in _cache.items() if k[0] == str(path) and old_key != key]:
+            del _cache[stale]
+        _cache[cache_id] = (key, df)
+    return df
+
+
+def clear_cache():
+    """메모리 캐시 비우기 (Parquet 사본은 유지)."""
+    with _lock:
+        _cache.clear()
+
+
+# ======================================================
+# [원천별 로더] 페이지에서 쓰는 파일
+# ======================================================
+def load_dashboard_ready(columns=None):
+    """dashboard_ready_data.csv (date: datetime64)."""
+    return load_frame(DASHBOARD_READY_CSV, columns, dates=('date',))
+
+
+def load_home_summary():
+    """Home 부위별 시세 변동 요약 (utils/home_summary.py 산출물)."""
+    return load_frame(HOME_SUMMARY_CSV)
+
+
+def load_market_highlights():
+    """원산지 범위별 Market Highlights (utils/market_highlights.py 산출물)."""
+    return load_frame(MARKET_HIGHLIGHTS_CSV)
+
+
+def load_model_forecasts():
+    """모델 배치 예측 (Models/batch_forecast.py 산출물, base_month: datetime64)."""
+    return load_frame(MODEL_FORECASTS_CSV, dates=('base_month',))
+
+
+def load_price_cube():
+    """
+    국가 × 부위 × 브랜드 그룹 일별 평균가 큐브 (utils/price_cube.py 산출물).
+    (country, part) 정렬 인덱스 → cube.loc[(국가, 부위)] 한 번으로 상세 화면 데이터 조회
+    """
+    return load_frame(PRICE_CUBE_PARQUET, prepare=lambda df: df.set_index(['country', 'part']).sort_index())
+
+
+def load_landed_cost_pairs():
+    """
+    매핑 쌍별 미국 상륙 원가 vs 한국 도매가 일별 시계열 (utils/landed_cost.py 산출물).
+    pair 정렬 인덱스 → pairs.loc[쌍 이름] 한 번으로 조회
+    """
+    return load_frame(LANDED_COST_PAIRS_PARQUET, prepare=lambda df: df.set_index('pair').sort_index())
+
+
+def load_supply_imports():
+    """월 × 국가 × 부위 수입량 long 테이블 (utils/supply_analytics.py 산출물)."""
+    return load_frame(SUPPLY_IMPORT_PARQUET)
+
+
+def load_supply_monthly():
+    """월 × 국가('합계' 포함) 총 수입량·YoY·YTD (utils/supply_analytics.py 산출물)."""
+    return load_frame(SUPPLY_MONTHLY_PARQUET)
+
+
+def load_supply_by_part():
+    """월 × 부위('합계' 포함) 국가 통합 수입량 (utils/supply_analytics.py 산출물)."""
+    return load_frame(SUPPLY_PART_PARQUET)
+
+
+def load_supply_stock():
+    """월 × 부위 재고량 + 3/6/12개월 전 대비 변동률 (utils/supply_analytics.py 산출물)."""
+    return load_frame(SUPPLY_STOCK_PARQUET)
+
+
+def load_import_volume(columns=None):
+    """KMTA 월별 수입량 원본 (wide 형식, std_date 문자열 유지)."""
+    return load_frame(MASTER_IMPORT_VOLUME_CSV, columns)
+
+
+def _read_stock(f):
+    try:
+        return pd.read_excel(f)
+    except Exception:
+        f.seek(0)
+        return pd.read_csv(f)
+
+
+def load_beef_stock():
+    """KMTA 월별 재고 원본 (엑셀, 읽기 실패 시 CSV로 재시도)."""
+    return load_frame(BEEF_STOCK_XLSX, reader=_read_stock)
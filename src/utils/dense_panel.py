@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+# [파일 정의서]
+# - 파일명: dense_panel.py
+# - 역할: 가공 (시계열 패널 엔진)
+# - 대상: 공통 (country × part × brand 일별 시세)
+# - 주요 기능: long 형식 시세를 (일자 × 시계열) NumPy 밀집 행렬로 펼친 뒤
+#              1. 최대 7일 결측 보간(Forward Fill)
+#              2. 7일/30일 이동평균 (min_periods 적용)
+#              3. 전체 기간 최저/최고가
+#              를 시계열별 파이썬 루프(groupby + lambda) 없이 행렬 단위로 한 번에 계산하고 다시 long 형식으로 되돌림
+#
+# 기존 groupby().resample('D').ffill(limit=7) + groupby().transform(rolling) 경로와 결과가 동일하도록 구성:
+#   - 각 시계열의 행 범위는 첫 거래일 ~ 마지막 거래일 (그 밖의 날짜는 출력하지 않음)
+#   - 범위 내 7일 초과 공백은 가격·category 모두 NaN
+#   - 이동평균은 범위 밖 셀을 NaN으로 두어 시계열 시작 이전 값이 섞이지 않음
+
+SERIES_KEYS = ['country', 'part', 'brand']
+FFILL_LIMIT = 7
+MA_WINDOWS = {'ma7': (7, 4), 'ma30': (30, 15)}   # 컬럼명: (window, min_periods)
+
+
+class DensePanel:
+    """(일자 × 시계열) 밀집 행렬과 시계열 키/관측 마스크를 묶은 컨테이너."""
+
+    def __init__(self, dates, series, values, observed):
+        self.dates = dates          # DatetimeIndex (n_dates)
+        self.series = series        # DataFrame[SERIES_KEYS] (n_series), 키 정렬 순서
+        self.values = values        # float64 (n_dates, n_series), 관측일 외 NaN
+        self.observed = observed    # bool (n_dates, n_series)
+
+
+def build_panel(df, value_col='wholesale_price'):
+    """(date, country, part, brand) 단위로 유일한 long 프레임 → DensePanel."""
+    series_id = df.groupby(SERIES_KEYS, sort=True).ngroup().to_numpy()
+    series = (
+        df.loc[:, SERIES_KEYS]
+        .assign(_sid=series_id)
+        .drop_duplicates('_sid')
+        .sort_values('_sid')
+        .drop(columns='_sid')
+        .reset_index(drop=True)
+    )
+
+    dates = pd.date_range(df['date'].min(), df['date'].max(), freq='D')
+    row = ((df['date'] - dates[0]) // pd.Timedelta(days=1)).to_numpy()
+
+    values = np.full((len(dates), len(series)), np.nan)
+    observed = np.zeros((len(dates), len(series)), dtype=bool)
+    values[row, series_id] = df[value_col].to_numpy(dtype='float64')
+    observed[row, series_id] = True
+    return DensePanel(dates, series, values, observed)
+
+
+def forward_fill(panel, limit=FFILL_LIMIT):
+    """
+    시계열별 limit일까지 직전 관측값으로 채운다.
+    반환: (채운 값 행렬, 채움 여부 마스크, 시계열 범위 마스크)
+    """
+    n_dates = len(panel.dates)
+    rows = np.arange(n_dates)[:, None]
+
+    last_obs = np.where(panel.observed, rows, -1)
+    np.maximum.accumulate(last_obs, axis=0, out=last_obs)
+
+    first_row = panel.observed.argmax(axis=0)
+    last_row = n_dates - 1 - panel.observed[::-1].argmax(axis=0)
+    in_range = (rows >= first_row) & (rows <= last_row)
+
+    filled_mask = in_range & (last_obs >= 0) & (rows - last_obs <= limit)
+    cols = np.broadcast_to(np.arange(panel.values.shape[1]), panel.values.shape)
+    filled = np.where(filled_mask, panel.values[np.maximum(last_obs, 0), cols], np.nan)
+    return filled, filled_mask, in_range
+
+
+def rolling_mean(values, window, min_periods):
+    """모든 시계열(열)에 대한 이동평균을 한 번에 계산 (NaN은 관측 수에서 제외)."""
+    return pd.DataFrame(values).rolling(window=window, min_periods=min_periods).mean().to_numpy()
+
+
+def enrich_price_panel(df):
+    """
+    일별 평균 시세(long) → 보간·이동평균·최저/최고가가 추가된 long 프레임.
+    컬럼 순서와 행 순서(country, part, brand, date)는 기존 groupby 경로와 같다.
+    """
+    panel = build_panel(df)
+    filled, filled_mask, in_range = forward_fill(panel)
+
+    stats = {name: rolling_mean(filled, w, mp) for name, (w, mp) in MA_WINDOWS.items()}
+    filled_frame = pd.DataFrame(filled)
+    min_total = filled_frame.min().to_numpy()
+    max_total = filled_frame.max().to_numpy()
+
+    # 시계열 순 → 날짜 순으로 범위 내 셀만 추출 (전치 후 nonzero는 열 우선 순서)
+    sid, row = np.nonzero(in_range.T)
+    out = panel.series.iloc[sid].reset_index(drop=True)
+    out['date'] = panel.dates[row]
+    out['wholesale_price'] = filled[row, sid]
+    out['category'] = out['country'].where(filled_mask[row, sid])
+    for name, mat in stats.items():
+        out[name] = mat[row, sid]
+    out['min_total'] = min_total[sid]
+    out['max_total'] = max_total[sid]
+    return out
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+# [파일 정의서]
+# - 파일명: downsample.py
+# - 역할: 공통 (차트 다운샘플링)
+# - 대상: 공통 (pages/01_Price_Dashboard.py, pages/04_Backtesting_Analysis.py)
+# - 주요 기능: 긴 일별 시계열을 차트 폭(약 CHART_POINTS 픽셀) 수준의 점으로 줄여 브라우저로 보내는 데이터량 축소
+#   1. LTTB(Largest-Triangle-Three-Buckets): 구간마다 이전 선택점·다음 구간 평균과 이루는 삼각형 넓이가 최대인 점 선택 → 모양·고점·저점 유지
+#   2. minmax: 구간마다 최저·최고점을 남김 (급등락 구간을 반드시 보존해야 할 때)
+#   3. 여러 컬럼은 컬럼별 선택 행의 합집합을 남겨 같은 날짜 축을 공유 (결측은 컬럼별로 제외 후 선택)
+
+CHART_POINTS = 800
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64) / 86_400e9
+    return x.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out):
+    """LTTB로 고른 위치 배열 (첫·마지막 점 포함, 오름차순)."""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x, y = _as_float(x), np.asarray(y, dtype=np.float64)
+
+    every = (n - 2) / (n_out - 2)
+    edges = (np.arange(n_out - 1) * every).astype(np.int64) + 1
+    edges[-1] = n - 1
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """구간(n_out // 2개)별 최저·최고 위치 배열 (첫·마지막 점 포함, 오름차순)."""
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    buckets = pd.Series(np.asarray(y, dtype=np.float64)).groupby(np.arange(n) * (n_out // 2) // n)
+    picked = np.concatenate([buckets.idxmin().to_numpy(), buckets.idxmax().to_numpy(), [0, n - 1]])
+    return np.unique(picked)
+
+
+def downsample_frame(df, x_col, y_cols, n_out=CHART_POINTS, method='lttb'):
+    """
+    x_col 기준 정렬된 DataFrame을 컬럼별로 다운샘플링하여 선택된 행의 합집합만 반환.
+    행 수가 n_out 이하이면 그대로 반환.
+    """
+    if len(df) <= n_out:
+        return df
+    keep = np.zeros(len(df), dtype=bool)
+    x_all = df[x_col].to_numpy()
+    for col in y_cols:
+        y_all = df[col].to_numpy(dtype=np.float64)
+        valid = np.flatnonzero(~np.isnan(y_all))
+        if len(valid) == 0:
+            continue
+        if method == 'minmax':
+            idx = minmax_indices(y_all[valid], n_out)
+        else:
+            idx = lttb_indices(x_all[valid], y_all[valid], n_out)
+        keep[valid[idx]] = True
+    return df[keep]
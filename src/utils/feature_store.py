@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from config import (
+    FEATURE_STORE_DIR, MANUAL_KOR_PRICE_CSV, MASTER_IMPORT_VOLUME_CSV,
+    BEEF_STOCK_XLSX, EXCHANGE_RATE_XLSX, PROCESSED_USDA_COST_CSV,
+)
+from utils.columnar_store import read_table, write_table
+
+# [파일 정의서]
+# - 파일명: feature_store.py
+# - 역할: 가공 (ML 피처 저장소)
+# - 대상: 수입육 (PART_SPECS에 정의된 전 부위)
+# - 데이터 소스: MANUAL_KOR_PRICE_CSV, PROCESSED_USDA_COST_CSV, EXCHANGE_RATE_XLSX, MASTER_IMPORT_VOLUME_CSV, BEEF_STOCK_XLSX
+# - 주요 기능:
+#   1. 원천 5종을 한 번씩만 읽어 전 부위의 월별 기본 패널(kr_price, us_price, exchange_rate, import_vol, stock)을 생성
+#   2. 원천 파일 내용 해시를 키로 data/1_processed/feature_store/에 Parquet 캐시 (원천이 바뀌지 않으면 재사용)
+#   3. 피처 세트(lag·MoM·YoY + Delta 타겟 / N개월 롤링 최대 상승폭 타겟)는 요청 시점에 기본 패널에서 계산
+# - 사용 예시:
+#     from utils.feature_store import load_features
+#     df = load_features('rib', 'delta')                 → 기존 ml_features_rib.csv와 동일
+#     df = load_features('rib', 'rolling', horizon=6)    → 기존 ml_features_rolling_rib.csv와 동일
+
+FEATURE_STORE_VERSION = 1       # 패널 생성 로직이 바뀌면 올려서 캐시 무효화
+PANEL_START = '2018-01-01'
+BASE_COLS = ['kr_price', 'us_price', 'exchange_rate', 'import_vol', 'stock']
+
+# 부위별 원천 매핑
+#   kr_col     : 수기 국내 도매가 컬럼 (MANUAL_KOR_PRICE_CSV)
+#   us_pattern : USDA item_description 포함 문자열 (대소문자 무시)
+#   import_col : 월별 수입량 컬럼 (MASTER_IMPORT_VOLUME_CSV)
+#   stock_part : 월별 재고 부위명 포함 문자열 (BEEF_STOCK_XLSX)
+PART_SPECS = {
+    'rib':        {'kr_col': '갈비_냉동_미국산',     'us_pattern': 'Rib',     'import_col': '부위별_갈비_합계', 'stock_part': '갈비'},
+    'chuck_roll': {'kr_col': '척아이롤_냉동_미국산', 'us_pattern': 'Chuck',   'import_col': '부위별_목심_합계', 'stock_part': '목심'},
+    'brisket':    {'kr_col': '양지_냉장_미국산',     'us_pattern': 'Brisket', 'import_col': '부위별_양지_합계', 'stock_part': '양지'},
+}
+
+SOURCE_FILES = [MANUAL_KOR_PRICE_CSV, PROCESSED_USDA_COST_CSV, EXCHANGE_RATE_XLSX, MASTER_IMPORT_VOLUME_CSV, BEEF_STOCK_XLSX]
+
+_memory_cache = {}
+
+
+# ======================================================
+# [캐시 키] 원천 파일 내용 해시
+# ======================================================
+def _file_digest(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def input_version():
+    """원천 파일 내용 + 부위 매핑 + 저장소 버전으로 만든 캐시 키."""
+    h = hashlib.sha1(f"v{FEATURE_STORE_VERSION}".encode())
+    h.update(json.dumps(PART_SPECS, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+    for path in SOURCE_FILES:
+        h.update(Path(path).name.encode('utf-8'))
+        h.update(_file_digest(path).encode() if Path(path).exists() else b'missing')
+    return h.hexdigest()[:16]
+
+
+# ======================================================
+# [기본 패널] 원천 → 부위별 월별 패널
+# ======================================================
+def process_daily_to_monthly(df, date_col, value_col, target_col_name):
+    df_monthly = df.set_index(date_col).resample('MS')[value_col].mean().to_frame()
+    df_monthly.columns = [target_col_name]
+    return df_monthly
+
+
+def _to_number(series):
+    if series.dtype == 'object' or pd.api.types.is_string_dtype(series):
+        return series.astype(str).str.replace(',', '').astype(float)
+    return series
+
+
+def build_monthly_panel():
+    """
+    전 부위의 월별 기본 패널을 만든다 (long 형식: part + date + BASE_COLS).
+    부위별 계산은 기존 feature_engineering.py의 원천 병합 로직과 같다.
+    """
+    df_exchange = pd.read_excel(EXCHANGE_RATE_XLSX, parse_dates=['Date'])
+    df_exchange_m = process_daily_to_monthly(df_exchange, 'Date', 'Close', 'exchange_rate')
+
+    df_kr_price = pd.read_csv(MANUAL_KOR_PRICE_CSV)
+    df_kr_price['date'] = pd.to_datetime(df_kr_price['날짜'], format='%b-%y')
+    df_kr_price = df_kr_price.set_index('date')
+
+    df_us_price = pd.read_csv(PROCESSED_USDA_COST_CSV, parse_dates=['Date'], low_memory=False,
+                              usecols=['Date', 'item_description', 'weighted_average_USD_kg'])
+
+    df_import = pd.read_csv(MASTER_IMPORT_VOLUME_CSV)
+    df_import['date'] = pd.to_datetime(df_import['std_date'] + '-01')
+    df_import_m = df_import.groupby('date').sum(numeric_only=True)
+
+    df_stock = pd.read_excel(BEEF_STOCK_XLSX)
+    df_stock['date'] = pd.to_datetime(df_stock['기준년월'] + '-01')
+
+    frames = []
+    for part, spec in PART_SPECS.items():
+        if spec['kr_col'] not in df_kr_price.columns or spec['import_col'] not in df_import_m.columns:
+            print(f"[경고] '{part}' 원천 컬럼이 없어 건너뜁니다.")
+            continue
+
+        df_kr_price_m = _to_number(df_kr_price[spec['kr_col']]).to_frame(name='kr_price')
+
+        us_mask = df_us_price['item_description'].str.contains(spec['us_pattern'], case=False, na=False)
+        df_us_price_m = process_daily_to_monthly(df_us_price[us_mask], 'Date', 'weighted_average_USD_kg', 'us_price')
+
+        df_stock_part = df_stock[df_stock['부위별 부위별'].str.contains(spec['stock_part'], na=False)]
+        df_stock_m = df_stock_part.groupby('date')['조사재고량 조사재고량'].sum().to_frame(name='stock')
+
+        df_merged = pd.concat([
+            df_kr_price_m, df_us_price_m, df_exchange_m,
+            df_import_m[[spec['import_col']]].rename(columns={spec['import_col']: 'import_vol'}), df_stock_m
+        ], axis=1).sort_index()
+        df_merged = df_merged[df_merged.index >= PANEL_START].interpolate(method='linear')
+
+        df_merged.index.name = 'date'
+        frames.append(df_merged[BASE_COLS].reset_index().assign(part=part))
+
+    return pd.concat(frames, ignore_index=True)[['part', 'date'] + BASE_COLS]
+
+
+def load_monthly_panel(refresh=False):
+    """
+    캐시된 전 부위 월별 패널을 반환한다.
+    원천 해시가 같은 캐시 파일이 있으면 그대로 읽고, 없으면 새로 만들어 저장한다 (이전 버전 캐시는 삭제).
+    """
+    version = input_version()
+    if not refresh and version in _memory_cache:
+        return _memory_cache[version]
+
+    cache_path = Path(FEATURE_STORE_DIR) / f"monthly_panel_{version}.parquet"
+    panel = None if refresh else read_table(cache_path)
+    if panel is None:
+        panel = build_monthly_panel()
+        write_table(panel, cache_path, lock=False)     # 버전별 파일명 → 잠금 불필요
+        for old in Path(FEATURE_STORE_DIR).glob("monthly_panel_*.parquet"):
+            if old != cache_path:
+                os.remove(old)
+        print(f"[피처 저장소] 월별 패널 생성 ({panel['part'].nunique()}개 부위, 버전 {version})")
+
+    _memory_cache.clear()
+    _memory_cache[version] = panel
+    return panel
+
+
+def get_base_panel(part='rib'):
+    """단일 부위의 월별 기본 패널 (DatetimeIndex, BASE_COLS)."""
+    if part not in PART_SPECS:
+        raise KeyError(f"정의되지 않은 부위: {part} (사용 가능: {', '.join(PART_SPECS)})")
+    panel = load_monthly_panel()
+    df = panel[panel['part'] == part].set_index('date')[BASE_COLS]
+    df.index.name = None
+    return df
+
+
+# ======================================================
+# [피처 세트] 요청 시점에 계산
+# ======================================================
+def add_common_features(df):
+    """수입량·재고 MoM/YoY, 재고 3개월 평균, 마진 스프레드, 미국가·환율 1~3개월 lag."""
+    df = df.copy()
+
+    df['import_vol_mom'] = df['import_vol'].pct_change(periods=1)
+    df['import_vol_yoy'] = df['import_vol'].pct_change(periods=12)
+    df['stock_mom'] = df['stock'].pct_change(periods=1)
+    df['stock_yoy'] = df['stock'].pct_change(periods=12)
+
+    df['stock_ma_3'] = df['stock'].rolling(window=3).mean()
+
+    df['margin_spread'] = df['kr_price'] - (df['us_price'] * df['exchange_rate'])
+
+    for lag in [1, 2, 3]:
+        df[f'us_price_lag_{lag}'] = df['us_price'].shift(lag)
+        df[f'exchange_rate_lag_{lag}'] = df['exchange_rate'].shift(lag)
+    return df
+
+
+def add_delta_targets(df):
+    """1·2개월 뒤 가격(참고용)과 가격 증감액(Delta) 타겟."""
+    df['kr_price_lead_1'] = df['kr_price'].shift(-1)
+    df['kr_price_lead_2'] = df['kr_price'].shift(-2)
+
+    # (다음 달 가격) - (이번 달 가격)
+    df['kr_price_diff_lead_1'] = df['kr_price_lead_1'] - df['kr_price']
+    df['kr_price_diff_lead_2'] = df['kr_price_lead_2'] - df['kr_price']
+    return df
+
+
+def add_rolling_targets(df, horizon=6):
+    """향후 1~horizon개월 가격, 그 최고가, (최고가 - 현재가) 최대 상승 기대폭 타겟."""
+    lead_cols = []
+    for i in range(1, horizon + 1):
+        col_name = f'kr_price_lead_{i}'
+        df[col_name] = df['kr_price'].shift(-i)
+        lead_cols.append(col_name)
+
+    df[f'kr_price_max_{horizon}m'] = df[lead_cols].max(axis=1)
+    df[f'target_max_diff_{horizon}m'] = df[f'kr_price_max_{horizon}m'] - df['kr_price']
+    return df
+
+
+FEATURE_SETS = {
+    'delta': lambda base, horizon: add_delta_targets(add_common_features(base)),
+    'rolling': lambda base, horizon: add_rolling_targets(add_common_features(base), horizon),
+}
+
+
+def load_features(part='rib', feature_set='delta', horizon=6, dropna=True):
+    """
+    부위·피처 세트별 학습용 프레임을 반환한다.
+    dropna=True이면 lag/lead 계산으로 비는 행을 제거한다 (기존 ml_features_*.csv와 같음).
+    """
+    if feature_set not in FEATURE_SETS:
+        raise KeyError(f"정의되지 않은 피처 세트: {feature_set} (사용 가능: {', '.join(FEATURE_SETS)})")
+    df = FEATURE_SETS[feature_set](get_base_panel(part), horizon)
+    return df.dropna() if dropna else df
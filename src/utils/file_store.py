@@ -0,0 +1,293 @@
+import csv
+import hashlib
+import io
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from config import PROJECT_ROOT, LOCK_DIR
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+# [파일 정의서]
+# - 파일명: file_store.py
+# - 역할: 공통 (공유 데이터 파일 저장소 헬퍼)
+# - 대상: 공통 (수집기·전처리·모델 배치가 쓰고 대시보드가 읽는 CSV / 엑셀 / Parquet)
+# - 주요 기능: 쓰는 도중의 잘린 파일을 읽거나, 두 수집기가 같은 마스터 파일을 동시에 덮어쓰는 경합 방지
+#   1. atomic_replace: 같은 폴더 임시 파일에 쓰고 fsync → os.replace 로 한 번에 교체 (읽는 쪽은 이전 파일 또는 새 파일만 봄)
+#      Windows에서 읽는 프로세스가 파일을 잡고 있어 교체가 거부되면 잠시 후 재시도
+#   2. file_lock: 쓰는 쪽 권고(advisory) 잠금 — Windows는 msvcrt, 그 외는 fcntl.flock
+#      잠금 파일은 data/.locks/ 에 모아 두고, 같은 스레드 안에서는 중첩 획득 가능 (읽기-병합-저장 구간 전체를 감싼 뒤 write_* 호출)
+#   3. write_csv / write_excel: 잠금 + 원자적 교체 저장 (CSV 기본 utf-8-sig, 인덱스 미포함)
+#      append_csv: 잠금 후 뒤에 추가만 할 때는 제자리 추가(복사 없음), 마지막 N행을 교체할 때는 임시 파일 + 원자적 교체
+#      → 제자리 추가 도중에 읽는 쪽은 마지막 행이 덜 쓰인 파일을 볼 수 있음 (크기가 바뀌므로 dashboard_data 캐시는 다음 조회에서 다시 읽음)
+#        프로세스가 추가 도중 끝나면 마지막 행이 잘린 채 남으므로, 이어 쓰기 전에 csv_tail_complete로 확인
+#   4. read_snapshot: 파일을 한 번 열어 그 핸들의 (수정 시각 ns, 크기)를 버전으로 함께 반환 → 읽은 내용과 버전이 항상 일치
+# - 사용 예시:
+#     with file_lock(MASTER_IMPORT_VOLUME_CSV):
+#         df = pd.read_csv(...); ...병합...
+#         write_csv(df, MASTER_IMPORT_VOLUME_CSV)
+
+LOCK_TIMEOUT = 600          # 초, 다른 수집기가 같은 파일을 쓰는 동안 기다리는 최대 시간
+LOCK_POLL = 0.2
+REPLACE_RETRIES = 20        # Windows 공유 위반 시 교체 재시도 횟수 (REPLACE_WAIT 간격)
+REPLACE_WAIT = 0.1
+
+_held = threading.local()   # 스레드별 {잠금 파일 경로: (파일 핸들, 중첩 횟수)}
+
+
+def _lock_path(path):
+    """대상 파일 → data/.locks/ 아래 잠금 파일 경로 (프로젝트 상대 경로 기반 이름)."""
+    path = Path(path).resolve()
+    try:
+        name = '__'.join(path.relative_to(PROJECT_ROOT).parts)
+    except ValueError:
+        name = f"{path.name}-{hashlib.sha1(str(path).encode('utf-8')).hexdigest()[:12]}"
+    return Path(LOCK_DIR) / f"{name}.lock"
+
+
+def _try_lock(f):
+    try:
+        if os.name == 'nt':
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(f):
+    if os.name == 'nt':
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path, timeout=LOCK_TIMEOUT):
+    """
+    대상 파일의 쓰기 잠금 (프로세스 간 권고 잠금). timeout초 안에 못 얻으면 TimeoutError.
+    같은 스레드에서 이미 잡은 잠금은 다시 기다리지 않고 중첩 횟수만 늘림
+    """
+    lock_path = _lock_path(path)
+    held = getattr(_held, 'locks', None)
+    if held is None:
+        held = _held.locks = {}
+    key = str(lock_path)
+    if key in held:
+        f, depth = held[key]
+        held[key] = (f, depth + 1)
+        try:
+            yield
+        finally:
+            f, depth = held[key]
+            held[key] = (f, depth - 1)
+        return
+
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    f = open(lock_path, 'a+b')
+    deadline = time.monotonic() + timeout
+    while not _try_lock(f):
+        if time.monotonic() >= deadline:
+            f.close()
+            raise TimeoutError(f"파일 잠금 대기 시간 초과 ({timeout}초): {path}")
+        time.sleep(LOCK_POLL)
+
+    held[key] = (f, 1)
+    try:
+        yield
+    finally:
+        del held[key]
+        try:
+            _unlock(f)
+        finally:
+            f.close()
+
+
+def _fsync_path(path):
+    with open(path, 'rb+') as f:
+        os.fsync(f.fileno())
+
+
+def _fsync_dir(directory):
+    """POSIX: 이름 교체(rename)까지 디스크에 반영. Windows는 폴더 fsync 미지원이라 생략."""
+    if os.name == 'nt':
+        return
+    fd = os.open(str(directory), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _replace(src, dst):
+    for attempt in range(REPLACE_RETRIES):
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            # Windows: 대시보드 등 다른 프로세스가 대상 파일을 열고 있는 동안은 교체 불가
+            if os.name != 'nt' or attempt == REPLACE_RETRIES - 1:
+                raise
+            time.sleep(REPLACE_WAIT * (attempt + 1))
+
+
+@contextmanager
+def atomic_replace(path):
+    """
+    임시 파일 경로를 넘겨주고, 블록이 정상 종료되면 fsync 후 대상 파일과 원자적으로 교체.
+    예외가 나면 임시 파일만 지우고 기존 파일은 그대로 둠. 임시 파일은 대상과 같은 확장자(엑셀 엔진 판별용)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.stem}.{os.getpid()}-{threading.get_ident()}.tmp{path.suffix}")
+    try:
+        yield tmp_path
+        _fsync_path(tmp_path)
+        _replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    _fsync_dir(path.parent)
+
+
+def write_csv(df, path, lock=True, **kwargs):
+    """DataFrame을 CSV로 원자적 저장 (기본 index=False, encoding='utf-8-sig')."""
+    kwargs.setdefault('index', False)
+    kwargs.setdefault('encoding', 'utf-8-sig')
+    with (file_lock(path) if lock else nullcontext()), atomic_replace(path) as tmp_path:
+        df.to_csv(str(tmp_path), **kwargs)
+
+
+def write_excel(df, path, lock=True, **kwargs):
+    """DataFrame을 엑셀로 원자적 저장 (기본 index=False)."""
+    kwargs.setdefault('index', False)
+    with (file_lock(path) if lock else nullcontext()), atomic_replace(path) as tmp_path:
+        df.to_excel(str(tmp_path), **kwargs)
+
+
+def _tail_offset(f, n_rows, chunk_size=1 << 16):
+    """파일 끝에서 n_rows줄을 뺀 위치(바이트). 줄 수가 모자라면 None. 따옴표 안 줄바꿈은 없다고 가정."""
+    size = f.seek(0, os.SEEK_END)
+    if n_rows == 0:
+        return size
+    f.seek(size - 1)
+    # 마지막 줄에 줄바꿈이 없으면 그 줄도 한 행으로 셈
+    needed = n_rows + 1 if f.read(1) == b'\n' else n_rows
+    pos = size
+    while pos > 0:
+        start = max(0, pos - chunk_size)
+        f.seek(start)
+        chunk = f.read(pos - start)
+        end = len(chunk)
+        while True:
+            i = chunk.rfind(b'\n', 0, end)
+            if i < 0:
+                break
+            needed -= 1
+            if needed == 0:
+                return start + i + 1
+            end = i
+        pos = start
+    return None
+
+
+def _copy_prefix(src, dst, n_bytes, chunk_size=1 << 20):
+    while n_bytes > 0:
+        chunk = src.read(min(chunk_size, n_bytes))
+        if not chunk:
+            break
+        dst.write(chunk)
+        n_bytes -= len(chunk)
+
+
+def append_csv(df, path, drop_last=0, **kwargs):
+    """
+    기존 CSV 뒤에 행 추가 (헤더 없이, 기본 utf-8 — BOM은 파일 처음에만 있음). 파일이 없으면 헤더 포함 새로 저장.
+    - drop_last=0: 제자리 추가 (복사 없음). Python 예외로 실패하면 원래 크기로 되돌림
+    - drop_last>0: 파일 끝 데이터 행 수만큼 빼고 남길 앞부분 + 새 행을 임시 파일에 쓴 뒤 원자적 교체
+      (공유 파일에서 행이 잘린 상태가 읽는 쪽에 보이지 않도록). 잘라낼 행이 모자라면 ValueError
+    """
+    kwargs.setdefault('index', False)
+    with file_lock(path):
+        if not Path(path).exists():
+            kwargs.setdefault('encoding', 'utf-8-sig')
+            write_csv(df, path, **kwargs)
+            return
+        encoding = kwargs.pop('encoding', 'utf-8')
+        buf = io.StringIO()
+        df.to_csv(buf, header=False, **kwargs)
+        data = buf.getvalue().encode(encoding)
+
+        if drop_last:
+            with open(path, 'rb') as src:
+                offset = _tail_offset(src, drop_last)
+                if offset is None:
+                    raise ValueError(f"잘라낼 행({drop_last}행)이 파일보다 많습니다: {path}")
+                src.seek(0)
+                with atomic_replace(path) as tmp_path, open(tmp_path, 'wb') as dst:
+                    _copy_prefix(src, dst, offset)
+                    dst.write(data)
+            return
+
+        with open(path, 'r+b') as f:
+            original_size = f.seek(0, os.SEEK_END)
+            try:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            except BaseException:
+                f.truncate(original_size)
+                raise
+
+
+def csv_tail_complete(path, n_cols):
+    """
+    CSV가 줄바꿈으로 끝나고 마지막 행의 필드 수가 n_cols인지 확인.
+    제자리 추가가 중간에 끊긴(프로세스 종료·정전) 파일을 이어 쓰기 전에 걸러내는 용도
+    """
+    with open(path, 'rb') as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return False
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b'\n':
+            return False
+    line = read_csv_tail_line(path, 1)
+    if line is None:
+        return False
+    fields = next(csv.reader([line.rstrip('\r\n')]), [])
+    return len(fields) == n_cols
+
+
+def read_csv_tail_line(path, n_rows):
+    """파일 끝에서 n_rows번째 데이터 행의 원문(문자열). 자르기 전 위치 확인용, 없으면 None."""
+    with open(path, 'rb') as f:
+        offset = _tail_offset(f, n_rows)
+        if offset is None:
+            return None
+        f.seek(offset)
+        return f.readline().decode('utf-8-sig', errors='replace')
+
+
+def read_snapshot(path, reader):
+    """
+    파일을 한 번 열어 reader(바이너리 핸들)로 읽고 ((수정 시각 ns, 크기), 결과)를 반환. 파일이 없으면 (None, None).
+    버전은 실제로 연 파일 핸들 기준이라, 읽는 도중 교체되어도 내용과 버전이 어긋나지 않음
+    """
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None, None
+    with f:
+        stat = os.fstat(f.fileno())
+        return (stat.st_mtime_ns, stat.st_size), reader(f)
@@ -0,0 +1,79 @@
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from config import DASHBOARD_READY_CSV, HOME_SUMMARY_CSV, ensure_dirs
+from utils.file_store import write_csv
+
+# [파일 정의서]
+# - 파일명: home_summary.py
+# - 역할: 가공 (대시보드 요약 테이블)
+# - 대상: 수입육 (dashboard_ready_data의 전 부위, 브랜드 통합 평균가)
+# - 데이터 소스: data/2_dashboard/dashboard_ready_data.csv
+# - 수집/가공 주기: 일단위 (preprocess_meat_data.py 저장 직후 함께 갱신)
+# - 주요 기능: Home 화면 '부위별 시세 변동 요약'을 미리 계산하여 data/2_dashboard/home_part_summary.csv 로 저장
+#   1. 날짜 × 부위 평균가 행렬을 한 번 만들고, 기준일·3/6/12개월 전 ±WINDOW_DAYS일 구간만 잘라 전 부위를 한 번에 집계
+#   2. 현재가: 기준일 이전 WINDOW_DAYS일 이내 마지막 유효 가격 (0·결측 제외)
+#   3. 6개월 전 대비 하락폭이 큰 순서로 정렬하여 저장 → Home.py는 읽어서 스타일만 적용
+# - 실행 예시:
+#     python src/utils/home_summary.py
+
+WINDOW_DAYS = 7
+LOOKBACK_DAYS = {'3m': 90, '6m': 180, '12m': 365}
+
+SUMMARY_COLS = [
+    'part', 'base_date', 'current_price',
+    'price_3m', 'price_6m', 'price_12m', 'pct_3m', 'pct_6m', 'pct_12m',
+]
+
+
+def build_part_summary(df):
+    """
+    일별 long 시세(date, part, wholesale_price) → 부위별 요약 DataFrame[SUMMARY_COLS].
+    기준일은 전체 데이터의 마지막 날짜.
+    """
+    if df.empty:
+        return pd.DataFrame(columns=SUMMARY_COLS)
+
+    # 날짜 × 부위 브랜드 통합 평균가 (정렬된 날짜 인덱스 → 구간 슬라이스는 이진 탐색)
+    wide = df.groupby(['date', 'part'])['wholesale_price'].mean().unstack('part').sort_index()
+    latest_date = wide.index.max()
+    window = pd.Timedelta(days=WINDOW_DAYS)
+
+    recent = wide.loc[latest_date - window:latest_date]
+    current = recent.where(recent.ne(0)).ffill().iloc[-1]
+
+    summary = pd.DataFrame({'current_price': current})
+    for label, days in LOOKBACK_DAYS.items():
+        target = latest_date - pd.Timedelta(days=days)
+        past = wide.loc[target - window:target + window].mean()
+        summary[f'price_{label}'] = past
+        summary[f'pct_{label}'] = (current - past) / past.where(past.ne(0)) * 100
+
+    summary = summary[summary['current_price'].notna()]
+    summary = summary.sort_values('pct_6m', key=lambda s: s.fillna(0), kind='stable')
+    summary.index.name = 'part'
+    summary['base_date'] = latest_date.strftime('%Y-%m-%d')
+    return summary.reset_index()[SUMMARY_COLS]
+
+
+def save_part_summary(df=None):
+    """dashboard_ready_data(또는 넘겨받은 프레임)로 요약 테이블을 만들어 저장."""
+    if df is None:
+        if not DASHBOARD_READY_CSV.exists():
+            print(f"[Error] File not found: {DASHBOARD_READY_CSV}")
+            return None
+        df = pd.read_csv(str(DASHBOARD_READY_CSV), usecols=['date', 'part', 'wholesale_price'], encoding='utf-8-sig')
+    df = df.assign(date=pd.to_datetime(df['date']))
+
+    summary = build_part_summary(df)
+    ensure_dirs()
+    write_csv(summary, HOME_SUMMARY_CSV)
+    print(f"Home 부위별 요약 저장: {HOME_SUMMARY_CSV} ({len(summary)}개 부위)")
+    return summary
+
+
+if __name__ == "__main__":
+    if save_part_summary() is None:
+        raise SystemExit(1)
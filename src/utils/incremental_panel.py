@@ -0,0 +1,145 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from utils.dense_panel import SERIES_KEYS, FFILL_LIMIT, MA_WINDOWS, enrich_price_panel
+
+# [파일 정의서]
+# - 파일명: incremental_panel.py
+# - 역할: 가공 (증분 재계산)
+# - 대상: 공통 (country × part × brand 일별 시세)
+# - 주요 기능: 보간·이동평균이 계산된 전체 시계열(가공 저장소)에 대해
+#              마지막 처리일(watermark) 이후 새 시세가 들어온 시계열만 최근 구간을 다시 계산하여 반영
+#              1. 시계열별 영향 시작일 = 직전 마지막 거래일 다음 날 (신규 시계열은 첫 거래일)
+#              2. 영향 시작일 이전 CONTEXT_DAYS일만 다시 읽어 dense 엔진으로 계산 (ffill 7일 + ma30 30일)
+#              3. 전체 기간 최저/최고가는 저장된 값과 새 구간 값을 비교해 갱신 (전체 이력 재계산 없음)
+#              4. watermark 이하 입력이 바뀌었는지 지문(fingerprint)으로 확인 → 바뀌었으면 전체 재계산 필요
+#
+# 이동평균 원소 t는 [t-29, t] 구간의 보간값, 보간값 s는 [s-7, s] 구간의 관측값에만 의존하므로
+# 영향 시작일 이전 29 + 7일이면 전체 재계산과 같은 값이 나옴
+
+CONTEXT_DAYS = max(w for w, _ in MA_WINDOWS.values()) - 1 + FFILL_LIMIT
+VERIFY_RTOL = 1e-9    # 이동평균은 계산 구간 시작점에 따라 부동소수점 끝자리가 달라질 수 있음
+NUMERIC_COLS = ['wholesale_price', 'ma7', 'ma30', 'min_total', 'max_total']
+
+
+def input_fingerprint(daily, watermark):
+    """watermark 이하 일별 시세 행의 순서 무관 지문 (행 해시의 합)."""
+    past = daily.loc[daily['date'] <= watermark, ['date'] + SERIES_KEYS + ['wholesale_price']]
+    hashes = pd.util.hash_pandas_object(past, index=False).to_numpy()
+    return int(hashes.sum(dtype=np.uint64)), len(past)
+
+
+def load_state(path):
+    if not Path(path).exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        print("[경고] 증분 상태 파일을 읽을 수 없어 전체 재계산합니다.")
+        return None
+
+
+def save_state(daily, path):
+    """현재 입력의 마지막 일자와 지문을 저장 (임시 파일에 쓴 뒤 교체)."""
+    watermark = daily['date'].max()
+    fingerprint, rows = input_fingerprint(daily, watermark)
+    state = {
+        'watermark': watermark.strftime('%Y-%m-%d'),
+        'fingerprint': str(fingerprint),
+        'rows': rows,
+        'updated_at': datetime.now().isoformat(timespec='seconds'),
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+
+def check_state(daily, state):
+    """
+    저장 상태로 증분 처리가 가능한지 확인한다.
+    가능하면 watermark(Timestamp)를, 불가능하면 (None, 사유)를 반환한다.
+    """
+    if state is None:
+        return None, "증분 상태 없음"
+    watermark = pd.Timestamp(state['watermark'])
+    fingerprint, rows = input_fingerprint(daily, watermark)
+    if rows != state['rows'] or str(fingerprint) != state['fingerprint']:
+        return None, f"{state['watermark']} 이전 입력 변경 (행 {state['rows']} → {rows})"
+    return watermark, None
+
+
+def update_enriched(store, daily, watermark):
+    """
+    가공 저장소(store)에 watermark 이후 새 시세를 반영한 새 프레임과 갱신된 시계열 수를 반환한다.
+    행 순서(country, part, brand, date)와 컬럼은 enrich_price_panel 결과와 같다.
+    """
+    new_obs = daily[daily['date'] > watermark]
+    if new_obs.empty:
+        return store, 0
+
+    # 1. 시계열별 영향 시작일 / 계산 구간 시작일
+    touched = new_obs.groupby(SERIES_KEYS, as_index=False)['date'].min().rename(columns={'date': 'first_new'})
+    last_old = store.groupby(SERIES_KEYS, as_index=False)['date'].max().rename(columns={'date': 'last_old'})
+    touched = touched.merge(last_old, on=SERIES_KEYS, how='left')
+    touched['affected_start'] = (touched['last_old'] + pd.Timedelta(days=1)).fillna(touched['first_new'])
+    touched['ctx_start'] = touched['affected_start'] - pd.Timedelta(days=CONTEXT_DAYS)
+
+    # 2. 최근 구간만 dense 엔진으로 재계산
+    window = daily.merge(touched[SERIES_KEYS + ['ctx_start']], on=SERIES_KEYS)
+    window = window.loc[window['date'] >= window['ctx_start'], daily.columns]
+    fresh = enrich_price_panel(window)
+    fresh = fresh.merge(touched[SERIES_KEYS + ['affected_start']], on=SERIES_KEYS)
+    fresh = fresh.loc[fresh['date'] >= fresh['affected_start']].drop(columns='affected_start')
+
+    # 3. 전체 기간 최저/최고가: 저장값과 새 구간 값 중 작은/큰 값
+    stats = fresh.groupby(SERIES_KEYS)['wholesale_price'].agg(['min', 'max'])
+    old = store.groupby(SERIES_KEYS)[['min_total', 'max_total']].first()
+    stats = stats.join(old, how='left')
+    stats['min_total'] = np.fmin(stats['min'], stats['min_total'])
+    stats['max_total'] = np.fmax(stats['max'], stats['max_total'])
+
+    # 4. 영향 구간 교체 후 최저/최고가 반영
+    cutoff = store.merge(touched[SERIES_KEYS + ['affected_start']], on=SERIES_KEYS, how='left')['affected_start']
+    kept = store.loc[~(store['date'] >= cutoff).to_numpy()]
+    combined = pd.concat([kept, fresh[store.columns]], ignore_index=True)
+
+    totals = combined[SERIES_KEYS].merge(
+        stats[['min_total', 'max_total']].reset_index(), on=SERIES_KEYS, how='left'
+    )
+    is_touched = totals['min_total'].notna().to_numpy()
+    combined.loc[is_touched, 'min_total'] = totals.loc[is_touched, 'min_total'].to_numpy()
+    combined.loc[is_touched, 'max_total'] = totals.loc[is_touched, 'max_total'].to_numpy()
+
+    combined = combined.sort_values(SERIES_KEYS + ['date'], kind='stable').reset_index(drop=True)
+    return combined, len(touched)
+
+
+def verify_enriched(store, daily):
+    """
+    증분 결과를 전체 재계산과 비교한다. 일치하면 None, 다르면 차이 설명 문자열을 반환한다.
+    키·일자·category는 정확히, 수치 컬럼은 VERIFY_RTOL 이내로 비교한다.
+    """
+    full = enrich_price_panel(daily)
+    if len(full) != len(store):
+        return f"행 수 불일치 (증분 {len(store)} / 전체 {len(full)})"
+
+    left = store.reset_index(drop=True)
+    right = full[store.columns].reset_index(drop=True)
+    for col in SERIES_KEYS + ['date', 'category']:
+        if not left[col].equals(right[col]):
+            return f"'{col}' 컬럼 불일치"
+    for col in NUMERIC_COLS:
+        a = left[col].to_numpy(dtype='float64')
+        b = right[col].to_numpy(dtype='float64')
+        if not np.allclose(a, b, rtol=VERIFY_RTOL, atol=0, equal_nan=True):
+            bad = int((~np.isclose(a, b, rtol=VERIFY_RTOL, atol=0, equal_nan=True)).sum())
+            return f"'{col}' 값 불일치 {bad}건"
+    return None
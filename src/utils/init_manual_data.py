@@ -5,6 +5,7 @@ from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import MANUAL_KOR_PRICE_CSV, ensure_dirs
+from utils.file_store import write_csv
 
 # [파일 정의서]
 # - 파일명: init_manual_data.py
@@ -29,7 +30,7 @@ def create_manual_data():
     df_manual = pd.DataFrame(manual_data)
     
     ensure_dirs()
-    df_manual.to_csv(str(OUTPUT_FILE), index=False, encoding='utf-8-sig')
+    write_csv(df_manual, OUTPUT_FILE)
     print(f"[완료] 수기 데이터 파일이 생성되었습니다. (저장 위치: {OUTPUT_FILE})")
     print(" - 향후 과거 데이터가 발굴되면 이 CSV 파일을 직접 열어서 행을 추가하시면 됩니다.")
 
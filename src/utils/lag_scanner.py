@@ -0,0 +1,230 @@
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from config import LAG_SCAN_DIR, PROCESSED_USDA_COST_CSV, DASHBOARD_READY_CSV
+from utils.columnar_store import read_table, write_table
+from utils.series_panel import weekly_price_matrix
+
+# [파일 정의서]
+# - 파일명: lag_scanner.py
+# - 역할: 분석 (시차 상관 엔진)
+# - 대상: 수입육 (USDA 단품 품목 × 미트박스 국가·부위 전 조합)
+# - 데이터 소스: PROCESSED_USDA_COST_CSV (USD/kg × 환율 = 원/kg), DASHBOARD_READY_CSV
+# - 주요 기능:
+#   1. 두 시계열 묶음(X: 미국 원가, Y: 한국 도매가)의 모든 쌍에 대해 시차별 피어슨 상관계수를 FFT 한 번으로 일괄 계산
+#      corr[lag] = corr(X[t - lag], Y[t]) → lag > 0 이면 미국 가격이 lag주 먼저 움직임
+#      결측은 쌍별로 둘 다 있는 주만 사용 (pandas shift().corr()와 같은 값)
+#   2. 주간 집계 + N주 이동평균 스무딩 후 전 쌍의 시차 곡선(long)과 최적 시차 순위표 생성
+#   3. 원천 파일 내용·분석 설정 해시별로 data/1_processed/lag_scan/에 Parquet 캐시
+# - 실행 예시:
+#     python src/utils/lag_scanner.py --max-lag 26 --top 20
+
+LAG_SCAN_VERSION = 1
+DEFAULT_MIN_LAG = 0
+DEFAULT_MAX_LAG = 26        # 주 (약 6개월)
+DEFAULT_SMOOTH = 4          # 주간 노이즈 제거용 이동평균 (주)
+MIN_OVERLAP = 26            # 겹치는 주가 이보다 적은 시차는 결측 처리 (짧은 구간의 우연한 고상관 제외)
+_FFT_BLOCK_CELLS = 4_000_000
+
+_memory_cache = {}
+
+
+# ======================================================
+# [엔진] FFT 기반 시차 상관
+# ======================================================
+def _as_matrix(a):
+    a = np.asarray(a, dtype=np.float64)
+    return a[:, None] if a.ndim == 1 else a
+
+
+def lag_correlations(X, Y, lags, min_overlap=MIN_OVERLAP):
+    """
+    X (T, n_x), Y (T, n_y) 의 모든 열 쌍에 대해 시차별 상관계수를 계산한다 (1차원 입력 허용, NaN 허용).
+    반환: (corr, n_overlap) 각각 (len(lags), n_x, n_y)
+    """
+    X, Y = _as_matrix(X), _as_matrix(Y)
+    lags = np.asarray(list(lags), dtype=int)
+
+    # 열별 표준화 (상관계수는 그대로, FFT 누적 오차만 줄어듦)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        X = (X - np.nanmean(X, axis=0)) / np.nanstd(X, axis=0)
+        Y = (Y - np.nanmean(Y, axis=0)) / np.nanstd(Y, axis=0)
+    mx, my = np.isfinite(X), np.isfinite(Y)
+    X0, Y0 = np.where(mx, X, 0.0), np.where(my, Y, 0.0)
+
+    n_t = len(X)
+    nfft = 1 << int(np.ceil(np.log2(max(2 * n_t, 2))))
+    idx = lags % nfft       # 음수 시차는 원형 버퍼 끝쪽 (0 패딩 덕분에 겹침 없음)
+
+    def spectrum(a):
+        return np.fft.rfft(a, nfft, axis=0)
+
+    FY, FY2, FMY = spectrum(Y0), spectrum(Y0 ** 2), spectrum(my.astype(np.float64))
+    n_x, n_y = X.shape[1], Y.shape[1]
+    corr = np.full((len(lags), n_x, n_y), np.nan)
+    overlap = np.zeros((len(lags), n_x, n_y), dtype=int)
+
+    # X 열을 묶음 단위로 처리해 (nfft × 묶음 × n_y) 중간 배열 크기를 제한
+    block = max(1, _FFT_BLOCK_CELLS // (nfft * max(n_y, 1)))
+    for start in range(0, n_x, block):
+        sl = slice(start, start + block)
+        FX, FX2, FMX = spectrum(X0[:, sl]), spectrum(X0[:, sl] ** 2), spectrum(mx[:, sl].astype(np.float64))
+
+        def lagged_sum(A, B):
+            """Σ_t a[t - lag] · b[t] (시차별)"""
+            return np.fft.irfft(np.conj(A)[:, :, None] * B[:, None, :], nfft, axis=0)[idx]
+
+        n = np.rint(lagged_sum(FMX, FMY))
+        sx, sy = lagged_sum(FX, FMY), lagged_sum(FMX, FY)
+        sxx, syy = lagged_sum(FX2, FMY), lagged_sum(FMX, FY2)
+        sxy = lagged_sum(FX, FY)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = sxy - sx * sy / n
+            var = (sxx - sx ** 2 / n) * (syy - sy ** 2 / n)
+            r = cov / np.sqrt(var)
+        r[(n < max(min_overlap, 2)) | ~(var > 1e-12 * n ** 2)] = np.nan
+        corr[:, sl, :] = np.clip(r, -1.0, 1.0)
+        overlap[:, sl, :] = n.astype(int)
+    return corr, overlap
+
+
+# ======================================================
+# [데이터] 주간 미국 원가 / 한국 도매가 행렬
+# ======================================================
+def load_us_weekly():
+    """USDA 품목별 주간 원/kg (weighted_average_USD_kg × Exchange_Rate), 열 = item_description."""
+    df = pd.read_csv(PROCESSED_USDA_COST_CSV, low_memory=False,
+                     usecols=['Date', 'item_description', 'weighted_average_USD_kg', 'Exchange_Rate'])
+    df['date'] = pd.to_datetime(df['Date'])
+    df['krw_kg'] = pd.to_numeric(df['weighted_average_USD_kg'], errors='coerce') * df['Exchange_Rate']
+    df = df.dropna(subset=['item_description', 'krw_kg'])
+    return (
+        df.groupby(['item_description', pd.Grouper(key='date', freq='W-SUN')])['krw_kg'].mean()
+        .unstack('item_description')
+        .sort_index(axis=1)
+    )
+
+
+def load_kr_weekly(countries=('미국',)):
+    """미트박스 국가·부위별 주간 도매가 (브랜드 통합), 열 = (country, part)."""
+    df = pd.read_csv(DASHBOARD_READY_CSV, usecols=['date', 'category', 'part', 'brand', 'wholesale_price'])
+    df['date'] = pd.to_datetime(df['date'])
+    if countries:
+        df = df[df['category'].isin(countries)]
+    weekly = weekly_price_matrix(df, by_brand_group=False)
+    return weekly.droplevel('brand_group', axis=1)
+
+
+def scan_lags(min_lag=DEFAULT_MIN_LAG, max_lag=DEFAULT_MAX_LAG, smooth=DEFAULT_SMOOTH, countries=('미국',)):
+    """
+    전 (USDA 품목 × 미트박스 국가·부위) 쌍의 시차 곡선.
+    반환: long DataFrame [us_item, country, part, lag, corr, n_overlap]
+    """
+    us, kr = load_us_weekly(), load_kr_weekly(countries)
+    dates = pd.date_range(min(us.index.min(), kr.index.min()), max(us.index.max(), kr.index.max()), freq='W-SUN')
+    us, kr = us.reindex(dates), kr.reindex(dates)
+    if smooth and smooth > 1:
+        us = us.rolling(smooth, min_periods=1).mean().where(us.ffill().notna() & us.bfill().notna())
+        kr = kr.rolling(smooth, min_periods=1).mean().where(kr.ffill().notna() & kr.bfill().notna())
+
+    lags = np.arange(min_lag, max_lag + 1)
+    corr, overlap = lag_correlations(us.to_numpy(), kr.to_numpy(), lags)
+
+    n_lag, n_us, n_kr = corr.shape
+    return pd.DataFrame({
+        'us_item': np.tile(np.repeat(us.columns.to_numpy(), n_kr), n_lag),
+        'country': np.tile(kr.columns.get_level_values('country').to_numpy(), n_lag * n_us),
+        'part': np.tile(kr.columns.get_level_values('part').to_numpy(), n_lag * n_us),
+        'lag': np.repeat(lags, n_us * n_kr),
+        'corr': corr.ravel(),
+        'n_overlap': overlap.ravel(),
+    })
+
+
+def rank_lags(curves):
+    """쌍별 최대 상관 시차 순위표 [us_item, country, part, best_lag, best_corr, corr_lag0, n_overlap]."""
+    valid = curves.dropna(subset=['corr'])
+    keys = ['us_item', 'country', 'part']
+    best = valid.loc[valid.groupby(keys)['corr'].idxmax()]
+    lag0 = curves[curves['lag'] == 0].set_index(keys)['corr'].rename('corr_lag0')
+    ranked = (
+        best.rename(columns={'lag': 'best_lag', 'corr': 'best_corr'})
+        .join(lag0, on=keys)
+        [keys + ['best_lag', 'best_corr', 'corr_lag0', 'n_overlap']]
+    )
+    return ranked.sort_values('best_corr', ascending=False).reset_index(drop=True)
+
+
+# ======================================================
+# [캐시] 원천 내용 + 설정 해시별 Parquet
+# ======================================================
+def _file_digest(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def scan_version(**params):
+    h = hashlib.sha1(f"v{LAG_SCAN_VERSION}".encode())
+    h.update(json.dumps(params, sort_keys=True, ensure_ascii=False, default=list).encode('utf-8'))
+    for path in (PROCESSED_USDA_COST_CSV, DASHBOARD_READY_CSV):
+        h.update(_file_digest(path).encode() if Path(path).exists() else b'missing')
+    return h.hexdigest()[:16]
+
+
+def load_lag_table(min_lag=DEFAULT_MIN_LAG, max_lag=DEFAULT_MAX_LAG, smooth=DEFAULT_SMOOTH,
+                   countries=('미국',), refresh=False):
+    """
+    캐시된 (시차 곡선, 순위표)를 반환한다. 원천·설정이 같은 캐시가 없으면 새로 계산해 저장한다.
+    """
+    params = {'min_lag': min_lag, 'max_lag': max_lag, 'smooth': smooth, 'countries': list(countries or [])}
+    version = scan_version(**params)
+    if not refresh and version in _memory_cache:
+        return _memory_cache[version]
+
+    curves_path = Path(LAG_SCAN_DIR) / f"lag_curves_{version}.parquet"
+    ranking_path = Path(LAG_SCAN_DIR) / f"lag_ranking_{version}.parquet"
+    curves = None if refresh else read_table(curves_path)
+    ranking = None if refresh else read_table(ranking_path)
+    if curves is None or ranking is None:
+        curves = scan_lags(min_lag, max_lag, smooth, countries)
+        ranking = rank_lags(curves)
+        write_table(curves, curves_path, lock=False)   # 버전별 파일명 → 잠금 불필요
+        write_table(ranking, ranking_path, lock=False)
+        for old in Path(LAG_SCAN_DIR).glob("lag_*.parquet"):
+            if old not in (curves_path, ranking_path):
+                os.remove(old)
+        print(f"[시차 분석] {len(ranking)}개 쌍 × {max_lag - min_lag + 1}개 시차 계산 (버전 {version})")
+
+    _memory_cache.clear()
+    _memory_cache[version] = (curves, ranking)
+    return curves, ranking
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="USDA 품목 × 미트박스 부위 시차 상관 순위표")
+    parser.add_argument("--min-lag", type=int, default=DEFAULT_MIN_LAG, help="최소 시차 (주, 음수면 한국이 선행)")
+    parser.add_argument("--max-lag", type=int, default=DEFAULT_MAX_LAG, help="최대 시차 (주)")
+    parser.add_argument("--smooth", type=int, default=DEFAULT_SMOOTH, help="이동평균 스무딩 (주, 1이면 미적용)")
+    parser.add_argument("--all-countries", action="store_true", help="미국산 외 국가 부위도 포함")
+    parser.add_argument("--refresh", action="store_true", help="캐시를 무시하고 다시 계산")
+    parser.add_argument("--top", type=int, default=20, help="출력할 상위 쌍 수")
+    args = parser.parse_args()
+
+    start = time.time()
+    _, ranking = load_lag_table(args.min_lag, args.max_lag, args.smooth,
+                                None if args.all_countries else ('미국',), args.refresh)
+    print(f"완료 ({time.time() - start:.2f}초)")
+    print(ranking.head(args.top).to_string(index=False))
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from config import PROCESSED_USDA_COST_CSV, DASHBOARD_READY_CSV, LANDED_COST_PAIRS_PARQUET, ensure_dirs
+from utils.columnar_store import write_table
+from utils.usda_mapping_index import UNMAPPED, map_descriptions
+
+# [파일 정의서]
+# - 파일명: landed_cost.py
+# - 역할: 가공 (한-미 비교 시계열)
+# - 대상: 수입육 (USDA 단품 품목 ↔ 미트박스 부위 매핑 쌍)
+# - 데이터 소스: PROCESSED_USDA_COST_CSV, DASHBOARD_READY_CSV, 매핑 인덱스(utils/usda_mapping_index.py)
+# - 수집/가공 주기: 일단위 (--full 파이프라인의 미트박스 전처리 뒤)
+# - 주요 기능: 매핑된 부위 쌍마다 미국 상륙 원가(원/kg)와 한국 도매가(원/kg)의 일별 시계열을
+#   data/2_dashboard/landed_cost_pairs.parquet 한 파일(long, 쌍·날짜 정렬)로 저장 → 백테스팅 화면은 쌍 하나만 조회
+#   1. 미국 원가 = weighted_average_USD_kg × Exchange_Rate, 같은 쌍에 여러 USDA 품목이 매핑되면 일별 평균
+#   2. 쌍 정의: 매핑 인덱스의 korean_name('부위-국가'), 매핑 규칙에 없는 기존 분석 쌍은 EXTRA_PAIRS (품목명 부분 문자열)
+#   3. 한국 도매가 = 해당 국가·부위 브랜드 통합 일별 평균 (dashboard_ready)
+#   4. 미국 원가는 보고일 사이(주말·휴일) 최대 US_FFILL_DAYS일까지 직전 값 유지, 한쪽이라도 값이 있는 날짜만 저장
+# - 실행 예시:
+#     python src/utils/landed_cost.py
+
+US_FFILL_DAYS = 7
+
+# (품목명에 포함될 문자열, 제외할 문자열, 쌍 이름) — 대소문자 무시
+EXTRA_PAIRS = [
+    ('short plate', 'skirt', '삼겹양지-미국'),     # 기존 백테스팅 기준 쌍 (Short Plate ↔ 삼겹양지)
+]
+
+PAIR_COLS = ['pair', 'kr_country', 'kr_part', 'us_items', 'date', 'us_cost_krw_kg', 'kr_price_krw_kg']
+
+
+def assign_pairs(descriptions):
+    """USDA 품목명 Series → 쌍 이름 Series (매핑 없으면 결측). 고유 품목명 단위로 한 번씩만 판정."""
+    uniques = pd.Series(pd.unique(descriptions.dropna()), dtype=object)
+    pairs = map_descriptions(uniques)['korean_name'].where(lambda s: s != UNMAPPED)
+    text = uniques.astype(str).str.lower()
+    for include, exclude, pair in EXTRA_PAIRS:
+        hit = text.str.contains(include, regex=False) & ~text.str.contains(exclude, regex=False)
+        pairs = pairs.where(~(hit & pairs.isna()), pair)
+    return descriptions.map(dict(zip(uniques, pairs)))
+
+
+def load_us_daily():
+    """쌍별 일별 미국 상륙 원가 (date × pair) 와 쌍별 USDA 품목명 목록."""
+    df = pd.read_csv(PROCESSED_USDA_COST_CSV, low_memory=False, encoding='utf-8-sig',
+                     usecols=['Date', 'item_description', 'weighted_average_USD_kg', 'Exchange_Rate'])
+    df['pair'] = assign_pairs(df['item_description'])
+    df = df[df['pair'].notna()]
+    df['date'] = pd.to_datetime(df['Date'])
+    df['krw_kg'] = pd.to_numeric(df['weighted_average_USD_kg'], errors='coerce') * df['Exchange_Rate']
+
+    items = df.groupby('pair')['item_description'].unique().map(lambda a: ' | '.join(sorted(a)))
+    daily = df.groupby(['date', 'pair'])['krw_kg'].mean().unstack('pair')
+    return daily, items
+
+
+def load_kr_daily():
+    """국가·부위별 일별 도매가 (date × (country, part), 브랜드 통합 평균)."""
+    df = pd.read_csv(DASHBOARD_READY_CSV, usecols=['date', 'category', 'part', 'wholesale_price'], encoding='utf-8-sig')
+    df['date'] = pd.to_datetime(df['date'])
+    return df.groupby(['date', 'category', 'part'])['wholesale_price'].mean().unstack(['category', 'part'])
+
+
+def build_pair_series(us_daily, us_items, kr_daily):
+    """
+    쌍별 일별 시계열 long DataFrame[PAIR_COLS] (pair, date 정렬).
+    한국 도매가 시계열이 없는 쌍은 제외.
+    """
+    pairs = [p for p in us_daily.columns if tuple(p.rsplit('-', 1)[::-1]) in kr_daily.columns]
+    if not pairs:
+        return pd.DataFrame(columns=PAIR_COLS)
+
+    calendar = pd.date_range(min(us_daily.index.min(), kr_daily.index.min()),
+                             max(us_daily.index.max(), kr_daily.index.max()), freq='D')
+    us = us_daily[pairs].reindex(calendar).ffill(limit=US_FFILL_DAYS)
+    kr = kr_daily.reindex(calendar)[[tuple(p.rsplit('-', 1)[::-1]) for p in pairs]]
+    kr.columns = pairs
+
+    long = pd.DataFrame({
+        'pair': np.repeat(pairs, len(calendar)),
+        'date': np.tile(calendar.to_numpy(), len(pairs)),
+        'us_cost_krw_kg': us.to_numpy().T.ravel(),
+        'kr_price_krw_kg': kr.to_numpy().T.ravel(),
+    })
+    long = long[long['us_cost_krw_kg'].notna() | long['kr_price_krw_kg'].notna()]
+    long[['kr_part', 'kr_country']] = long['pair'].str.rsplit('-', n=1, expand=True)
+    long['us_items'] = long['pair'].map(us_items)
+    long[['us_cost_krw_kg', 'kr_price_krw_kg']] = long[['us_cost_krw_kg', 'kr_price_krw_kg']].round(1)
+    return long[PAIR_COLS].reset_index(drop=True)
+
+
+def save_pair_series():
+    """원천 두 파일로 쌍별 시계열을 만들어 Parquet으로 저장. 원천이 없으면 None."""
+    for path in (PROCESSED_USDA_COST_CSV, DASHBOARD_READY_CSV):
+        if not Path(path).exists():
+            print(f"[Error] File not found: {path}")
+            return None
+
+    us_daily, us_items = load_us_daily()
+    series = build_pair_series(us_daily, us_items, load_kr_daily())
+    ensure_dirs()
+    write_table(series, LANDED_COST_PAIRS_PARQUET)
+    print(f"한-미 쌍별 일별 시계열 저장: {LANDED_COST_PAIRS_PARQUET} ({series['pair'].nunique()}개 쌍, {len(series)}행)")
+    return series
+
+
+if __name__ == "__main__":
+    if save_pair_series() is None:
+        raise SystemExit(1)
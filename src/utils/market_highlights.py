@@ -0,0 +1,91 @@
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from config import DASHBOARD_READY_CSV, MARKET_HIGHLIGHTS_CSV, ensure_dirs
+from utils.file_store import write_csv
+
+# [파일 정의서]
+# - 파일명: market_highlights.py
+# - 역할: 가공 (대시보드 요약 테이블)
+# - 대상: 수입육 (dashboard_ready_data의 국가 × 브랜드 × 부위 품목)
+# - 데이터 소스: data/2_dashboard/dashboard_ready_data.csv
+# - 수집/가공 주기: 일단위 (preprocess_meat_data.py 저장 직후 함께 갱신)
+# - 주요 기능: Price Dashboard 'Market Highlights'(12개월 최고/최저 대비 등락률)를 원산지 선택지별로 미리 계산하여
+#   data/2_dashboard/market_highlights.csv 로 저장
+#   1. 원산지 범위(scope: '전체' + 국가별)마다 기준일(범위 내 마지막 날짜)과 최근 1년 구간이 다르므로 범위별로 계산
+#   2. 품목별 마지막 거래일·현재가·12개월 최고/최저를 groupby 집계 한 번으로 산출 (품목별 반복 없음)
+#   3. 최근 ACTIVE_DAYS일 안에 거래가 없거나 행이 2개 미만인 품목은 제외
+# - 실행 예시:
+#     python src/utils/market_highlights.py
+
+ALL_SCOPE = '전체'
+ACTIVE_DAYS = 7
+LOOKBACK_DAYS = 365
+PRODUCT_KEYS = ['country', 'brand', 'part']
+
+HIGHLIGHT_COLS = [
+    'scope', 'country', 'brand', 'part', 'base_date', 'last_trade_date',
+    'current_price', 'max_12m', 'min_12m', 'drop_rate', 'rise_rate',
+]
+
+
+def build_highlights(df):
+    """
+    한 원산지 범위의 일별 시세(date, country, brand, part, wholesale_price) → 품목별 등락 DataFrame.
+    drop_rate = 현재가 / 12개월 최고 - 1, rise_rate = 현재가 / 12개월 최저 - 1 (비율)
+    """
+    if df.empty:
+        return pd.DataFrame(columns=HIGHLIGHT_COLS[1:])
+
+    latest_date = df['date'].max()
+    df_1y = df[df['date'] >= latest_date - pd.Timedelta(days=LOOKBACK_DAYS)]
+    traded = df_1y[df_1y['wholesale_price'].notna()]
+
+    stats = traded.groupby(PRODUCT_KEYS).agg(
+        last_trade_date=('date', 'max'),
+        max_12m=('wholesale_price', 'max'),
+        min_12m=('wholesale_price', 'min'),
+    )
+    stats['n_rows'] = df_1y.groupby(PRODUCT_KEYS).size()
+
+    # 현재가: 품목별 마지막 거래일 가격 (같은 날 여러 행이면 평균)
+    last_date = traded.join(stats['last_trade_date'], on=PRODUCT_KEYS)['last_trade_date']
+    stats['current_price'] = traded[traded['date'] == last_date].groupby(PRODUCT_KEYS)['wholesale_price'].mean()
+
+    stats = stats[(stats['n_rows'] >= 2) & (stats['last_trade_date'] >= latest_date - pd.Timedelta(days=ACTIVE_DAYS))]
+    stats['drop_rate'] = (stats['current_price'] / stats['max_12m'] - 1).where(stats['max_12m'] > 0, 0.0)
+    stats['rise_rate'] = (stats['current_price'] / stats['min_12m'] - 1).where(stats['min_12m'] > 0, 0.0)
+    stats['base_date'] = latest_date.strftime('%Y-%m-%d')
+    stats['last_trade_date'] = stats['last_trade_date'].dt.strftime('%Y-%m-%d')
+    return stats.reset_index()[HIGHLIGHT_COLS[1:]]
+
+
+def build_market_highlights(df):
+    """'전체' + 국가별 범위의 등락 테이블을 이어 붙인 DataFrame[HIGHLIGHT_COLS]."""
+    scopes = [(ALL_SCOPE, df)] + list(df.groupby('country', sort=True))
+    frames = [build_highlights(df_scope).assign(scope=scope) for scope, df_scope in scopes]
+    return pd.concat(frames, ignore_index=True)[HIGHLIGHT_COLS]
+
+
+def save_market_highlights(df=None):
+    """dashboard_ready_data(또는 넘겨받은 프레임)로 등락 테이블을 만들어 저장."""
+    if df is None:
+        if not DASHBOARD_READY_CSV.exists():
+            print(f"[Error] File not found: {DASHBOARD_READY_CSV}")
+            return None
+        df = pd.read_csv(str(DASHBOARD_READY_CSV), usecols=['date', 'category', 'part', 'brand', 'wholesale_price'],
+                         encoding='utf-8-sig')
+    df = df.rename(columns={'category': 'country'}).assign(date=lambda d: pd.to_datetime(d['date']))
+
+    highlights = build_market_highlights(df)
+    ensure_dirs()
+    write_csv(highlights, MARKET_HIGHLIGHTS_CSV)
+    print(f"Market Highlights 저장: {MARKET_HIGHLIGHTS_CSV} ({len(highlights)}행)")
+    return highlights
+
+
+if __name__ == "__main__":
+    if save_market_highlights() is None:
+        raise SystemExit(1)
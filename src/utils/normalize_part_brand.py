@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+# [파일 정의서]
+# - 파일명: normalize_part_brand.py
+# - 역할: 가공 (공통 정규화)
+# - 대상: 수입육 (미트박스 품목명)
+# - 주요 기능: '부위-원산지 | 브랜드(코드)' 형식의 품목명을 부위(part)와 브랜드(brand)로 분리
+#              전체 행이 아닌 고유 품목명(수천 개)에 대해서만 벡터화 문자열 연산을 수행한 뒤
+#              코드 배열로 원래 행에 되돌려, 이력이 늘어나도 비용이 고유 품목 수에만 비례하도록 함
+#
+# 분리 규칙 (기존 preprocess_meat_data.split_part_brand와 동일):
+#   - '|'가 있으면: part = 첫 조각의 '-' 앞부분, brand = 두 번째 조각 (양끝 공백 제거)
+#   - '|'가 없으면: part = 원래 품목명, brand = 원래 brand 값 유지
+
+
+def _parse_unique_names(names):
+    """고유 품목명 Series → (part, brand, '|' 포함 여부) 배열."""
+    has_pipe = names.str.contains('|', regex=False).to_numpy()
+    pieces = names.str.split('|')
+    part = pieces.str[0].str.split('-').str[0].str.strip().to_numpy(dtype=object)
+    brand = pieces.str[1].str.strip().to_numpy(dtype=object)
+    return part, brand, has_pipe
+
+
+def split_part_brand(part_name, brand=None):
+    """
+    품목명 Series를 part / brand 두 컬럼의 DataFrame으로 분리한다 (인덱스 유지).
+    brand가 주어지면 '|'가 없는 품목명의 brand 값으로 사용된다.
+    """
+    codes, uniques = pd.factorize(part_name.astype(str))
+    u_part, u_brand, u_has_pipe = _parse_unique_names(pd.Series(uniques, dtype=object))
+
+    # 결측 품목명(code -1)은 '|'가 없는 것으로 취급
+    has_pipe = (codes >= 0) & u_has_pipe[codes]
+
+    part = part_name.to_numpy(dtype=object).copy()
+    part[has_pipe] = u_part[codes[has_pipe]]
+
+    if brand is not None:
+        brand_out = brand.to_numpy(dtype=object).copy()
+    else:
+        brand_out = np.full(len(part_name), None, dtype=object)
+    brand_out[has_pipe] = u_brand[codes[has_pipe]]
+
+    return pd.DataFrame({'part': part, 'brand': brand_out}, index=part_name.index)
+
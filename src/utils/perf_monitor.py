@@ -0,0 +1,177 @@
+import functools
+import json
+import logging
+import threading
+import time
+from contextlib import ContextDecorator
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from config import DASHBOARD_PERF_LOG
+from utils import dashboard_data
+
+# [파일 정의서]
+# - 파일명: perf_monitor.py
+# - 역할: 공통 (대시보드 성능 계측)
+# - 대상: 공통 (Home.py, pages/*)
+# - 주요 기능: 페이지 실행(rerun) 한 번마다 구간별 소요 시간과 캐시 적중/미적중을 모아 표시·기록
+#   1. timed(구간, 단계): 컨텍스트 매니저 겸 데코레이터, 단계는 load / filter / aggregate / render
+#   2. cached: st.cache_data 대체 데코레이터 → 함수 본문이 실제로 실행되면 미적중, 아니면 적중으로 집계
+#      utils/dashboard_data.py 공유 캐시의 적중/미적중(실행 전후 차이)도 함께 집계
+#   3. URL에 ?debug=1 을 붙이면 사이드바에 계측 패널 표시 (평소에는 숨김)
+#   4. 실행마다 한 줄(JSON)씩 logs/dashboard_perf.log 에 기록 (1MB × 3개 순환) → 데이터 증가에 따른 회귀 추적
+# - 사용 예시:
+#     perf_monitor.start_page("01_Price_Dashboard")
+#     with perf_monitor.timed("Market Highlights 표", "render"): ...
+#     perf_monitor.finish_page()
+
+STAGES = ('load', 'filter', 'aggregate', 'render')
+DEBUG_PARAM = 'debug'
+LOG_MAX_BYTES = 1_000_000
+LOG_BACKUPS = 3
+
+_STATE_KEY = '_perf_monitor'
+_miss_flag = threading.local()
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def _new_state(page):
+    return {
+        'page': page,
+        'started': time.perf_counter(),
+        'records': [],                                  # (구간, 단계, ms)
+        'cache': {},                                    # 함수명 → [적중, 미적중]
+        'data_cache': dashboard_data.cache_stats(),     # 실행 시작 시점 공유 캐시 누적값
+    }
+
+
+def _state():
+    if _STATE_KEY not in st.session_state:
+        st.session_state[_STATE_KEY] = _new_state('unknown')
+    return st.session_state[_STATE_KEY]
+
+
+def start_page(page):
+    """페이지 스크립트 맨 앞에서 호출 → 이번 실행의 계측 초기화."""
+    st.session_state[_STATE_KEY] = _new_state(page)
+
+
+class timed(ContextDecorator):
+    """구간 소요 시간(ms)을 이번 실행 기록에 추가. with 블록 또는 함수 데코레이터로 사용."""
+
+    def __init__(self, section, stage='render'):
+        if stage not in STAGES:
+            raise ValueError(f"stage는 {STAGES} 중 하나여야 합니다: {stage}")
+        self.section = section
+        self.stage = stage
+        self._starts = []
+
+    def __enter__(self):
+        self._starts.append(time.perf_counter())
+        return self
+
+    def __exit__(self, *exc):
+        elapsed_ms = (time.perf_counter() - self._starts.pop()) * 1000
+        _state()['records'].append((self.section, self.stage, elapsed_ms))
+        return False
+
+
+def cached(func=None, **cache_kwargs):
+    """
+    st.cache_data + 적중/미적중 집계. @perf_monitor.cached 또는 @perf_monitor.cached(ttl=...) 로 사용.
+    캐시 키·무효화 규칙은 st.cache_data와 같음 (원래 함수 소스·인자 기준)
+    """
+    if func is None:
+        return lambda f: cached(f, **cache_kwargs)
+
+    @functools.wraps(func)
+    def _body(*args, **kwargs):
+        _miss_flag.hit = False      # 본문이 실행됨 = 캐시 미적중
+        return func(*args, **kwargs)
+
+    cached_body = st.cache_data(**cache_kwargs)(_body)
+
+    @functools.wraps(func)
+    def _call(*args, **kwargs):
+        _miss_flag.hit = True
+        result = cached_body(*args, **kwargs)
+        counts = _state()['cache'].setdefault(func.__name__, [0, 0])
+        counts[0 if _miss_flag.hit else 1] += 1
+        return result
+
+    _call.clear = cached_body.clear
+    return _call
+
+
+def debug_enabled():
+    """URL 쿼리 ?debug=1 (또는 true/on) 이면 True."""
+    return str(st.query_params.get(DEBUG_PARAM, '')).lower() in ('1', 'true', 'on')
+
+
+def _get_logger():
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            logger = logging.getLogger('dashboard_perf')
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            try:
+                Path(DASHBOARD_PERF_LOG).parent.mkdir(parents=True, exist_ok=True)
+                handler = RotatingFileHandler(DASHBOARD_PERF_LOG, maxBytes=LOG_MAX_BYTES,
+                                              backupCount=LOG_BACKUPS, encoding='utf-8')
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                logger.addHandler(handler)
+            except OSError as e:
+                # 읽기 전용 배포 환경 등: 기록 없이 패널만 사용
+                print(f"[perf_monitor] 로그 파일을 열 수 없습니다 ({DASHBOARD_PERF_LOG}): {e}")
+            _logger = logger
+    return _logger
+
+
+def _summary(state):
+    before = state['data_cache']
+    after = dashboard_data.cache_stats()
+    return {
+        'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'page': state['page'],
+        'total_ms': round((time.perf_counter() - state['started']) * 1000, 1),
+        'sections': [
+            {'section': name, 'stage': stage, 'ms': round(ms, 1)} for name, stage, ms in state['records']
+        ],
+        'cache': {name: {'hits': h, 'misses': m} for name, (h, m) in state['cache'].items()},
+        'data_cache': {k: after[k] - before.get(k, 0) for k in after},
+    }
+
+
+def _render_panel(summary):
+    with st.sidebar.expander("성능 계측 (debug)", expanded=True):
+        st.caption(f"{summary['page']} | 전체 {summary['total_ms']:,.1f} ms")
+        if summary['sections']:
+            sections = pd.DataFrame(summary['sections']).rename(columns={'section': '구간', 'stage': '단계'})
+            st.dataframe(sections, hide_index=True, use_container_width=True)
+            st.dataframe(sections.groupby('단계', sort=False)['ms'].sum().round(1).reset_index(),
+                         hide_index=True, use_container_width=True)
+        cache_rows = [
+            {'캐시': f"st.cache_data · {name}", '적중': c['hits'], '미적중': c['misses']}
+            for name, c in summary['cache'].items()
+        ]
+        cache_rows.append({'캐시': 'dashboard_data 공유 캐시 (프로세스 전체)', '적중': summary['data_cache']['hits'],
+                           '미적중': summary['data_cache']['misses']})
+        st.dataframe(pd.DataFrame(cache_rows), hide_index=True, use_container_width=True)
+        st.caption(f"기록 파일: {DASHBOARD_PERF_LOG}")
+
+
+def finish_page():
+    """페이지 스크립트 맨 끝에서 호출 → 로그 한 줄 기록, ?debug=1 이면 사이드바 패널 표시."""
+    summary = _summary(_state())
+    _get_logger().info(json.dumps(summary, ensure_ascii=False))
+    if debug_enabled():
+        _render_panel(summary)
+    return summary
@@ -5,7 +5,19 @@ from pathlib import Path
 
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-from config import MASTER_PRICE_CSV, DATA_DASHBOARD, DASHBOARD_READY_CSV, ensure_dirs
+from config import (
+    MASTER_PRICE_CSV, DATA_DASHBOARD, DASHBOARD_READY_CSV, MEATBOX_HISTORY_PARQUET,
+    DASHBOARD_ENRICHED_PARQUET, DASHBOARD_ENRICHED_STATE_JSON, HOME_SUMMARY_CSV, MARKET_HIGHLIGHTS_CSV,
+    PRICE_CUBE_PARQUET, ensure_dirs,
+)
+from utils.columnar_store import read_table, write_table
+from utils.file_store import write_csv
+from utils.normalize_part_brand import split_part_brand
+from utils.dense_panel import enrich_price_panel
+from utils import incremental_panel
+from utils.home_summary import save_part_summary
+from utils.market_highlights import save_market_highlights
+from utils.price_cube import save_price_cube
 
 # [파일 정의서]
 # - 파일명: preprocess_meat_data.py
@@ -18,11 +30,56 @@ from config import MASTER_PRICE_CSV, DATA_DASHBOARD, DASHBOARD_READY_CSV, ensure
 #   2. 중복 데이터(등급 차이) 평균 처리 및 결측일 데이터 보간 (Forward Fill)
 #   3. 기술적 지표(이동평균) 산출
 #   4. 3대 패커(IBP, Excel, Swift) 취급 부위 기준 필터링 (Option B)
+#   5. 과거 시세 이력 테이블(백필)로 master에 없는 일자 보충
+#   6. 증분 재계산: 마지막 처리일 이후 새 시세가 들어온 시계열의 최근 구간만 다시 계산
+#      (필터 전 전체 시계열은 data/1_processed/dashboard_enriched.parquet에 보관)
+#      - 증분은 계산에만 해당: 입력 지문 확인을 위해 master 전체는 매번 읽고, 저장소·대시보드 파일은 전체를 다시 씀
+#        (파일이 시계열 순 정렬이고 새 최저/최고가가 시계열 전 행의 min_total/max_total을 바꾸므로 부분 교체 불가)
+#      - 새 시세가 없으면 저장소·대시보드 산출물을 다시 쓰지 않음 (파일 수정 시각 유지 → 대시보드 캐시 유지)
+#   7. Home 부위별 시세 변동 요약(data/2_dashboard/home_part_summary.csv) 함께 갱신 (utils/home_summary.py)
+#   8. Price Dashboard 원산지별 Market Highlights(data/2_dashboard/market_highlights.csv) 함께 갱신 (utils/market_highlights.py)
+#   9. Price Dashboard 상세 화면용 국가 × 부위 × 브랜드 그룹 큐브(data/2_dashboard/price_cube.parquet) 함께 갱신 (utils/price_cube.py)
+# - 실행 예시:
+#     python src/utils/preprocess_meat_data.py                   → 증분 (이전 입력이 바뀌었거나 저장소가 없으면 전체 재계산)
+#     python src/utils/preprocess_meat_data.py --full            → 전체 재계산 (dense 엔진)
+#     python src/utils/preprocess_meat_data.py --verify          → 증분 결과를 전체 재계산과 비교
+#     python src/utils/preprocess_meat_data.py --full --engine groupby → 기존 시계열별 계산 경로
 
-def load_and_enrich_data():
+
+def merge_price_history(df):
+    """
+    미트박스 과거 시세 이력 테이블(crawl_imp_price_history_batch.py 산출물)에서
+    master에 없는 (품목명, 일자) 행만 보충합니다.
+    신규 상장 품목도 대시보드에서 바로 1년치 추이를 볼 수 있게 하기 위함입니다.
+    """
+    df_hist = read_table(MEATBOX_HISTORY_PARQUET, columns=['date', 'part_name', 'country', 'storage', 'wholesale_price'])
+    if df_hist is None or df_hist.empty:
+        return df
+
+    # master와 동일한 수집 기준(냉동, 미국/호주)만 사용
+    df_hist = df_hist[
+        df_hist['storage'].astype(str).str.contains('냉동', na=False)
+        & df_hist['country'].isin(df['country'].dropna().unique())
+        & df_hist['wholesale_price'].gt(0)
+    ]
+    df_hist = df_hist.assign(date=pd.to_datetime(df_hist['date']), brand='-')
+    df_hist = df_hist[['date', 'part_name', 'country', 'wholesale_price', 'brand']]
+
+    # master에 이미 있는 (품목명, 일자)는 master 값을 우선
+    existing = pd.MultiIndex.from_frame(df[['part_name', 'date']])
+    is_new = ~pd.MultiIndex.from_frame(df_hist[['part_name', 'date']]).isin(existing)
+    df_hist = df_hist[is_new]
+    if df_hist.empty:
+        return df
+
+    print(f"과거 시세 이력에서 master 미보유 {len(df_hist)}행을 보충합니다.")
+    return pd.concat([df, df_hist], ignore_index=True)
+
+
+def load_daily_prices():
     """
     master_price_data.csv를 로드하여 브랜드/부위를 분리하고
-    중복값 평균 처리 및 결측치를 채운 후 이동평균(MA) 등 보조 지표를 추가합니다.
+    같은 날짜·국가·부위·브랜드의 중복값(등급 차이)을 평균 처리한 long 프레임을 반환합니다.
     """
     # 1. 경로 설정
     input_path = MASTER_PRICE_CSV
@@ -33,29 +90,23 @@ def load_and_enrich_data():
     # 2. 데이터 로드
     df = pd.read_csv(str(input_path), encoding='utf-8-sig')
     df['date'] = pd.to_datetime(df['date'])
+    df = merge_price_history(df)
     
-    # 3. 부위명 및 브랜드 분리 로직
-    def split_part_brand(row):
-        full_name = str(row['part_name'])
-        if '|' in full_name:
-            parts = full_name.split('|')
-            part_clean = parts[0].split('-')[0].strip()
-            brand_clean = parts[1].strip()
-            return part_clean, brand_clean
-        return row['part_name'], row['brand'] 
-
-    # apply 적용
-    df[['part', 'brand']] = df.apply(
-        lambda x: pd.Series(split_part_brand(x)), axis=1
-    )
-    
-    # 4. 등급 차이 평균 처리 및 결측 날짜 보간
-    print("등급 차이 등으로 인한 중복 데이터 평균 산출 및 결측일 데이터 보간(Forward Fill)을 진행합니다...")
+    # 3. 부위명 및 브랜드 분리 (고유 품목명 단위 벡터화 → 전체 행에 매핑)
+    df[['part', 'brand']] = split_part_brand(df['part_name'], df['brand'])
     
+    # 4. 등급 차이 평균 처리
     # [수정된 핵심 로직] 같은 날짜, 국가, 부위, 브랜드의 가격이 여러 개면 평균(mean)을 구하여 하나로 합칩니다.
-    df = df.groupby(['date', 'country', 'part', 'brand'], as_index=False)['wholesale_price'].mean()
-    
+    return df.groupby(['date', 'country', 'part', 'brand'], as_index=False)['wholesale_price'].mean()
+
+
+def enrich_with_groupby(df):
+    """
+    (기존 경로) 시계열별 groupby + resample/rolling lambda로 결측일 보간 및 이동평균을 계산합니다.
+    dense 엔진의 정합성 검증·벤치마크 기준으로 유지합니다.
+    """
     # category 컬럼 생성 (groupby 이후 다시 생성)
+    df = df.copy()
     df['category'] = df['country']
 
     # 날짜를 인덱스로 설정
@@ -81,17 +132,86 @@ def load_and_enrich_data():
     # 전체 기간 최고/최저 (참고용)
     df['min_total'] = grouped['wholesale_price'].transform('min')
     df['max_total'] = grouped['wholesale_price'].transform('max')
+    return df
+
+
+def load_and_enrich_data(engine='dense'):
+    """
+    master_price_data.csv를 로드하여 브랜드/부위를 분리하고
+    중복값 평균 처리 및 결측치를 채운 후 이동평균(MA) 등 보조 지표를 추가합니다.
+    engine='dense'(기본)는 밀집 행렬 엔진, 'groupby'는 기존 시계열별 계산 경로를 사용합니다.
+    """
+    df = load_daily_prices()
+    if df is None:
+        return None
+
+    print("등급 차이 등으로 인한 중복 데이터 평균 산출 및 결측일 데이터 보간(Forward Fill)을 진행합니다...")
+    if engine == 'groupby':
+        df = enrich_with_groupby(df)
+    else:
+        df = enrich_price_panel(df)
 
     print(f"Data Loaded & Enriched: {len(df)} rows")
     return df
 
-def save_dashboard_ready_data(df):
+
+def update_enriched_data(full=False, engine='dense', verify=False):
+    """
+    가공 저장소(dashboard_enriched.parquet)를 갱신하고 (필터 전 전체 시계열, 변경 여부)를 반환합니다.
+    저장 상태가 유효하면 새 시세가 들어온 시계열만 증분 재계산하고, 아니면 전체 재계산합니다.
+    증분인데 새 시세가 없으면 저장소를 다시 쓰지 않고 변경 여부 False를 반환합니다.
+    verify=True이면 결과를 전체 재계산과 비교하여 불일치 시 (None, False)를 반환합니다.
+    """
+    daily = load_daily_prices()
+    if daily is None:
+        return None, False
+
+    store = None
+    if not full and engine == 'dense':
+        store = read_table(DASHBOARD_ENRICHED_PARQUET)
+        watermark, reason = incremental_panel.check_state(daily, incremental_panel.load_state(DASHBOARD_ENRICHED_STATE_JSON))
+        if store is None:
+            print("[증분] 가공 저장소가 없어 전체 재계산합니다.")
+        elif watermark is None:
+            print(f"[증분] {reason} → 전체 재계산합니다.")
+            store = None
+
+    touched = None
+    if store is not None:
+        df, touched = incremental_panel.update_enriched(store, daily, watermark)
+        print(f"[증분] 기준일 {watermark.date()} 이후 {touched}개 시계열 갱신 → {len(df)} rows")
+    else:
+        print("등급 차이 등으로 인한 중복 데이터 평균 산출 및 결측일 데이터 보간(Forward Fill)을 진행합니다...")
+        df = enrich_with_groupby(daily) if engine == 'groupby' else enrich_price_panel(daily)
+        print(f"[전체] Data Loaded & Enriched: {len(df)} rows")
+
+    if verify:
+        mismatch = incremental_panel.verify_enriched(df, daily)
+        if mismatch:
+            print(f"[검증 실패] {mismatch} → --full 로 전체 재계산이 필요합니다.")
+            return None, False
+        print("[검증] 전체 재계산 결과와 일치합니다.")
+
+    if touched == 0:
+        return df, False
+
+    ensure_dirs()
+    write_table(df, DASHBOARD_ENRICHED_PARQUET)
+    incremental_panel.save_state(daily, DASHBOARD_ENRICHED_STATE_JSON)
+    return df, True
+
+def save_dashboard_ready_data(df, changed=True):
     """
     3대 패커(IBP, Excel, Swift)가 취급하지 않는 마이너 부위를 제거하고
-    대시보드 전용 데이터로 저장합니다.
+    대시보드 전용 데이터로 저장합니다 (파일 전체 재작성).
+    changed=False(새 시세 없음)이고 산출물이 모두 있으면 다시 쓰지 않습니다.
     """
     if df is None:
         return
+    outputs = (DASHBOARD_READY_CSV, HOME_SUMMARY_CSV, MARKET_HIGHLIGHTS_CSV, PRICE_CUBE_PARQUET)
+    if not changed and all(Path(p).exists() for p in outputs):
+        print("[증분] 새 시세가 없어 대시보드 산출물을 그대로 둡니다.")
+        return
 
     print("Filtering logic started (Option B)...")
 
@@ -123,10 +243,25 @@ def save_dashboard_ready_data(df):
     ]
     final_cols = [c for c in cols_to_save if c in df_ready.columns]
     
-    df_ready[final_cols].to_csv(str(output_path), index=False, encoding='utf-8-sig')
+    write_csv(df_ready[final_cols], output_path)
     print(f"Successfully saved to: {output_path}")
 
+    # 5. Home 화면 / Price Dashboard 요약 테이블 (대시보드는 계산 없이 읽기만 함)
+    save_part_summary(df_ready[['date', 'part', 'wholesale_price']])
+    save_market_highlights(df_ready[['date', 'category', 'part', 'brand', 'wholesale_price']])
+    save_price_cube(df_ready[['date', 'category', 'part', 'brand', 'wholesale_price', 'ma7', 'ma30']])
+
 # 메인 실행 블록
 if __name__ == "__main__":
-    df_enriched = load_and_enrich_data()
-    save_dashboard_ready_data(df_enriched)
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="미트박스 시세 → 대시보드용 데이터 가공")
+    parser.add_argument("--engine", choices=["dense", "groupby"], default="dense",
+                        help="전체 재계산 시 보간·이동평균 계산 엔진 (기본: dense, groupby는 항상 전체 재계산)")
+    parser.add_argument("--full", action="store_true", help="증분 상태를 무시하고 전체 재계산")
+    parser.add_argument("--verify", action="store_true", help="결과를 전체 재계산과 비교 (불일치 시 저장하지 않음)")
+    args = parser.parse_args()
+
+    df_enriched, changed = update_enriched_data(full=args.full, engine=args.engine, verify=args.verify)
+    if df_enriched is None:
+        raise SystemExit(1)
+    save_dashboard_ready_data(df_enriched, changed)
\ No newline at end of file
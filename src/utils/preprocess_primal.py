@@ -5,6 +5,7 @@ from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import USDA_PRIMAL_HISTORY_CSV, USDA_PLATE_USD_KG_CSV, ensure_dirs
+from utils.file_store import write_csv
 
 # [파일 정의서]
 # - 파일명: src/utils/preprocess_primal.py
@@ -63,7 +64,7 @@ def preprocess_primal():
 
     # 6. 저장
     ensure_dirs()
-    df_final.to_csv(str(PROCESSED_FILE), index=False, encoding='utf-8-sig')
+    write_csv(df_final, PROCESSED_FILE)
     
     print(f"[완료] 전처리 완료! 총 {len(df_final)}일 치의 우삼겹 USD/kg 데이터가 생성되었습니다.")
     print(f"[저장 위치] {PROCESSED_FILE}")
@@ -0,0 +1,78 @@
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from config import DASHBOARD_READY_CSV, PRICE_CUBE_PARQUET, ensure_dirs
+from utils.columnar_store import write_table
+from utils.series_panel import MAJOR_BRAND_PATTERN
+
+# [파일 정의서]
+# - 파일명: price_cube.py
+# - 역할: 가공 (대시보드 집계 큐브)
+# - 대상: 수입육 (dashboard_ready_data의 국가 × 부위 × 브랜드 그룹)
+# - 데이터 소스: data/2_dashboard/dashboard_ready_data.csv
+# - 수집/가공 주기: 일단위 (preprocess_meat_data.py 저장 직후 함께 갱신)
+# - 주요 기능: Price Dashboard 상세 화면의 일별 평균(도매가, ma7, ma30)을 미리 집계하여 data/2_dashboard/price_cube.parquet 로 저장
+#   1. 차원: country('전체' + 국가) × part × brand_group('메이저 3사' / '기타 팩커' / '전체') × date
+#   2. 브랜드 그룹 판정(MAJOR_BRAND_PATTERN 정규식)은 여기서 한 번만 수행 → 화면은 필터 변경 시 (country, part) 조회만 함
+#   3. 기타 팩커: 메이저 3사가 아니고 브랜드가 비어 있거나 '-'(과거 이력 보충분)가 아닌 행, 전체: 모든 행
+#   4. (country, part, brand_group, date) 순 정렬 저장 → 대시보드는 (country, part) 인덱스로 한 번에 조회
+# - 실행 예시:
+#     python src/utils/price_cube.py
+
+ALL_COUNTRY = '전체'
+BRAND_GROUPS = ['메이저 3사', '기타 팩커', '전체']
+VALUE_COLS = ['wholesale_price', 'ma7', 'ma30']
+CUBE_KEYS = ['country', 'part', 'brand_group', 'date']
+
+
+def brand_group_masks(brands):
+    """브랜드 Series → {브랜드 그룹: 행 마스크} (Price Dashboard 브랜드 필터와 같은 기준)."""
+    brands = brands.fillna("").astype(str)
+    is_major = brands.str.contains(MAJOR_BRAND_PATTERN, case=False, regex=True, na=False)
+    stripped = brands.str.strip()
+    is_other = ~is_major & (stripped != "") & (stripped != "-")
+    return {'메이저 3사': is_major, '기타 팩커': is_other, '전체': pd.Series(True, index=brands.index)}
+
+
+def build_price_cube(df):
+    """
+    일별 시세(date, country, part, brand, VALUE_COLS) → 큐브 DataFrame[CUBE_KEYS + VALUE_COLS].
+    각 셀은 해당 그룹 행들의 날짜별 단순 평균 (결측 제외).
+    """
+    frames = []
+    for group, mask in brand_group_masks(df['brand']).items():
+        rows = df[mask]
+        if rows.empty:
+            continue
+        by_country = rows.groupby(['country', 'part', 'date'])[VALUE_COLS].mean().reset_index()
+        all_country = rows.groupby(['part', 'date'])[VALUE_COLS].mean().reset_index().assign(country=ALL_COUNTRY)
+        frames += [by_country.assign(brand_group=group), all_country.assign(brand_group=group)]
+
+    if not frames:
+        return pd.DataFrame(columns=CUBE_KEYS + VALUE_COLS)
+    cube = pd.concat(frames, ignore_index=True)[CUBE_KEYS + VALUE_COLS]
+    return cube.sort_values(CUBE_KEYS).reset_index(drop=True)
+
+
+def save_price_cube(df=None):
+    """dashboard_ready_data(또는 넘겨받은 프레임)로 큐브를 만들어 Parquet으로 저장."""
+    if df is None:
+        if not DASHBOARD_READY_CSV.exists():
+            print(f"[Error] File not found: {DASHBOARD_READY_CSV}")
+            return None
+        df = pd.read_csv(str(DASHBOARD_READY_CSV), usecols=['date', 'category', 'part', 'brand'] + VALUE_COLS,
+                         encoding='utf-8-sig')
+    df = df.rename(columns={'category': 'country'}).assign(date=lambda d: pd.to_datetime(d['date']))
+
+    cube = build_price_cube(df)
+    ensure_dirs()
+    write_table(cube, PRICE_CUBE_PARQUET)
+    print(f"가격 큐브 저장: {PRICE_CUBE_PARQUET} ({len(cube)}행)")
+    return cube
+
+
+if __name__ == "__main__":
+    if save_price_cube() is None:
+        raise SystemExit(1)
@@ -7,6 +7,8 @@ from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import USDA_BEEF_HISTORY_CSV, EXCHANGE_RATE_XLSX, PROCESSED_USDA_COST_CSV, ensure_dirs
+from utils.file_store import append_csv, csv_tail_complete, read_csv_tail_line, write_csv
+from utils.usda_mapping_index import load_mapping_index
 
 # [파일 정의서]
 # - 파일명: process_usda_data.py
@@ -15,6 +17,12 @@ from config import USDA_BEEF_HISTORY_CSV, EXCHANGE_RATE_XLSX, PROCESSED_USDA_COS
 # - 데이터 소스: USDA 도매가 및 환율
 # - 수집/가공 주기: 필요시 (배치성 단위 변환)
 # - 주요 기능: 원본 스키마를 보존하며, 환율(Exchange_Rate)을 독립 변수로 분리 유지하고, 고기 가격은 USD/kg 단위로 명시적 변환함.
+#   - 환율은 일별 달력 병합 대신 보고일 기준 as-of 조인(직전 영업일 종가)으로 붙이며, 보고가 없는 날짜의 빈 행은 만들지 않음
+#   - 숫자 컬럼은 컬럼당 한 번의 벡터 연산으로 쉼표 제거·변환
+#   - 증분 처리: 산출물의 마지막 보고일(watermark) 이후 행만 변환해 파일 뒤에 제자리 추가 (파일 복사 없음)
+#                환율이 바뀐 기존 보고일이 있으면 그중 가장 이른 날 이후 행만 다시 계산해 교체 (임시 파일 → 원자적 교체, --full: 전체 재생성)
+#                마지막 행이 불완전한 산출물(추가 도중 중단)은 전체 재생성
+#                (평소 바뀌는 것은 직전 종가로 저장된 최근 보고일 → 잘라내는 구간은 최근 며칠)
 
 # ======================================================
 # [설정] 기본 환경 설정 및 경로 지정
@@ -28,10 +36,136 @@ OUTPUT_FILE_PATH = PROCESSED_USDA_COST_CSV
 LB_TO_KG = 0.453592
 CWT_DIVISOR = 100 
 
+FX_START_DATE = pd.Timestamp("2019-01-01")
+TARGET_COLS_TO_CLEAN = ['total_pounds', 'price_range_low', 'price_range_high', 'weighted_average']
+TARGET_PRICE_COLS = ['price_range_low', 'price_range_high', 'weighted_average']
+
+# ======================================================
+# [보조 로직] 숫자 정제 / 환율 as-of 정렬
+# ======================================================
+def parse_numeric_column(values):
+    """
+    쉼표·공백이 섞인 숫자 컬럼을 한 번에 float64로 변환합니다.
+    반환: (변환 결과, 숫자로 읽을 수 없었던 원본 값 목록)
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype('float64'), []
+
+    text = values.astype('string').str.replace(',', '', regex=False).str.strip()
+    converted = pd.to_numeric(text, errors='coerce').astype('float64')
+    failed_mask = text.notna() & (text != '') & (text.str.lower() != 'nan') & converted.isna()
+    return converted, values[failed_mask.fillna(False).to_numpy()].unique().tolist()
+
+
+def align_exchange_rate(dates, df_exch, start_date=FX_START_DATE, end_date=None):
+    """
+    각 보고일에 직전(당일 포함) 영업일 종가 환율을 붙입니다 (정렬된 as-of 조인).
+    기존 일별 달력 병합 + ffill/bfill과 같은 결과: 기간 [start_date, end_date] 밖의 환율은 쓰지 않고,
+    구간 첫 환율 이전 날짜는 첫 환율로 채웁니다.
+    """
+    fx = df_exch[['Date', 'Close']].dropna()
+    fx = fx[(fx['Date'] >= start_date) & ((fx['Date'] <= end_date) if end_date is not None else True)]
+    fx = fx.sort_values('Date', kind='stable').drop_duplicates('Date', keep='last')
+    fx = fx.rename(columns={'Close': 'Exchange_Rate'})
+
+    left = pd.DataFrame({'Date': dates.to_numpy()})
+    left['_row'] = np.arange(len(left))
+    aligned = pd.merge_asof(left.sort_values('Date', kind='stable'), fx, on='Date', direction='backward')
+    if not fx.empty:
+        aligned['Exchange_Rate'] = aligned['Exchange_Rate'].fillna(fx['Exchange_Rate'].iloc[0])
+    return aligned.sort_values('_row')['Exchange_Rate'].to_numpy()
+
+
+def convert_usda_rows(df_usda, df_exch, end_date):
+    """
+    USDA 원본 행(Date 컬럼 포함)에 환율을 붙이고 숫자 정제·단위 변환을 수행합니다.
+    컬럼 순서: Date, Exchange_Rate, 원본 컬럼..., total_volume_kg, *_USD_kg
+    """
+    df_usda = df_usda.sort_values('Date', kind='stable')
+    source_cols = [c for c in df_usda.columns if c != 'Date']
+    df_final = pd.concat([
+        df_usda[['Date']],
+        pd.DataFrame({'Exchange_Rate': align_exchange_rate(df_usda['Date'], df_exch, end_date=end_date)}, index=df_usda.index),
+        df_usda[source_cols],
+    ], axis=1)
+
+    print(" - 가격 및 물량 데이터의 쉼표/텍스트를 제거하고 예외 데이터를 추적합니다.")
+    for col in TARGET_COLS_TO_CLEAN:
+        if col in df_final.columns:
+            df_final[col], weird_values = parse_numeric_column(df_final[col])
+            if weird_values:
+                print(f"   [경고] '{col}' 컬럼에서 계산 불가한 텍스트 발견 (NaN 처리됨). -> 샘플: {weird_values[:3]}")
+
+    print(" - 지정된 타겟 컬럼의 단위 변환(USD/kg, kg)을 수행합니다. (환율 곱셈 제거)")
+
+    # 1. 물량 단위 변환 (lbs -> kg)
+    if 'total_pounds' in df_final.columns:
+        df_final['total_volume_kg'] = (df_final['total_pounds'] * LB_TO_KG).round(2)
+
+    # 2. 가격 단위 변환 (100lbs 당 USD -> 1kg 당 USD, 환율은 곱하지 않음!)
+    for col in TARGET_PRICE_COLS:
+        if col in df_final.columns:
+            df_final[f"{col}_USD_kg"] = (df_final[col] / CWT_DIVISOR / LB_TO_KG).round(4)
+
+    return df_final.reset_index(drop=True)
+
+
+def output_columns(source_columns):
+    """convert_usda_rows 결과의 컬럼 순서."""
+    cols = ['Date', 'Exchange_Rate'] + [c for c in source_columns if c != 'Date']
+    if 'total_pounds' in source_columns:
+        cols.append('total_volume_kg')
+    cols += [f"{col}_USD_kg" for col in TARGET_PRICE_COLS if col in source_columns]
+    return cols
+
+
+def plan_incremental_update(df_usda, df_exch, end_date):
+    """
+    기존 산출물과 비교해 다시 변환할 구간을 정합니다.
+    반환: (모드, 재변환 시작 보고일, 파일 끝에서 잘라낼 행 수)
+      - ('full', None, 0)     : 산출물이 없거나 컬럼 구성·정렬이 맞지 않아 전체 재생성
+      - ('append', 날짜, 행 수): 시작 보고일 이후만 변환해 파일 뒤에 추가 (그 전에 기존 행 중 시작일 이후 행을 잘라냄)
+    산출물은 보고일 순으로 저장되므로, 환율이 바뀐 가장 이른 보고일부터 끝까지만 다시 쓰면 됨.
+    평소에는 마지막 보고일이 (그날 종가 수집 전이라) 직전 종가로 저장되었다가 다음 실행에서 바뀌는 경우라
+    잘라내는 구간이 최근 며칠에 그치고, 과거 환율이 백필·수정된 경우에만 구간이 길어짐
+    """
+    if not OUTPUT_FILE_PATH.exists():
+        return 'full', None, 0
+
+    header = pd.read_csv(str(OUTPUT_FILE_PATH), nrows=0, encoding='utf-8-sig').columns.tolist()
+    if header != output_columns(df_usda.columns):
+        print(" - 원본 컬럼 구성이 기존 산출물과 달라 전체 재생성합니다.")
+        return 'full', None, 0
+    if not csv_tail_complete(OUTPUT_FILE_PATH, len(header)):
+        # 이전 제자리 추가가 중간에 끊겨 마지막 행이 잘린 파일 → 이어 쓰면 두 행이 합쳐지므로 전체 재생성
+        print(" - 기존 산출물의 마지막 행이 불완전하여 전체 재생성합니다.")
+        return 'full', None, 0
+
+    df_done = pd.read_csv(str(OUTPUT_FILE_PATH), usecols=['Date', 'Exchange_Rate'], parse_dates=['Date'], encoding='utf-8-sig')
+    if df_done.empty:
+        return 'full', None, 0
+    if not df_done['Date'].is_monotonic_increasing:
+        print(" - 기존 산출물이 보고일 순이 아니어서 전체 재생성합니다.")
+        return 'full', None, 0
+    watermark = df_done['Date'].max()
+
+    # 기존 보고일의 환율을 현재 환율 파일 기준으로 다시 계산해 비교 (직전 종가 → 당일 종가 갱신, 환율 백필·수정 감지)
+    done_fx = df_done.drop_duplicates('Date', keep='last')
+    current_fx = align_exchange_rate(done_fx['Date'], df_exch, end_date=end_date)
+    changed = ~np.isclose(done_fx['Exchange_Rate'].to_numpy(dtype='float64'), current_fx, rtol=0, atol=1e-9, equal_nan=True)
+
+    if not changed.any():
+        return 'append', watermark + pd.Timedelta(days=1), 0
+    start = done_fx.loc[changed, 'Date'].min()
+    drop_rows = int((df_done['Date'] >= start).sum())
+    print(f" - 환율이 바뀐 기존 보고일 {int(changed.sum())}일 → {start.date()} 이후 {drop_rows}행을 다시 계산합니다.")
+    return 'append', start, drop_rows
+
+
 # ======================================================
 # [핵심 로직] 명시적 타겟팅 및 파생 변수 생성
 # ======================================================
-def process_usda_cost():
+def process_usda_cost(full=False):
     print("=" * 60)
     print("[시작] 미국 USDA 데이터(단품) 환율 및 단위 변환 파이프라인 (환율 분리 버전)")
     print("=" * 60)
@@ -41,7 +175,7 @@ def process_usda_cost():
         return
 
     print(" - 데이터를 불러오는 중입니다...")
-    df_usda = pd.read_csv(str(USDA_FILE_PATH))
+    df_usda = pd.read_csv(str(USDA_FILE_PATH), low_memory=False)
     df_exch = pd.read_excel(str(EXCHANGE_FILE_PATH))
 
     df_usda.columns = df_usda.columns.str.strip()
@@ -54,59 +188,49 @@ def process_usda_cost():
 
     df_exch['Date'] = pd.to_datetime(df_exch['Date'])
 
-    start_date = pd.to_datetime("2019-01-01")
+    # 2019년 이후 보고일만 사용 (보고가 없는 날짜는 행을 만들지 않음)
     end_date = df_usda['Date'].max()
-    calendar_df = pd.DataFrame({'Date': pd.date_range(start=start_date, end=end_date)})
+    df_usda = df_usda[df_usda['Date'] >= FX_START_DATE]
 
-    print(" - 환율 데이터를 병합 및 보간(ffill -> bfill)합니다. (독립 변수 유지)")
-    df_merged = pd.merge(calendar_df, df_exch[['Date', 'Close']], on='Date', how='left')
-    df_merged['Close'] = df_merged['Close'].ffill().bfill()
-    df_merged = df_merged.rename(columns={'Close': 'Exchange_Rate'})
+    mode, start, drop_rows = ('full', None, 0) if full else plan_incremental_update(df_usda, df_exch, end_date)
+    if mode != 'full':
+        df_usda = df_usda[df_usda['Date'] >= start]
+        if df_usda.empty:
+            print("[성공] 이미 최신 상태입니다. 변환할 신규 보고일이 없습니다.")
+            return
+    print(f" - 처리 방식: {mode} (대상 {df_usda['Date'].nunique()}개 보고일, {len(df_usda)}행)")
 
-    print(" - USDA 데이터를 병합합니다 (원본 스키마 유지).")
-    df_final = pd.merge(df_merged, df_usda, on='Date', how='left')
+    print(" - 보고일 기준으로 직전 영업일 환율을 붙입니다 (as-of 조인, 독립 변수 유지).")
+    df_final = convert_usda_rows(df_usda, df_exch, end_date)
 
-    print(" - 가격 및 물량 데이터의 쉼표/텍스트를 제거하고 예외 데이터를 추적합니다.")
-    target_cols_to_clean = ['total_pounds', 'price_range_low', 'price_range_high', 'weighted_average']
-    
-    for col in target_cols_to_clean:
-        if col in df_final.columns:
-            valid_original_mask = df_final[col].notna() & (df_final[col].astype(str).str.strip() != '') & (df_final[col].astype(str).str.lower() != 'nan')
-            cleaned_str = df_final[col].astype(str).str.replace(',', '').str.strip()
-            converted_num = pd.to_numeric(cleaned_str, errors='coerce')
-            failed_mask = valid_original_mask & converted_num.isna()
+    ensure_dirs()
+    if mode == 'append':
+        # 잘라낼 첫 행이 재변환 시작일인지 확인 (다르면 행 수 계산이 어긋난 것이므로 전체 재생성)
+        first_dropped = read_csv_tail_line(OUTPUT_FILE_PATH, drop_rows) if drop_rows else None
+        if drop_rows and (first_dropped is None or pd.to_datetime(first_dropped.split(',', 1)[0], errors='coerce') != start):
+            print(" - 기존 산출물 끝부분이 예상과 달라 전체 재생성합니다.")
+            process_usda_cost(full=True)
+            return
+        # 기존 파일 컬럼 순서에 맞춰 추가 (신규만: 제자리 추가, 끝부분 교체: 임시 파일에 써서 원자적 교체)
+        header = pd.read_csv(str(OUTPUT_FILE_PATH), nrows=0, encoding='utf-8-sig').columns
+        append_csv(df_final.reindex(columns=header), OUTPUT_FILE_PATH, drop_last=drop_rows)
+    else:
+        write_csv(df_final, OUTPUT_FILE_PATH)
 
-            if failed_mask.any():
-                weird_values = df_final.loc[failed_mask, col].unique().tolist()
-                print(f"   [경고] '{col}' 컬럼에서 계산 불가한 텍스트 발견 (NaN 처리됨). -> 샘플: {weird_values[:3]}")
-            
-            df_final[col] = converted_num
+    # 신규 품목명을 매핑 인덱스(item_description → 한글 부위명)에 반영
+    if 'item_description' in df_final.columns:
+        load_mapping_index(df_final['item_description'])
 
-    print(" - 지정된 타겟 컬럼의 단위 변환(USD/kg, kg)을 수행합니다. (환율 곱셈 제거)")
-    
-    # 1. 물량 단위 변환 (lbs -> kg)
-    if 'total_pounds' in df_final.columns:
-        df_final['total_volume_kg'] = (df_final['total_pounds'] * LB_TO_KG).round(2)
-        
-    # 2. 가격 단위 변환 (100lbs 당 USD -> 1kg 당 USD)
-    target_price_cols = ['price_range_low', 'price_range_high', 'weighted_average']
-    for col in target_price_cols:
-        if col in df_final.columns:
-            # 컬럼명을 KRW에서 USD로 변경
-            new_col_name = f"{col}_USD_kg" 
-            # 100 파운드당 가격을 1 파운드당 가격으로 나눔
-            price_per_lb = df_final[col] / CWT_DIVISOR
-            # 1 파운드당 가격을 kg당 가격으로 환산 (환율은 곱하지 않음!)
-            df_final[new_col_name] = (price_per_lb / LB_TO_KG).round(4)
-
-    ensure_dirs()
-    df_final.to_csv(str(OUTPUT_FILE_PATH), index=False, encoding='utf-8-sig')
     print("=" * 60)
-    print(f"[완료] 데이터 가공 성공! (저장 위치: {OUTPUT_FILE_PATH})")
+    print(f"[완료] 데이터 가공 성공! (저장 위치: {OUTPUT_FILE_PATH}, {mode} {len(df_final)}행)")
     
-    added_cols = ['Exchange_Rate', 'total_volume_kg'] + [f"{col}_USD_kg" for col in target_price_cols]
+    added_cols = ['Exchange_Rate', 'total_volume_kg'] + [f"{col}_USD_kg" for col in TARGET_PRICE_COLS]
     print(f" - 추가된 파생 변수: {', '.join(added_cols)}")
     print("=" * 60)
 
 if __name__ == "__main__":
-    process_usda_cost()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="USDA 단품 시세 환율·단위 변환 (기본: 증분)")
+    parser.add_argument("--full", action="store_true", help="기존 산출물을 무시하고 전체 재생성")
+    args = parser.parse_args()
+    process_usda_cost(full=args.full)
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from config import DASHBOARD_READY_CSV, MASTER_IMPORT_VOLUME_CSV, BEEF_STOCK_XLSX
+
+# [파일 정의서]
+# - 파일명: series_panel.py
+# - 역할: 가공 (다중 시계열 피처 패널)
+# - 대상: 수입육 (dashboard_ready_data의 전 국가 × 부위, 선택 시 브랜드 그룹까지)
+# - 데이터 소스: DASHBOARD_READY_CSV, MASTER_IMPORT_VOLUME_CSV, BEEF_STOCK_XLSX
+# - 주요 기능:
+#   1. 일별 도매가를 시계열(국가 × 부위 [× 브랜드 그룹])별 주간 평균으로 집계 (주 × 시계열 행렬에서 한 번에 계산)
+#   2. 가격 모멘텀 피처(1/4주 변동률, 4/12주 이동평균 대비)와 horizon주 뒤 가격 변동률(%) 타겟
+#   3. KMTA 월별 수입량(국가 × 부위)·재고(부위)를 1개월 시차로 결합 (해당 월 통계는 다음 달에 발표되므로)
+#   - 미트박스 부위명 → KMTA 부위 분류는 SUPPLY_PART_MAP, 없으면 부위명에 포함된 분류명, 그래도 없으면 '계'(합계)
+
+SERIES_KEYS = ['country', 'part', 'brand_group']
+MAJOR_BRAND_PATTERN = r"IBP|Excel|Swift|엑셀|스위프트"     # 메이저 3사 (대소문자 무시)
+WEEK_FREQ = 'W-SUN'
+FFILL_WEEKS = 2             # 거래가 없는 주는 최대 2주까지 직전 가격 유지
+
+KMTA_PARTS = ['갈비', '등심', '목심', '사태', '설도', '안심', '앞다리', '양지', '우둔', '채끝', '기타']
+
+# 부위명만으로 KMTA 분류를 알 수 없는 미트박스 부위
+SUPPLY_PART_MAP = {
+    '살치살': '등심',
+    '척리블렛': '갈비',
+    '황제늑간': '갈비',
+    '부채살': '앞다리',
+    '알전각/볼라전각': '앞다리',
+    '차돌박이': '양지',
+    '아롱사태': '사태',
+    '설깃': '설도',
+    '목뼈': '기타',
+    '스지': '기타',
+    '스지(뒷스지)': '기타',
+    '안창살': '기타',
+    '토시살': '기타',
+    '홍창/소막창': '기타',
+}
+
+FEATURE_COLS = [
+    'ret_1w', 'ret_4w', 'price_to_ma4', 'price_to_ma12', 'month',
+    'import_vol', 'import_vol_mom', 'import_vol_yoy', 'stock', 'stock_mom', 'stock_yoy',
+]
+
+
+def supply_part(part):
+    """미트박스 부위명 → KMTA 부위 분류."""
+    if part in SUPPLY_PART_MAP:
+        return SUPPLY_PART_MAP[part]
+    for name in KMTA_PARTS:
+        if name in part:
+            return name
+    return '계'
+
+
+def brand_group(brands):
+    """브랜드 Series → '메이저 3사' / '기타 팩커'."""
+    is_major = brands.str.contains(MAJOR_BRAND_PATTERN, case=False, regex=True, na=False)
+    return pd.Series(np.where(is_major, '메이저 3사', '기타 팩커'), index=brands.index)
+
+
+# ======================================================
+# [수급] KMTA 월별 수입량·재고 (long 형식)
+# ======================================================
+def load_monthly_supply():
+    """
+    반환: (수입량 DataFrame[country, supply_part, month, import_vol, import_vol_mom, import_vol_yoy],
+           재고 DataFrame[supply_part, month, stock, stock_mom, stock_yoy])
+    """
+    df_import = pd.read_csv(MASTER_IMPORT_VOLUME_CSV, encoding='utf-8-sig')
+    df_import['month'] = pd.to_datetime(df_import['std_date'] + '-01')
+    df_import = df_import.groupby(['구분', 'month']).sum(numeric_only=True)
+    df_import.columns = [c.replace('부위별_', '').replace('_합계', '') for c in df_import.columns]
+    imports = df_import.stack().rename('import_vol').reset_index()
+    imports.columns = ['country', 'month', 'supply_part', 'import_vol']
+
+    df_stock = pd.read_excel(BEEF_STOCK_XLSX)
+    stock = pd.DataFrame({
+        'supply_part': df_stock['부위별 부위별'].replace({'합계': '계'}),
+        'month': pd.to_datetime(df_stock['기준년월'] + '-01'),
+        'stock': pd.to_numeric(df_stock['조사재고량 조사재고량'], errors='coerce'),
+    }).groupby(['supply_part', 'month'], as_index=False)['stock'].sum()
+
+    for frame, keys, col in ((imports, ['country', 'supply_part'], 'import_vol'), (stock, ['supply_part'], 'stock')):
+        frame.sort_values(keys + ['month'], inplace=True)
+        grouped = frame.groupby(keys)[col]
+        frame[f'{col}_mom'] = grouped.pct_change(1, fill_method=None)
+        frame[f'{col}_yoy'] = grouped.pct_change(12, fill_method=None)
+    return imports.reset_index(drop=True), stock.reset_index(drop=True)
+
+
+# ======================================================
+# [패널] 시계열별 주간 피처
+# ======================================================
+def weekly_price_matrix(df, by_brand_group=False):
+    """일별 long 시세 → (주 × 시계열) 평균 도매가 행렬 (열: country, part, brand_group)."""
+    keys = ['country', 'part', 'brand_group']
+    df = df.rename(columns={'category': 'country'})
+    df['brand_group'] = brand_group(df['brand']) if by_brand_group else '전체'
+    weekly = (
+        df.groupby(keys + [pd.Grouper(key='date', freq=WEEK_FREQ)])['wholesale_price'].mean()
+        .unstack(keys)
+        .sort_index(axis=1)
+    )
+    weekly = weekly.reindex(pd.date_range(weekly.index.min(), weekly.index.max(), freq=WEEK_FREQ))
+    # 시계열 범위(첫 관측 ~ 마지막 관측) 안에서만 공백 보간
+    in_range = weekly.ffill().notna() & weekly.bfill().notna()
+    return weekly.ffill(limit=FFILL_WEEKS).where(in_range)
+
+
+def build_series_panel(horizon=4, by_brand_group=False, df_prices=None):
+    """
+    전 시계열의 주간 피처 패널 (long 형식, SERIES_KEYS + date 정렬).
+    컬럼: SERIES_KEYS, date, price, FEATURE_COLS, target (horizon주 뒤 가격 변동률 %)
+    """
+    if df_prices is None:
+        df_prices = pd.read_csv(DASHBOARD_READY_CSV, usecols=['date', 'category', 'part', 'brand', 'wholesale_price'])
+    df_prices = df_prices.assign(date=pd.to_datetime(df_prices['date']))
+
+    price = weekly_price_matrix(df_prices, by_brand_group)
+    wide = {
+        'price': price,
+        'ret_1w': price.pct_change(1, fill_method=None) * 100,
+        'ret_4w': price.pct_change(4, fill_method=None) * 100,
+        'price_to_ma4': (price / price.rolling(4, min_periods=2).mean() - 1) * 100,
+        'price_to_ma12': (price / price.rolling(12, min_periods=6).mean() - 1) * 100,
+        'target': (price.shift(-horizon) / price - 1) * 100,
+    }
+    panel = pd.concat({name: frame.stack(SERIES_KEYS, future_stack=True) for name, frame in wide.items()}, axis=1)
+    panel.index.names = ['date'] + SERIES_KEYS
+    panel = panel[panel['price'].notna()].reset_index()
+
+    # 수급: 주가 속한 달의 전월 통계 결합
+    imports, stock = load_monthly_supply()
+    panel['supply_part'] = panel['part'].map({p: supply_part(p) for p in panel['part'].unique()})
+    panel['month'] = panel['date'].dt.to_period('M').dt.to_timestamp() - pd.DateOffset(months=1)
+    panel = panel.merge(imports, on=['country', 'supply_part', 'month'], how='left')
+    panel = panel.merge(stock, on=['supply_part', 'month'], how='left')
+    panel['month'] = panel['date'].dt.month
+
+    cols = SERIES_KEYS + ['date', 'price'] + FEATURE_COLS + ['target']
+    return panel[cols].sort_values(SERIES_KEYS + ['date']).reset_index(drop=True)
@@ -0,0 +1,146 @@
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from config import (
+    MASTER_IMPORT_VOLUME_CSV, BEEF_STOCK_XLSX, SUPPLY_IMPORT_PARQUET, SUPPLY_MONTHLY_PARQUET,
+    SUPPLY_PART_PARQUET, SUPPLY_STOCK_PARQUET, ensure_dirs,
+)
+from utils.columnar_store import write_table
+
+# [파일 정의서]
+# - 파일명: supply_analytics.py
+# - 역할: 가공 (수급 분석 테이블)
+# - 대상: 수입육 (KMTA 월별 수입량 · 재고)
+# - 데이터 소스: data/0_raw/master_import_volume.csv (wide), data/0_raw/beef_stock_data.xlsx
+# - 수집/가공 주기: 월단위 (--full 파이프라인의 월별 수집 직후)
+# - 주요 기능: 수입량 분석·재고 관리 화면이 재구성 없이 바로 쓰는 long 형식 테이블을 data/2_dashboard/ 에 Parquet으로 저장
+#   1. supply_import_long: 월 × 국가 × 부위 수입량 (wide '부위별_*_합계' 컬럼을 melt, '계' 컬럼 제외)
+#   2. supply_import_monthly: 월 × 국가('합계' 포함) 총 수입량, 전년 동월, 연간 누적(YTD)과 전년 동기 누적, 증감률(%)
+#   3. supply_import_by_part: 월 × 부위('합계' 포함) 국가 통합 수입량 (재고 화면의 수입 vs 재고 비교용)
+#   4. supply_stock: 월 × 부위 재고량(안내 문구 행 제거·숫자 변환)과 3/6/12개월 전 대비 변동률(%)
+#   - 비교 월은 빈 달까지 채운 월 달력에서 shift로 찾음 (행별 반복 검색 없음), 비교 대상이 없으면 결측
+# - 실행 예시:
+#     python src/utils/supply_analytics.py
+
+TOTAL_LABEL = '합계'
+STOCK_CHANGE_MONTHS = {'pct_3m': 3, 'pct_6m': 6, 'pct_12m': 12}
+
+IMPORT_COLS = ['date', 'year', 'month', 'country', 'part', 'volume']
+MONTHLY_COLS = ['date', 'country', 'volume', 'volume_ly', 'ytd', 'ytd_ly', 'yoy_pct', 'ytd_pct']
+PART_COLS = ['date', 'part', 'import_vol']
+STOCK_COLS = ['date', 'part', 'inventory'] + list(STOCK_CHANGE_MONTHS)
+
+
+def _pct_change(curr, prev):
+    """(현재 - 비교) / 비교 × 100, 비교 값이 0 이하면 0, 비교 값이 없으면 결측."""
+    pct = ((curr - prev) / prev * 100).where(prev > 0, 0.0)
+    return pct.where(prev.notna())
+
+
+def _monthly_calendar(wide):
+    """월 인덱스 wide 프레임을 첫 달~마지막 달 빈 달 없는 달력으로 확장."""
+    return wide.reindex(pd.date_range(wide.index.min(), wide.index.max(), freq='MS'))
+
+
+def build_import_long(df_raw):
+    """KMTA 수입량 wide 원본 → DataFrame[IMPORT_COLS] (date 정렬)."""
+    value_vars = [c for c in df_raw.columns if '부위별_' in c and '계_합계' not in c]
+    df = df_raw.melt(id_vars=['std_date', '구분'], value_vars=value_vars, var_name='part_raw', value_name='volume')
+    df['date'] = pd.to_datetime(df['std_date'])
+    df['country'] = df['구분']
+    df['part'] = df['part_raw'].str.replace('부위별_', '').str.replace('_합계', '')
+    df['year'] = df['date'].dt.year
+    df['month'] = df['date'].dt.month
+    df['volume'] = pd.to_numeric(df['volume'], errors='coerce')
+    return df[IMPORT_COLS].sort_values(['date', 'country', 'part']).reset_index(drop=True)
+
+
+def build_import_monthly(df_long):
+    """
+    월 × 국가('합계' 포함) 총 수입량과 전년 대비 지표 DataFrame[MONTHLY_COLS].
+    volume_ly: 12개월 전 수입량, ytd: 같은 해 1월~해당 월 누적, ytd_ly: 전년 같은 월까지의 누적
+    """
+    if df_long.empty:
+        return pd.DataFrame(columns=MONTHLY_COLS)
+    wide = df_long.pivot_table(index='date', columns='country', values='volume', aggfunc='sum')
+    wide[TOTAL_LABEL] = wide.sum(axis=1)
+    observed = wide.index
+    wide = _monthly_calendar(wide).fillna(0.0)
+
+    ytd = wide.groupby(wide.index.year).cumsum()
+    frames = {
+        'volume': wide, 'volume_ly': wide.shift(12),
+        'ytd': ytd, 'ytd_ly': ytd.shift(12),
+    }
+    monthly = pd.concat({k: v.loc[observed].stack() for k, v in frames.items()}, axis=1)
+    monthly.index.names = ['date', 'country']
+    monthly = monthly.reset_index()
+    monthly['yoy_pct'] = _pct_change(monthly['volume'], monthly['volume_ly']).fillna(0.0)
+    monthly['ytd_pct'] = _pct_change(monthly['ytd'], monthly['ytd_ly']).fillna(0.0)
+    return monthly[MONTHLY_COLS].sort_values(['date', 'country']).reset_index(drop=True)
+
+
+def build_import_by_part(df_long):
+    """월 × 부위 국가 통합 수입량 + 월별 전체 합계('합계' 부위) DataFrame[PART_COLS]."""
+    by_part = df_long.groupby(['date', 'part'])['volume'].sum().reset_index()
+    total = df_long.groupby('date')['volume'].sum().reset_index().assign(part=TOTAL_LABEL)
+    df = pd.concat([by_part, total], ignore_index=True).rename(columns={'volume': 'import_vol'})
+    return df[PART_COLS].sort_values(['part', 'date']).reset_index(drop=True)
+
+
+def build_stock(df_raw):
+    """KMTA 재고 원본 → 월 × 부위 재고량과 3/6/12개월 전 대비 변동률 DataFrame[STOCK_COLS]."""
+    col_map = {}
+    for col in df_raw.columns:
+        if '기준년월' in col: col_map[col] = 'date'
+        elif '부위별' in col: col_map[col] = 'part'
+        elif '조사재고량' in col: col_map[col] = 'inventory'
+    df = df_raw.rename(columns=col_map)[['date', 'part', 'inventory']]
+
+    # 수집 결과에 섞인 "등록된 자료가 없습니다" 안내 행 제거
+    df = df[~df['inventory'].astype(str).str.contains("없습니다|자료가", na=False)]
+    df = df.assign(
+        date=pd.to_datetime(df['date']),
+        inventory=df['inventory'].astype(str).str.replace(',', '').astype(float),
+    ).drop_duplicates(['date', 'part'], keep='first')
+    if df.empty:
+        return pd.DataFrame(columns=STOCK_COLS)
+
+    wide = _monthly_calendar(df.pivot(index='date', columns='part', values='inventory'))
+    for col, months in STOCK_CHANGE_MONTHS.items():
+        pct = _pct_change(wide.stack(), wide.shift(months).stack()).rename(col)
+        df = df.join(pct, on=['date', 'part'])
+    return df[STOCK_COLS].sort_values('date', kind='stable').reset_index(drop=True)   # 같은 달 안에서는 원본 부위 순서 유지
+
+
+def save_supply_tables():
+    """원천 수입량·재고 파일로 수급 테이블을 만들어 저장. 저장한 테이블 수를 반환 (원천이 모두 없으면 None)."""
+    saved = 0
+    ensure_dirs()
+    if MASTER_IMPORT_VOLUME_CSV.exists():
+        df_long = build_import_long(pd.read_csv(str(MASTER_IMPORT_VOLUME_CSV), encoding='utf-8-sig'))
+        for table, path in ((df_long, SUPPLY_IMPORT_PARQUET),
+                            (build_import_monthly(df_long), SUPPLY_MONTHLY_PARQUET),
+                            (build_import_by_part(df_long), SUPPLY_PART_PARQUET)):
+            write_table(table, path)
+            print(f"수급 테이블 저장: {path} ({len(table)}행)")
+            saved += 1
+    else:
+        print(f"[Warning] File not found: {MASTER_IMPORT_VOLUME_CSV}")
+
+    if BEEF_STOCK_XLSX.exists():
+        stock = build_stock(pd.read_excel(str(BEEF_STOCK_XLSX)))
+        write_table(stock, SUPPLY_STOCK_PARQUET)
+        print(f"수급 테이블 저장: {SUPPLY_STOCK_PARQUET} ({len(stock)}행)")
+        saved += 1
+    else:
+        print(f"[Warning] File not found: {BEEF_STOCK_XLSX}")
+
+    return saved or None
+
+
+if __name__ == "__main__":
+    if save_supply_tables() is None:
+        raise SystemExit(1)
@@ -0,0 +1,116 @@
+import hashlib
+import re
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from config import USDA_MAPPING_INDEX_CSV, ensure_dirs
+from utils.file_store import write_csv
+
+# [파일 정의서]
+# - 파일명: usda_mapping_index.py
+# - 역할: 가공 (매핑 인덱스)
+# - 대상: 수입육 (USDA 단품 품목명 ↔ 미트박스 한글 부위명)
+# - 주요 기능: IMPS 코드 매핑 규칙을 하나의 정규식으로 컴파일하여 고유 품목명(item_description)마다 한 번만 적용하고,
+#              결과를 품목명 키 조회 테이블(usda_mapping_index.csv)로 보관
+#              파이프라인·백테스팅·분석 코드는 문자열 검색 없이 item_description 키 조인으로 한글 부위명을 얻음
+#
+# 매칭 규칙 (기존 validate_mapping.apply_mapping과 동일):
+#   - 품목명에 코드가 부분 문자열로 포함되면 매칭, 여러 규칙이 맞으면 MAPPING_RULES 순서상 앞선 규칙 우선
+#   - 어떤 규칙도 맞지 않으면 korean_name = 'Unmapped', matched_code = 결측
+
+MAPPING_RULES = [
+    ('116A', '알목심-미국'),      # Chuck Roll
+    ('123A', 'LA갈비-미국'),      # Short Rib
+    ('112A', '꽃등심-미국'),      # Ribeye
+    ('180',  '채끝-미국'),        # Strip Loin
+    ('120',  '차돌양지-미국'),    # Brisket
+    ('114D', '부채살-미국'),      # Top Blade
+    ('124',  '등갈비/백립-미국'), # Back Ribs
+    ('167A', '도가니살-미국'),    # Knuckle
+    ('121C', '안창살-미국'),      # Outside Skirt
+    ('121D', '안창살-미국'),      # Inside Skirt
+]
+UNMAPPED = 'Unmapped'
+INDEX_COLS = ['item_description', 'matched_code', 'korean_name', 'rules_version']
+
+
+def rules_version(rules=MAPPING_RULES):
+    """매핑 규칙 내용의 짧은 해시 (규칙이 바뀌면 캐시를 다시 만든다)."""
+    text = '\n'.join(f"{code}\t{name}" for code, name in rules)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+
+def compile_rules(rules=MAPPING_RULES):
+    """
+    모든 코드를 전방탐색(lookahead) 교대식 하나로 컴파일한다.
+    위치마다 겹치는 매칭까지 모두 찾고, 같은 위치에서는 규칙 순서상 앞선 코드가 잡힌다.
+    """
+    return re.compile('(?=(' + '|'.join(re.escape(code) for code, _ in rules) + '))')
+
+
+def build_mapping(descriptions, rules=MAPPING_RULES):
+    """고유 품목명 목록 → INDEX_COLS 형식의 매핑 테이블."""
+    pattern = compile_rules(rules)
+    rank = {code: i for i, (code, _) in enumerate(rules)}
+    codes = np.array([code for code, _ in rules] + [None], dtype=object)
+    names = np.array([name for _, name in rules] + [UNMAPPED], dtype=object)
+
+    uniques = pd.Series(pd.unique(pd.Series(descriptions, dtype=object).dropna()), dtype=object)
+    found = uniques.astype(str).str.findall(pattern)
+    best = found.map(lambda hits: min((rank[h] for h in hits), default=len(rules))).to_numpy(dtype=int)
+
+    return pd.DataFrame({
+        'item_description': uniques.to_numpy(),
+        'matched_code': codes[best],
+        'korean_name': names[best],
+        'rules_version': rules_version(rules),
+    })
+
+
+def load_mapping_index(descriptions=None, path=USDA_MAPPING_INDEX_CSV, save=True):
+    """
+    저장된 매핑 인덱스를 불러와, 규칙이 바뀌었거나 처음 보는 품목명이 있으면 그 부분만 추가 계산한다.
+    반환: item_description을 인덱스로 하는 DataFrame (matched_code, korean_name)
+    """
+    version = rules_version()
+    index = None
+    if Path(path).exists():
+        index = pd.read_csv(str(path), encoding='utf-8-sig', dtype=str)
+        index = index[index['rules_version'] == version]
+
+    known = set() if index is None else set(index['item_description'])
+    missing = [] if descriptions is None else [d for d in pd.unique(pd.Series(descriptions, dtype=object).dropna()) if d not in known]
+
+    if index is None or missing:
+        added = build_mapping(missing)
+        index = added if index is None else pd.concat([index, added], ignore_index=True)
+        if save and len(added):
+            ensure_dirs()
+            write_csv(index[INDEX_COLS], path)
+
+    return index.set_index('item_description')[['matched_code', 'korean_name']]
+
+
+def map_descriptions(descriptions, index=None):
+    """
+    품목명 Series → korean_name / matched_code 두 컬럼 DataFrame (원래 인덱스 유지).
+    index가 없으면 load_mapping_index로 불러온다 (신규 품목명은 자동 추가).
+    """
+    if index is None:
+        index = load_mapping_index(descriptions)
+    joined = index.reindex(descriptions.to_numpy())
+    joined['korean_name'] = joined['korean_name'].fillna(UNMAPPED)
+    joined.index = descriptions.index
+    return joined[['korean_name', 'matched_code']]
+
+
+def find_in_master(names, master_parts):
+    """
+    한글 부위명마다 master 품목명 중 하나라도 그 이름을 포함하는지 여부 (고유 이름 단위로 한 번씩만 검색).
+    반환: {korean_name: bool}
+    """
+    master = pd.Series(list(master_parts), dtype=object).astype(str)
+    return {name: bool(master.str.contains(name, regex=False).any()) for name in pd.unique(pd.Series(names, dtype=object))}
@@ -5,11 +5,14 @@ from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import DATA_RAW, DATA_PROCESSED, MASTER_PRICE_CSV
+from utils.usda_mapping_index import UNMAPPED, load_mapping_index, map_descriptions, find_in_master
+from utils.file_store import write_csv
 
 # [파일 정의서]
 # - 파일명: src/utils/validate_mapping.py
 # - 역할: 매핑 정합성 검증 및 결과 파일 생성
 # - 저장: data/1_processed/validation_mapping_result.csv
+# - 매핑 규칙·인덱스: utils/usda_mapping_index.py (data/1_processed/usda_mapping_index.csv 캐시)
 
 def validate_mapping():
     print("[Validation] 데이터 매핑 정합성 검사를 시작합니다...\n")
@@ -34,55 +37,35 @@ def validate_mapping():
             master_parts = set(df_master[name_col].unique())
             print(f"Master 데이터 로드 완료 ({len(master_parts)}개 품목 기준)")
 
-    # 3. 매핑 규칙 정의
-    mapping_rules = [
-        ('116A', '알목심-미국'),      # Chuck Roll
-        ('123A', 'LA갈비-미국'),      # Short Rib
-        ('112A', '꽃등심-미국'),      # Ribeye
-        ('180',  '채끝-미국'),        # Strip Loin
-        ('120',  '차돌양지-미국'),    # Brisket
-        ('114D', '부채살-미국'),      # Top Blade
-        ('124',  '등갈비/백립-미국'), # Back Ribs
-        ('167A', '도가니살-미국'),    # Knuckle
-        ('121C', '안창살-미국'),      # Outside Skirt
-        ('121D', '안창살-미국'),      # Inside Skirt
-    ]
-
-    def apply_mapping(desc):
-        for code, name in mapping_rules:
-            if code in str(desc):
-                return name, code
-        return 'Unmapped', None
-
-    # 4. 매핑 적용
+    # 3~4. 매핑 적용 (고유 품목명 단위 컴파일 정규식 → 품목명 키 조회 테이블)
     print("매핑 시뮬레이션 중...")
-    df_beef[['korean_name', 'matched_code']] = df_beef['item_description'].apply(
-        lambda x: pd.Series(apply_mapping(x))
-    )
+    mapping = load_mapping_index(df_beef['item_description'])
+    df_beef[['korean_name', 'matched_code']] = map_descriptions(df_beef['item_description'], mapping)
 
     # 5. 상세 분석 리포트 생성 (중복 제거된 품목 단위)
     # USDA 원본 품목명 기준으로 유니크한 리스트 생성
     unique_items = df_beef[['matched_code', 'korean_name', 'item_description']].drop_duplicates(subset=['item_description']).copy()
-    
+
+    # Master 존재 여부는 한글 부위명(최대 규칙 수)마다 한 번씩만 검색
+    mapped_names = unique_items.loc[unique_items['korean_name'] != UNMAPPED, 'korean_name']
+    found_in_master = find_in_master(mapped_names, master_parts) if master_parts else {}
+
     # 검증 로직 추가
     results = []
-    for _, row in unique_items.iterrows():
-        k_name = row['korean_name']
-        orig_desc = row['item_description']
-        code = row['matched_code']
+    for row in unique_items.itertuples(index=False):
+        k_name = row.korean_name
+        orig_desc = row.item_description
+        code = row.matched_code
         
         status = ""
         note = ""
 
-        if k_name == 'Unmapped':
+        if k_name == UNMAPPED:
             status = "[제외] 매핑 제외"
             note = "분석 대상 아님 (필요 시 규칙 추가)"
         else:
             # Master 파일에 존재하는지 확인
-            is_found = False
-            if master_parts:
-                if any(k_name in str(m_part) for m_part in master_parts):
-                    is_found = True
+            is_found = found_in_master.get(k_name, False)
             
             if is_found:
                 status = "[정상] 정상 (Ready)"
@@ -106,7 +89,7 @@ def validate_mapping():
     df_result = df_result.sort_values(by=['Status', 'Korean_Name'], ascending=[True, True])
     
     save_path = DATA_PROCESSED / 'validation_mapping_result.csv'
-    df_result.to_csv(str(save_path), index=False, encoding='utf-8-sig')
+    write_csv(df_result, save_path)
 
     print("\n" + "=" * 60)
     print(f"[검증 결과 저장 완료]")
@@ -17,6 +17,7 @@ plt.rcParams['axes.unicode_minus'] = False
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import DATA_RAW, DATA_PROCESSED, EXCHANGE_RATE_XLSX, USDA_PLATE_USD_KG_CSV
+from utils.lag_scanner import lag_correlations
 
 def load_and_preprocess_data():
     print("데이터를 불러오고 2023년 이후 주간(Weekly) 단위로 병합 및 스무딩(Smoothing)을 진행합니다...")
@@ -65,18 +66,16 @@ def calculate_time_lag(df):
     
     # [핵심 로직] 시차 탐색 범위를 0주 ~ 26주(약 6개월)로 대폭 확장
     lags = range(0, 27) 
-    correlations = []
     
     df['us_price_krw_converted'] = df['us_price_usd_smooth'] * df['exchange_rate_smooth']
     
-    for lag in lags:
-        shifted_us = df['us_price_krw_converted'].shift(lag)
-        # 스무딩 처리된 가격끼리 상관관계를 계산하여 굵직한 추세의 일치도를 확인
-        corr = shifted_us.corr(df['kr_price_smooth'])
-        correlations.append(corr)
+    # 스무딩 처리된 가격끼리 상관관계를 계산하여 굵직한 추세의 일치도를 확인
+    # (전 시차를 FFT로 한 번에 계산, shift(lag).corr()와 같은 값)
+    corr, _ = lag_correlations(df['us_price_krw_converted'], df['kr_price_smooth'], lags, min_overlap=2)
+    correlations = corr[:, 0, 0]
         
-    best_lag = correlations.index(max(correlations))
-    best_corr = max(correlations)
+    best_lag = int(np.nanargmax(correlations))
+    best_corr = correlations[best_lag]
     
     print(f"\n[분석 완료] 미국 우삼겹 가격 변동은 약 **{best_lag}주 (약 {best_lag/4:.1f}개월)** 뒤에 한국 삼겹양지 도매가에 가장 강하게 반영됩니다.")
     print(f"- 최대 상관계수: {best_corr:.3f} (1에 가까울수록 완벽한 동기화)")